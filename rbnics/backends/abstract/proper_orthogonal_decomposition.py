@@ -23,6 +23,11 @@ class ProperOrthogonalDecomposition(object, metaclass=ABCMeta):
     def store_snapshot(self, snapshot, component=None, weight=None):
         pass
 
+    # Select the algorithm used to compute the POD modes
+    @abstractmethod
+    def set_engine(self, engine, oversampling=None, power_iterations=None, seed=None, tolerance=None):
+        pass
+
     # Perform POD on the snapshots previously computed, and store the first
     # POD modes in the basis functions matrix.
     # Input arguments are: Nmax, tol
@@ -31,10 +36,38 @@ class ProperOrthogonalDecomposition(object, metaclass=ABCMeta):
     def apply(self, Nmax, tol):
         pass
 
+    # Perform POD on the snapshots previously computed, and replace them by the first
+    # POD modes, weighted by the square root of the POD eigenvalues, so that they can
+    # be merged into another POD as part of a hierarchical approximate POD.
+    # Input arguments are: Nmax, tol
+    # Output arguments are: number of POD modes
+    @abstractmethod
+    def compress(self, Nmax, tol):
+        pass
+
+    # Store the (compressed) snapshots of another POD
+    @abstractmethod
+    def merge(self, other):
+        pass
+
+    # Save the compressed snapshots to file
+    @abstractmethod
+    def save(self, directory, filename):
+        pass
+
+    # Store the compressed snapshots saved to file, in addition to the current ones
+    @abstractmethod
+    def load(self, directory, filename):
+        pass
+
     @abstractmethod
     def print_eigenvalues(self, N=None):
         pass
 
+    @abstractmethod
+    def print_elapsed_time(self):
+        pass
+
     @abstractmethod
     def save_eigenvalues_file(self, output_directory, eigenvalues_file):
         pass
@@ -34,6 +34,7 @@ def FunctionsList(backend, wrapping, online_backend, online_wrapping,
             self.mpi_comm = wrapping.get_mpi_comm(space)
             self._list = list()  # of functions
             self._precomputed_slices = Cache()  # from tuple to FunctionsList
+            self._saved = dict()  # from (directory, filename) to list of functions which have been already saved
 
         def enrich(self, functions, component=None, weights=None, copy=True):
             # Append to storage
@@ -99,14 +100,39 @@ def FunctionsList(backend, wrapping, online_backend, online_wrapping,
             self._precomputed_slices.clear()
 
         def save(self, directory, filename):
+            # Only save functions which have been appended since the previous save to the same file, provided
+            # that the functions saved previously were not replaced and are still available on disk.
+            # The length file is written last, so that it never refers to functions which were not saved yet.
+            Nsaved = self._get_Nsaved(directory, filename)
+            for index in range(Nsaved, len(self._list)):
+                wrapping.function_save(self._list[index], directory, filename + "_" + str(index))
             self._save_Nmax(directory, filename)
-            for (index, function) in enumerate(self._list):
-                wrapping.function_save(function, directory, filename + "_" + str(index))
+            self._saved[str(directory), filename] = list(self._list)
+
+        def _get_Nsaved(self, directory, filename):
+            saved = self._saved.get((str(directory), filename), None)
+            if (
+                saved is None
+                or len(saved) > len(self._list)
+                or any(saved_function is not function for (saved_function, function) in zip(saved, self._list))
+            ):
+                return 0
+
+            def exists_Nmax_task():
+                return os.path.exists(os.path.join(str(directory), filename + ".length"))
+            if not parallel_io(exists_Nmax_task, self.mpi_comm):
+                return 0
+            elif self._load_Nmax(directory, filename) != len(saved):
+                return 0
+            else:
+                return len(saved)
 
         def _save_Nmax(self, directory, filename):
             def save_Nmax_task():
                 with open(os.path.join(str(directory), filename + ".length"), "w") as length:
                     length.write(str(len(self._list)))
+                    length.flush()
+                    os.fsync(length.fileno())
             parallel_io(save_Nmax_task, self.mpi_comm)
 
         def load(self, directory, filename):
@@ -117,6 +143,7 @@ def FunctionsList(backend, wrapping, online_backend, online_wrapping,
                 function = backend.Function(self.space)
                 wrapping.function_load(function, directory, filename + "_" + str(index))
                 self.enrich(function)
+            self._saved[str(directory), filename] = list(self._list)
             return True
 
         def _load_Nmax(self, directory, filename):
@@ -5,8 +5,12 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 from math import sqrt
-from numpy import abs, cumsum as compute_retained_energy, isclose, sum as compute_total_energy
-from rbnics.utils.io import ExportableList
+from timeit import default_timer as python_timer
+from numpy import abs, asarray, cumsum as compute_retained_energy, diag, finfo, isclose, sum as compute_total_energy
+from numpy.linalg import qr, svd
+from numpy.random import RandomState
+from scipy.linalg import eigh
+from rbnics.utils.io import ExportableList, TextIO
 
 
 # Class containing the implementation of the POD
@@ -26,58 +30,220 @@ def ProperOrthogonalDecompositionBase(backend, wrapping, online_backend, online_
             # Declare a list to store eigenvalues
             self.eigenvalues = ExportableList("text")
             self.retained_energy = ExportableList("text")
+            # Algorithm used to compute the POD modes, and its parameters
+            self.engine = "exact"
+            self.oversampling = 10
+            self.power_iterations = 2
+            self.seed = 0
+            self.tolerance = 0.
+            # Wall clock time of the last call to apply
+            self.elapsed_time = dict()
+            # Compressed snapshots of the incremental engine
+            self._init_incremental_basis()
+            # Energy discarded while compressing the stored snapshots, if they are the output of
+            # other POD objects in a hierarchical approximate POD
+            self._discarded_energy = 0.
+            # Energy discarded by the last call to apply, including the one discarded while compressing
+            # the stored snapshots, both in absolute terms and relative to the energy of the original snapshots
+            self.discarded_energy = None
+            self.relative_error_bound = None
 
         def clear(self):
             self.snapshots_matrix.clear()
             self.eigenvalues = ExportableList("text")
             self.retained_energy = ExportableList("text")
+            self.elapsed_time = dict()
+            self._init_incremental_basis()
+            self._discarded_energy = 0.
+            self.discarded_energy = None
+            self.relative_error_bound = None
+
+        def _init_incremental_basis(self):
+            self._incremental_basis = BasisContainerType(self.space, *self.args)  # X-orthonormal
+            self._incremental_singular_values = list()
+            self._incremental_energy = 0.  # of all snapshots processed so far
+            self._incremental_discarded_energy = 0.  # of all truncations carried out so far
+
+        def set_engine(self, engine, oversampling=None, power_iterations=None, seed=None, tolerance=None):
+            """
+            Select the algorithm used to compute the POD modes.
+
+            :param engine: "exact" (default) to compute all eigenpairs of the correlation matrix,
+                "partial" to compute only the required eigenpairs of the correlation matrix, or
+                "randomized" to use a randomized range finder which never assembles the correlation matrix,
+                or "incremental" to compress each snapshot as soon as it is stored, so that the snapshots matrix
+                is never kept in memory.
+            :param oversampling: number of random samples in addition to Nmax (randomized engine only).
+            :param power_iterations: number of power iterations (randomized engine only).
+            :param seed: seed of the random samples (randomized engine only). It must be the same
+                on all processes.
+            :param tolerance: truncation tolerance of the incremental engine. The compressed snapshots
+                are guaranteed to retain at least a fraction 1 - tolerance of the energy of the snapshots,
+                i.e. || S - P S ||^2 <= tolerance * || S ||^2, where P is the X-orthogonal projection
+                onto the compressed basis, up to the discarded components which are numerically zero.
+            """
+            assert engine in ("exact", "partial", "randomized", "incremental")
+            assert engine == "incremental" or len(self._incremental_basis) == 0, (
+                "Cannot switch away from the incremental engine after snapshots have been compressed")
+            self.engine = engine
+            if oversampling is not None:
+                assert oversampling >= 0
+                self.oversampling = oversampling
+            if power_iterations is not None:
+                assert power_iterations >= 0
+                self.power_iterations = power_iterations
+            if seed is not None:
+                self.seed = seed
+            if tolerance is not None:
+                assert tolerance >= 0.
+                self.tolerance = tolerance
+            # Compress any snapshot which was stored before switching to the incremental engine
+            self._compress_snapshots()
 
         # No implementation is provided for store_snapshot, because
         # it has different interface for the standard POD and
-        # the tensor one.
+        # the tensor one. Implementations of store_snapshot must call
+        # _compress_snapshots after storing the snapshot.
 
-        def apply(self, Nmax, tol):
+        def _compress_snapshots(self):
+            # Incremental X-orthogonal SVD: each stored snapshot s is used to update the compressed basis U
+            # and singular values sigma, and then discarded. Each update is a node of a hierarchical approximate
+            # POD, the inputs of which are the output of the previous update and the new snapshot: the energy
+            # discarded by all updates is thus an upper bound of the compression error || S - P S ||^2.
+            # The truncation at each step is chosen so that such bound never exceeds tolerance times
+            # the energy of the snapshots processed so far.
+            if self.engine != "incremental" or len(self.snapshots_matrix) == 0:
+                return
+            inner_product = self.inner_product
+            transpose = backend.transpose
+
+            start = python_timer()
+            for snapshot in self.snapshots_matrix:
+                if inner_product is not None:
+                    norm_snapshot = sqrt(transpose(snapshot) * inner_product * snapshot)
+                else:
+                    norm_snapshot = sqrt(transpose(snapshot) * snapshot)
+                if norm_snapshot == 0.:
+                    continue
+                self._incremental_energy += norm_snapshot**2
+
+                # Component of the snapshot which is X-orthogonal to U, with one step of reorthogonalization
+                Nbasis = len(self._incremental_basis)
+                projection = [0.] * Nbasis
+                residual = snapshot
+                for _ in range(2 if Nbasis > 0 else 0):
+                    residual_projection = self._incremental_basis_transpose_mul(residual)
+                    residual = self._incremental_basis_extend_mul(residual, [- p for p in residual_projection] + [1.])
+                    projection = [p + q for (p, q) in zip(projection, residual_projection)]
+                if inner_product is not None:
+                    norm_residual = sqrt(transpose(residual) * inner_product * residual)
+                else:
+                    norm_residual = sqrt(transpose(residual) * residual)
+                if norm_residual <= sqrt(finfo(float).eps) * norm_snapshot:
+                    # the residual is numerically zero: discard it, accounting for it in the error bound
+                    self._incremental_discarded_energy += norm_residual**2
+                    norm_residual = 0.
+
+                # SVD of the small matrix [diag(sigma), p; 0, norm_residual], dropping its last row
+                # if the residual has been discarded
+                small_matrix = diag(self._incremental_singular_values + [0.])
+                small_matrix[:Nbasis, Nbasis] = projection
+                small_matrix[Nbasis, Nbasis] = norm_residual
+                if norm_residual == 0.:
+                    small_matrix = small_matrix[:Nbasis, :]
+                (small_left_singular_vectors, singular_values, _) = svd(small_matrix, full_matrices=False)
+
+                # Truncate as much as allowed by the tolerance
+                tolerated_discarded_energy = self.tolerance * self._incremental_energy
+                Ntruncated = len(singular_values)
+                while Ntruncated > 0:
+                    truncated_energy = compute_total_energy(singular_values[Ntruncated - 1:]**2)
+                    if self._incremental_discarded_energy + truncated_energy > tolerated_discarded_energy:
+                        break
+                    Ntruncated -= 1
+                self._incremental_discarded_energy += compute_total_energy(singular_values[Ntruncated:]**2)
+                while Ntruncated > 0 and singular_values[Ntruncated - 1] == 0.:
+                    Ntruncated -= 1
+
+                # Update U and sigma
+                if Ntruncated > 0:
+                    extended_basis = BasisContainerType(self.space, *self.args)
+                    extended_basis.enrich(self._incremental_basis, copy=False)
+                    if norm_residual > 0.:
+                        residual /= norm_residual
+                        extended_basis.enrich(residual, copy=False)
+                    rotation = online_backend.OnlineMatrix(len(extended_basis), Ntruncated)
+                    rotation[:, :] = small_left_singular_vectors[:, :Ntruncated]
+                    self._incremental_basis = extended_basis * rotation
+                else:
+                    self._incremental_basis = BasisContainerType(self.space, *self.args)
+                self._incremental_singular_values = [float(v) for v in singular_values[:Ntruncated]]
+            self.snapshots_matrix.clear()
+            self.elapsed_time["incremental compression"] = (
+                self.elapsed_time.get("incremental compression", 0.) + python_timer() - start)
+
+        def _incremental_basis_transpose_mul(self, function):
             inner_product = self.inner_product
-            snapshots_matrix = self.snapshots_matrix
             transpose = backend.transpose
 
             if inner_product is not None:
-                correlation = transpose(snapshots_matrix) * inner_product * snapshots_matrix
+                output = transpose(self._incremental_basis) * inner_product * function
             else:
-                correlation = transpose(snapshots_matrix) * snapshots_matrix
+                output = transpose(self._incremental_basis) * function
+            return [float(o) for o in asarray(output)]
 
-            basis_functions = BasisContainerType(self.space, *self.args)
+        def _incremental_basis_extend_mul(self, function, coefficients):
+            # Compute [U, function] * coefficients
+            extended_basis = BasisContainerType(self.space, *self.args)
+            extended_basis.enrich(self._incremental_basis, copy=False)
+            extended_basis.enrich(function, copy=False)
+            online_coefficients = online_backend.OnlineVector(len(coefficients))
+            online_coefficients[:] = coefficients
+            return extended_basis * online_coefficients
 
-            eigensolver = online_backend.OnlineEigenSolver(basis_functions, correlation)
-            parameters = {
-                "problem_type": "hermitian",
-                "spectrum": "largest real"
-            }
-            eigensolver.set_parameters(parameters)
-            eigensolver.solve()
+        def apply(self, Nmax, tol):
+            inner_product = self.inner_product
+            transpose = backend.transpose
 
-            Neigs = len(self.snapshots_matrix)
+            self._compress_snapshots()
+            if self.engine == "incremental":
+                Neigs = len(self._incremental_singular_values)
+                snapshots_matrix = self._incremental_basis
+            else:
+                Neigs = len(self.snapshots_matrix)
+                snapshots_matrix = self.snapshots_matrix
             Nmax = min(Nmax, Neigs)
+
+            basis_functions = BasisContainerType(self.space, *self.args)
+
+            start = python_timer()
+            if self.engine == "exact":
+                (eigenvalues, eigenvectors, total_energy) = self._exact_eigenpairs(Nmax)
+            elif self.engine == "partial":
+                (eigenvalues, eigenvectors, total_energy) = self._partial_eigenpairs(Nmax)
+            elif self.engine == "randomized":
+                (eigenvalues, eigenvectors, total_energy) = self._randomized_eigenpairs(Nmax)
+            elif self.engine == "incremental":
+                (eigenvalues, eigenvectors, total_energy) = self._incremental_eigenpairs(Nmax)
+            else:
+                raise ValueError("Invalid POD engine")
+            self.elapsed_time["eigenvalue problem"] = python_timer() - start
+
             assert len(self.eigenvalues) == 0
-            for i in range(Neigs):
-                (eig_i_real, eig_i_complex) = eigensolver.get_eigenvalue(i)
-                assert isclose(eig_i_complex, 0.)
-                self.eigenvalues.append(eig_i_real)
+            self.eigenvalues.extend(eigenvalues)
 
-            total_energy = compute_total_energy([abs(e) for e in self.eigenvalues])
             retained_energy = compute_retained_energy([abs(e) for e in self.eigenvalues])
             assert len(self.retained_energy) == 0
             if total_energy > 0.:
                 self.retained_energy.extend([retained_energy_i / total_energy
                                              for retained_energy_i in retained_energy])
             else:
-                self.retained_energy.extend([1. for _ in range(Neigs)])  # trivial case, all snapshots are zero
+                self.retained_energy.extend([1. for _ in self.eigenvalues])  # trivial case, all snapshots are zero
 
-            eigenvectors = list()
+            start = python_timer()
             for N in range(Nmax):
-                (eigvector, _) = eigensolver.get_eigenvector(N)
-                eigenvectors.append(eigvector)
-                b = self.snapshots_matrix * eigvector
+                eigvector = eigenvectors[N]
+                b = snapshots_matrix * eigvector
                 if inner_product is not None:
                     norm_b = sqrt(transpose(b) * inner_product * b)
                 else:
@@ -88,15 +254,172 @@ def ProperOrthogonalDecompositionBase(backend, wrapping, online_backend, online_
                 if tol > 0. and self.retained_energy[N] > 1. - tol:
                     break
             N += 1
+            self.elapsed_time["basis functions"] = python_timer() - start
+
+            original_energy = self._discarded_energy + total_energy
+            self.discarded_energy = max(original_energy - compute_total_energy(
+                [abs(e) for e in self.eigenvalues[:N]]), 0.)
+            if original_energy > 0.:
+                self.relative_error_bound = self.discarded_energy / original_energy
+            else:
+                self.relative_error_bound = 0.
+
+            return (self.eigenvalues[:N], eigenvectors[:N], basis_functions, N)
+
+        def compress(self, Nmax, tol):
+            # Replace the stored snapshots by the POD modes, weighted by the square root of the corresponding
+            # eigenvalues, so that they can be merged into another POD object as a node of a hierarchical
+            # approximate POD (HAPOD). The compression error of the snapshots merged at the root of the HAPOD
+            # tree is bounded by the sum of the energy discarded at each node.
+            (eigenvalues, _, basis_functions, N) = self.apply(Nmax, tol)
+            self.snapshots_matrix.clear()
+            self._init_incremental_basis()
+            self._discarded_energy = self.discarded_energy
+            self.snapshots_matrix.enrich(basis_functions, weights=[sqrt(abs(e)) for e in eigenvalues])
+            return N
+
+        def merge(self, other):
+            assert len(other._incremental_basis) == 0, "Only compressed POD objects can be merged"
+            self.snapshots_matrix.enrich(other.snapshots_matrix)
+            self._discarded_energy += other._discarded_energy
+            self._compress_snapshots()
 
-            return (self.eigenvalues[:N], eigenvectors, basis_functions, N)
+        def save(self, directory, filename):
+            assert len(self._incremental_basis) == 0, "Only compressed POD objects can be saved"
+            self.snapshots_matrix.save(directory, filename)
+            TextIO.save_file(float(self._discarded_energy), directory, filename + "_discarded_energy")
+
+        def load(self, directory, filename):
+            # Snapshots are stored in addition to the current ones, as in merge
+            snapshots_matrix = SnapshotsContainerType(self.space, *self.args)
+            snapshots_matrix.load(directory, filename)
+            self.snapshots_matrix.enrich(snapshots_matrix)
+            self._discarded_energy += TextIO.load_file(directory, filename + "_discarded_energy")
+            self._compress_snapshots()
+
+        def _correlation(self):
+            inner_product = self.inner_product
+            snapshots_matrix = self.snapshots_matrix
+            transpose = backend.transpose
+
+            if inner_product is not None:
+                return transpose(snapshots_matrix) * inner_product * snapshots_matrix
+            else:
+                return transpose(snapshots_matrix) * snapshots_matrix
+
+        def _correlation_eigensolver(self, correlation, n_eigs=None):
+            eigensolver = online_backend.OnlineEigenSolver(None, correlation)
+            parameters = {
+                "problem_type": "hermitian",
+                "spectrum": "largest real"
+            }
+            eigensolver.set_parameters(parameters)
+            eigensolver.solve(n_eigs)
+            return eigensolver
+
+        def _exact_eigenpairs(self, Nmax):
+            eigensolver = self._correlation_eigensolver(self._correlation())
+
+            eigenvalues = list()
+            for i in range(len(self.snapshots_matrix)):
+                (eig_i_real, eig_i_complex) = eigensolver.get_eigenvalue(i)
+                assert isclose(eig_i_complex, 0.)
+                eigenvalues.append(eig_i_real)
+            eigenvectors = [eigensolver.get_eigenvector(i)[0] for i in range(Nmax)]
+            total_energy = compute_total_energy([abs(e) for e in eigenvalues])
+            return (eigenvalues, eigenvectors, total_energy)
+
+        def _partial_eigenpairs(self, Nmax):
+            # The total energy is the trace of the correlation matrix, so that the retained energy
+            # can be computed without the discarded eigenvalues
+            correlation = self._correlation()
+            eigensolver = self._correlation_eigensolver(correlation, Nmax)
+
+            eigenvalues = list()
+            for i in range(Nmax):
+                (eig_i_real, eig_i_complex) = eigensolver.get_eigenvalue(i)
+                assert isclose(eig_i_complex, 0.)
+                eigenvalues.append(eig_i_real)
+            eigenvectors = [eigensolver.get_eigenvector(i)[0] for i in range(Nmax)]
+            total_energy = asarray(correlation).trace()
+            return (eigenvalues, eigenvectors, total_energy)
+
+        def _randomized_eigenpairs(self, Nmax):
+            # Randomized range finder for the correlation matrix C, with power iterations, followed by
+            # a Rayleigh-Ritz projection. C is never assembled: only its action C * Q = S^T * X * (S * Q)
+            # on a few columns is required.
+            Ns = len(self.snapshots_matrix)
+            Nsamples = min(Nmax + self.oversampling, Ns)
+            random_samples = RandomState(self.seed).standard_normal((Ns, Nsamples))
+
+            (Q, _) = qr(self._correlation_mul(random_samples))
+            for _ in range(self.power_iterations):
+                (Q, _) = qr(self._correlation_mul(Q))
+            projected_correlation = Q.T @ self._correlation_mul(Q)
+            projected_correlation = 0.5 * (projected_correlation + projected_correlation.T)
+            (eigs, eigv) = eigh(projected_correlation)
+            idx = eigs.argsort()[::-1][:Nmax]  # sort by decreasing value
+            eigv = Q @ eigv[:, idx]
+
+            eigenvalues = [float(e) for e in eigs[idx]]
+            eigenvectors = list()
+            for i in range(Nmax):
+                eigvector = online_backend.OnlineVector(Ns)
+                eigvector[:] = eigv[:, i]
+                eigenvectors.append(online_backend.OnlineFunction(eigvector))
+            total_energy = self._snapshots_energy()
+            return (eigenvalues, eigenvectors, total_energy)
+
+        def _incremental_eigenpairs(self, Nmax):
+            # The compressed snapshots U * diag(sigma) have correlation matrix diag(sigma^2), so that the
+            # eigenvectors are the canonical basis vectors and the POD modes are the columns of U.
+            # The total energy is the one of the original snapshots.
+            Nbasis = len(self._incremental_singular_values)
+            eigenvalues = [sigma**2 for sigma in self._incremental_singular_values]
+            eigenvectors = list()
+            for i in range(Nmax):
+                eigvector = online_backend.OnlineVector(Nbasis)
+                eigvector[i] = 1.
+                eigenvectors.append(online_backend.OnlineFunction(eigvector))
+            total_energy = self._incremental_energy
+            return (eigenvalues, eigenvectors, total_energy)
+
+        def _correlation_mul(self, array):
+            inner_product = self.inner_product
+            snapshots_matrix = self.snapshots_matrix
+            transpose = backend.transpose
+
+            online_matrix = online_backend.OnlineMatrix(*array.shape)
+            online_matrix[:, :] = array
+            snapshots_matrix_times_array = snapshots_matrix * online_matrix
+            if inner_product is not None:
+                return asarray(transpose(snapshots_matrix) * inner_product * snapshots_matrix_times_array)
+            else:
+                return asarray(transpose(snapshots_matrix) * snapshots_matrix_times_array)
+
+        def _snapshots_energy(self):
+            # Trace of the correlation matrix
+            inner_product = self.inner_product
+            transpose = backend.transpose
+
+            total_energy = 0.
+            for snapshot in self.snapshots_matrix:
+                if inner_product is not None:
+                    total_energy += transpose(snapshot) * inner_product * snapshot
+                else:
+                    total_energy += transpose(snapshot) * snapshot
+            return total_energy
 
         def print_eigenvalues(self, N=None):
             if N is None:
-                N = len(self.snapshots_matrix)
+                N = len(self.eigenvalues)
             for i in range(N):
                 print("lambda_" + str(i) + " = " + str(self.eigenvalues[i]))
 
+        def print_elapsed_time(self):
+            print("POD (" + self.engine + " engine) elapsed time: " + ", ".join(
+                key + " " + str(value) + " s" for (key, value) in self.elapsed_time.items()))
+
         def save_eigenvalues_file(self, output_directory, eigenvalues_file):
             self.eigenvalues.save(output_directory, eigenvalues_file)
 
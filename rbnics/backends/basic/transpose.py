@@ -223,6 +223,27 @@ def Vector_Transpose__times__Matrix(backend, wrapping, online_backend, online_wr
             logger.log(DEBUG, "End v^T A w")
             return output
 
+        @overload(backend.FunctionsList, )
+        def __mul__(self, functions_list):
+            logger.log(DEBUG, "Begin v^T A S")
+            output = online_backend.OnlineVector(len(functions_list))
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_j) for fun_j in functions_list],
+                wrapping.matrix_transpose_mul_vector(self.matrix, self.vector))
+            logger.log(DEBUG, "End v^T A S")
+            return output
+
+        @overload(backend.BasisFunctionsMatrix, )
+        def __mul__(self, basis_functions_matrix):
+            logger.log(DEBUG, "Begin v^T A Z")
+            output = online_backend.OnlineVector(basis_functions_matrix._component_name_to_basis_component_length)
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_j) for component_name in basis_functions_matrix._components_name
+                 for fun_j in basis_functions_matrix._components[component_name]],
+                wrapping.matrix_transpose_mul_vector(self.matrix, self.vector))
+            logger.log(DEBUG, "End v^T A Z")
+            return output
+
         @overload(object, )
         def __mul__(self, other):
             if AdditionalIsFunction(other):
@@ -253,9 +274,9 @@ def FunctionsList_Transpose(backend, wrapping, online_backend, online_wrapping,
         def __mul__(self, function):
             logger.log(DEBUG, "Begin S^T w")
             output = online_backend.OnlineVector(len(self.functions_list))
-            for (i, fun_i) in enumerate(self.functions_list):
-                output[i] = wrapping.vector_mul_vector(
-                    wrapping.function_to_vector(fun_i), wrapping.function_to_vector(function))
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_i) for fun_i in self.functions_list],
+                wrapping.function_to_vector(function))
             logger.log(DEBUG, "End S^T w")
             return output
 
@@ -268,8 +289,8 @@ def FunctionsList_Transpose(backend, wrapping, online_backend, online_wrapping,
         def __mul__(self, vector):
             logger.log(DEBUG, "Begin S^T w")
             output = online_backend.OnlineVector(len(self.functions_list))
-            for (i, fun_i) in enumerate(self.functions_list):
-                output[i] = wrapping.vector_mul_vector(wrapping.function_to_vector(fun_i), vector)
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_i) for fun_i in self.functions_list], vector)
             logger.log(DEBUG, "End S^T w")
             return output
 
@@ -305,10 +326,12 @@ def FunctionsList_Transpose__times__Matrix(backend, wrapping, online_backend, on
         def __mul__(self, other_functions_list):
             logger.log(DEBUG, "Begin S^T*A*S")
             output = online_backend.OnlineMatrix(len(self.functions_list), len(other_functions_list))
-            for (j, fun_j) in enumerate(other_functions_list):
-                matrix_times_fun_j = wrapping.matrix_mul_vector(self.matrix, wrapping.function_to_vector(fun_j))
-                for (i, fun_i) in enumerate(self.functions_list):
-                    output[i, j] = wrapping.vector_mul_vector(wrapping.function_to_vector(fun_i), matrix_times_fun_j)
+            vectors = [wrapping.function_to_vector(fun_i) for fun_i in self.functions_list]
+            if other_functions_list is self.functions_list:
+                other_vectors = vectors  # allow the backend to store the vectors only once
+            else:
+                other_vectors = [wrapping.function_to_vector(fun_j) for fun_j in other_functions_list]
+            output[:, :] = wrapping.vectors_mul_matrix_mul_vectors(vectors, self.matrix, other_vectors)
             logger.log(DEBUG, "End S^T*A*S")
             return output
 
@@ -317,8 +340,8 @@ def FunctionsList_Transpose__times__Matrix(backend, wrapping, online_backend, on
             logger.log(DEBUG, "Begin S^T*A*v")
             output = online_backend.OnlineVector(len(self.functions_list))
             matrix_times_function = wrapping.matrix_mul_vector(self.matrix, wrapping.function_to_vector(function))
-            for (i, fun_i) in enumerate(self.functions_list):
-                output[i] = wrapping.vector_mul_vector(wrapping.function_to_vector(fun_i), matrix_times_function)
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_i) for fun_i in self.functions_list], matrix_times_function)
             logger.log(DEBUG, "End S^T*A*v")
             return output
 
@@ -327,8 +350,8 @@ def FunctionsList_Transpose__times__Matrix(backend, wrapping, online_backend, on
             logger.log(DEBUG, "Begin S^T*A*v")
             output = online_backend.OnlineVector(len(self.functions_list))
             matrix_times_vector = wrapping.matrix_mul_vector(self.matrix, vector)
-            for (i, fun_i) in enumerate(self.functions_list):
-                output[i] = wrapping.vector_mul_vector(wrapping.function_to_vector(fun_i), matrix_times_vector)
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_i) for fun_i in self.functions_list], matrix_times_vector)
             logger.log(DEBUG, "End S^T*A*v")
             return output
 
@@ -366,12 +389,10 @@ def BasisFunctionsMatrix_Transpose(backend, wrapping, online_backend, online_wra
         def __mul__(self, function):
             logger.log(DEBUG, "Begin Z^T w")
             output = online_backend.OnlineVector(self.basis_functions_matrix._component_name_to_basis_component_length)
-            i = 0
-            for component_name in self.basis_functions_matrix._components_name:
-                for fun_i in self.basis_functions_matrix._components[component_name]:
-                    output[i] = wrapping.vector_mul_vector(
-                        wrapping.function_to_vector(fun_i), wrapping.function_to_vector(function))
-                    i += 1
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_i) for component_name in self.basis_functions_matrix._components_name
+                 for fun_i in self.basis_functions_matrix._components[component_name]],
+                wrapping.function_to_vector(function))
             logger.log(DEBUG, "End Z^T w")
             # Assert consistency of private attributes storing the order of components and their basis length.
             assert output._component_name_to_basis_component_index == self._component_name_to_basis_component_index
@@ -387,11 +408,10 @@ def BasisFunctionsMatrix_Transpose(backend, wrapping, online_backend, online_wra
         def __mul__(self, vector):
             logger.log(DEBUG, "Begin Z^T w")
             output = online_backend.OnlineVector(self.basis_functions_matrix._component_name_to_basis_component_length)
-            i = 0
-            for component_name in self.basis_functions_matrix._components_name:
-                for fun_i in self.basis_functions_matrix._components[component_name]:
-                    output[i] = wrapping.vector_mul_vector(wrapping.function_to_vector(fun_i), vector)
-                    i += 1
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_i) for component_name in self.basis_functions_matrix._components_name
+                 for fun_i in self.basis_functions_matrix._components[component_name]],
+                vector)
             logger.log(DEBUG, "End Z^T w")
             # Assert consistency of private attributes storing the order of components and their basis length.
             assert output._component_name_to_basis_component_index == self._component_name_to_basis_component_index
@@ -444,18 +464,16 @@ def BasisFunctionsMatrix_Transpose__times__Matrix(backend, wrapping, online_back
             output = online_backend.OnlineMatrix(
                 self.basis_functions_matrix._component_name_to_basis_component_length,
                 other_basis_functions_matrix._component_name_to_basis_component_length)
-            j = 0
-            for other_component_name in other_basis_functions_matrix._components_name:
-                for fun_j in other_basis_functions_matrix._components[other_component_name]:
-                    matrix_times_fun_j = wrapping.matrix_mul_vector(
-                        self.matrix, wrapping.function_to_vector(fun_j))
-                    i = 0
-                    for self_component_name in self.basis_functions_matrix._components_name:
-                        for fun_i in self.basis_functions_matrix._components[self_component_name]:
-                            output[i, j] = wrapping.vector_mul_vector(
-                                wrapping.function_to_vector(fun_i), matrix_times_fun_j)
-                            i += 1
-                    j += 1
+            vectors = [wrapping.function_to_vector(fun_i)
+                       for self_component_name in self.basis_functions_matrix._components_name
+                       for fun_i in self.basis_functions_matrix._components[self_component_name]]
+            if other_basis_functions_matrix is self.basis_functions_matrix:
+                other_vectors = vectors  # allow the backend to store the vectors only once
+            else:
+                other_vectors = [wrapping.function_to_vector(fun_j)
+                                 for other_component_name in other_basis_functions_matrix._components_name
+                                 for fun_j in other_basis_functions_matrix._components[other_component_name]]
+            output[:, :] = wrapping.vectors_mul_matrix_mul_vectors(vectors, self.matrix, other_vectors)
             logger.log(DEBUG, "End Z^T*A*Z")
             # Assert consistency of private attributes storing the order of components and their basis length.
             assert output._component_name_to_basis_component_index == (
@@ -472,11 +490,10 @@ def BasisFunctionsMatrix_Transpose__times__Matrix(backend, wrapping, online_back
             logger.log(DEBUG, "Begin Z^T*A*v")
             output = online_backend.OnlineVector(self.basis_functions_matrix._component_name_to_basis_component_length)
             matrix_times_function = wrapping.matrix_mul_vector(self.matrix, wrapping.function_to_vector(function))
-            i = 0
-            for component_name in self.basis_functions_matrix._components_name:
-                for fun_i in self.basis_functions_matrix._components[component_name]:
-                    output[i] = wrapping.vector_mul_vector(wrapping.function_to_vector(fun_i), matrix_times_function)
-                    i += 1
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_i) for component_name in self.basis_functions_matrix._components_name
+                 for fun_i in self.basis_functions_matrix._components[component_name]],
+                matrix_times_function)
             logger.log(DEBUG, "End Z^T*A*v")
             # Assert consistency of private attributes storing the order of components and their basis length.
             assert output._component_name_to_basis_component_index == self._component_name_to_basis_component_index
@@ -489,11 +506,10 @@ def BasisFunctionsMatrix_Transpose__times__Matrix(backend, wrapping, online_back
             logger.log(DEBUG, "Begin Z^T*A*v")
             output = online_backend.OnlineVector(self.basis_functions_matrix._component_name_to_basis_component_length)
             matrix_times_vector = wrapping.matrix_mul_vector(self.matrix, vector)
-            i = 0
-            for component_name in self.basis_functions_matrix._components_name:
-                for fun_i in self.basis_functions_matrix._components[component_name]:
-                    output[i] = wrapping.vector_mul_vector(wrapping.function_to_vector(fun_i), matrix_times_vector)
-                    i += 1
+            output[:] = wrapping.vectors_mul_vector(
+                [wrapping.function_to_vector(fun_i) for component_name in self.basis_functions_matrix._components_name
+                 for fun_i in self.basis_functions_matrix._components[component_name]],
+                matrix_times_vector)
             logger.log(DEBUG, "End Z^T*A*v")
             # Assert consistency of private attributes storing the order of components and their basis length.
             assert output._component_name_to_basis_component_index == self._component_name_to_basis_component_index
@@ -57,6 +57,8 @@ class DelayedLinearSolver(object):
         rhs = sum(product(thetas, operators))
         solver = LinearSolver(self._lhs, self._solution, rhs, self._bcs)
         solver.set_parameters(self._parameters)
+        solver.set_factorization_cache(
+            get_reduced_problem_from_riesz_solve_inner_product(self._lhs).truth_problem._factorization_cache)
         solver.solve()
 
     def save(self, directory, filename):
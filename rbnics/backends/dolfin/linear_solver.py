@@ -4,6 +4,7 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+from petsc4py import PETSc
 from ufl import Form
 from dolfin import assemble, DirichletBC, PETScLUSolver
 from rbnics.backends.abstract import LinearSolver as AbstractLinearSolver, LinearProblemWrapper
@@ -13,11 +14,13 @@ from rbnics.backends.dolfin.matrix import Matrix
 from rbnics.backends.dolfin.parametrized_tensor_factory import ParametrizedTensorFactory
 from rbnics.backends.dolfin.vector import Vector
 from rbnics.backends.dolfin.wrapping.dirichlet_bc import ProductOutputDirichletBC
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
 from rbnics.utils.decorators import BackendFor, dict_of, list_of, overload
 
 
 @BackendFor("dolfin", inputs=((Form, Matrix.Type(), ParametrizedTensorFactory, LinearProblemWrapper),
-                              Function.Type(), (Form, ParametrizedTensorFactory, Vector.Type(), None),
+                              (Function.Type(), list_of(Function.Type())),
+                              (Form, ParametrizedTensorFactory, Vector.Type(), list_of(Vector.Type()), None),
                               (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)),
                                dict_of(str, ProductOutputDirichletBC), None)))
 class LinearSolver(AbstractLinearSolver):
@@ -31,6 +34,22 @@ class LinearSolver(AbstractLinearSolver):
         self._init_rhs(rhs, bcs)
         self._apply_bcs(bcs)
         self._linear_solver = "default"
+        self._factorization_cache = None
+        self.monitor = None
+
+    @overload((Form, Matrix.Type(), ParametrizedTensorFactory),
+              list_of(Function.Type()), list_of(Vector.Type()),
+              (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)),
+               dict_of(str, ProductOutputDirichletBC), None))
+    def __init__(self, lhs, solutions, rhs, bcs=None):
+        # Block of linear systems sharing the same left-hand side, which will be solved at once
+        assert len(solutions) == len(rhs)
+        self.solution = solutions
+        self._init_lhs(lhs, bcs)
+        self._init_rhs(rhs, bcs)
+        self._apply_bcs(bcs)
+        self._linear_solver = "default"
+        self._factorization_cache = None
         self.monitor = None
 
     @overload(LinearProblemWrapper, Function.Type())
@@ -42,23 +61,31 @@ class LinearSolver(AbstractLinearSolver):
                      dict_of(str, ProductOutputDirichletBC), None))
     def _init_lhs(self, lhs, bcs):
         self.lhs = assemble(lhs, keep_diagonal=True)
+        self._lhs_bcs = bcs
+        self._lhs_is_cacheable = False
 
     @overload(ParametrizedTensorFactory, (list_of(DirichletBC), ProductOutputDirichletBC,
                                           dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC),
                                           None))
     def _init_lhs(self, lhs, bcs):
         self.lhs = evaluate(lhs)
+        self._lhs_bcs = bcs
+        self._lhs_is_cacheable = False
 
     @overload(Matrix.Type(), None)
     def _init_lhs(self, lhs, bcs):
         self.lhs = lhs
+        self._lhs_bcs = None
+        self._lhs_is_cacheable = True
 
     @overload(Matrix.Type(), (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)),
                               dict_of(str, ProductOutputDirichletBC)))
     def _init_lhs(self, lhs, bcs):
-        # Create a copy of lhs, in order not to change
-        # the original references when applying bcs
-        self.lhs = lhs.copy()
+        # Do not apply bcs yet, since they are not needed if a factorization of lhs is already available.
+        # A copy of lhs will be created when applying bcs, in order not to change the original references
+        self.lhs = lhs
+        self._lhs_bcs = bcs
+        self._lhs_is_cacheable = True
 
     @overload(Form, (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)),
                      dict_of(str, ProductOutputDirichletBC), None))
@@ -82,20 +109,71 @@ class LinearSolver(AbstractLinearSolver):
         # the original references when applying bcs
         self.rhs = rhs.copy()
 
+    @overload(list_of(Vector.Type()), None)
+    def _init_rhs(self, rhs, bcs):
+        self.rhs = rhs
+
+    @overload(list_of(Vector.Type()), (list_of(DirichletBC), ProductOutputDirichletBC,
+                                       dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC)))
+    def _init_rhs(self, rhs, bcs):
+        # Create a copy of each rhs, in order not to change
+        # the original references when applying bcs
+        self.rhs = [rhs_.copy() for rhs_ in rhs]
+
     @overload(None)
     def _apply_bcs(self, bcs):
         pass
 
     @overload((list_of(DirichletBC), ProductOutputDirichletBC))
     def _apply_bcs(self, bcs):
-        for bc in bcs:
-            bc.apply(self.lhs, self.rhs)
+        for rhs in self._rhs_as_list():
+            for bc in bcs:
+                bc.apply(rhs)
 
     @overload((dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC)))
     def _apply_bcs(self, bcs):
+        for rhs in self._rhs_as_list():
+            for key in bcs:
+                for bc in bcs[key]:
+                    bc.apply(rhs)
+
+    def _rhs_as_list(self):
+        if isinstance(self.rhs, list):
+            return self.rhs
+        else:
+            return [self.rhs]
+
+    @overload(None)
+    def _apply_bcs_to_lhs(self, bcs):
+        pass
+
+    @overload((list_of(DirichletBC), ProductOutputDirichletBC))
+    def _apply_bcs_to_lhs(self, bcs):
+        if self._lhs_is_cacheable:
+            self.lhs = self.lhs.copy()
+        for bc in bcs:
+            bc.apply(self.lhs)
+
+    @overload((dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC)))
+    def _apply_bcs_to_lhs(self, bcs):
+        if self._lhs_is_cacheable:
+            self.lhs = self.lhs.copy()
         for key in bcs:
             for bc in bcs[key]:
-                bc.apply(self.lhs, self.rhs)
+                bc.apply(self.lhs)
+
+    @overload(None)
+    def _bcs_key(self, bcs):
+        return None
+
+    @overload((list_of(DirichletBC), ProductOutputDirichletBC))
+    def _bcs_key(self, bcs):
+        # Only constrained dofs affect the left-hand side, boundary values do not
+        return tuple(bc._identifier for bc in bcs)
+
+    @overload((dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC)))
+    def _bcs_key(self, bcs):
+        return tuple((key, tuple(bc._identifier for bc in bcs[key])) for key in bcs)
 
     def set_parameters(self, parameters):
         assert len(parameters) in (0, 1)
@@ -103,8 +181,57 @@ class LinearSolver(AbstractLinearSolver):
             assert "linear_solver" in parameters
         self._linear_solver = parameters.get("linear_solver", "default")
 
+    def set_factorization_cache(self, factorization_cache):
+        """
+        Store factorizations of the left-hand side in the provided cache, so that they can be re-used by
+        further solvers sharing the same left-hand side. The cache is not part of the solver parameters,
+        since parameters may be saved to file.
+
+        :param factorization_cache: a FactorizationCache, or None to disable caching.
+        """
+        self._factorization_cache = factorization_cache
+
     def solve(self):
-        solver = PETScLUSolver(self._linear_solver)
-        solver.solve(self.lhs, self.solution.vector(), self.rhs)
-        if self.monitor is not None:
-            self.monitor(self.solution)
+        def factorize():
+            self._apply_bcs_to_lhs(self._lhs_bcs)
+            solver = PETScLUSolver(self._linear_solver)
+            solver.set_operator(self.lhs)
+            return solver
+
+        if self._factorization_cache is not None and self._lhs_is_cacheable:
+            solver = self._factorization_cache.get(
+                self.lhs, (self._bcs_key(self._lhs_bcs), self._linear_solver), factorize)
+        else:
+            solver = factorize()
+        if isinstance(self.solution, list):
+            self._solve_block(solver)
+        else:
+            solver.solve(self.solution.vector(), self.rhs)
+            if self.monitor is not None:
+                self.monitor(self.solution)
+
+    def _solve_block(self, solver):
+        if len(self.solution) == 0:
+            return
+        # Gather all right-hand sides as columns of a dense matrix, and carry out all forward and backward
+        # substitutions at once with the factorization of the left-hand side
+        ksp = solver.ksp()
+        ksp.setUp()
+        factorization = ksp.getPC().getFactorMatrix()
+        lhs = to_petsc4py(self.lhs)
+        rhs = PETSc.Mat().createDense((lhs.getSizes()[0], (PETSc.DECIDE, len(self.rhs))), comm=lhs.getComm())
+        rhs.setUp()
+        rhs_array = rhs.getDenseArray()
+        for (j, rhs_j) in enumerate(self.rhs):
+            rhs_array[:, j] = rhs_j.get_local()
+        rhs.assemble()
+        solution = rhs.duplicate()
+        factorization.matSolve(rhs, solution)
+        solution_array = solution.getDenseArray()
+        for (j, solution_j) in enumerate(self.solution):
+            solution_j.vector().set_local(solution_array[:, j])
+            solution_j.vector().apply("insert")
+            if self.monitor is not None:
+                self.monitor(solution_j)
+        rhs.destroy()
+        solution.destroy()
@@ -72,7 +72,9 @@ from rbnics.backends.dolfin.wrapping.is_problem_solution import is_problem_solut
 from rbnics.backends.dolfin.wrapping.is_problem_solution_dot import is_problem_solution_dot
 from rbnics.backends.dolfin.wrapping.is_problem_solution_type import is_problem_solution_type
 from rbnics.backends.dolfin.wrapping.is_time_dependent import is_time_dependent
-from rbnics.backends.dolfin.wrapping.matrix_mul import matrix_mul_vector, vectorized_matrix_inner_vectorized_matrix
+from rbnics.backends.dolfin.wrapping.matrix_mul import (
+    matrix_mul_vector, matrix_transpose_mul_vector, vectorized_matrix_inner_vectorized_matrix,
+    vectors_mul_matrix_mul_vectors)
 from rbnics.backends.dolfin.wrapping.parametrized_constant import (
     is_parametrized_constant, ParametrizedConstant, parametrized_constant_to_float)
 from rbnics.backends.dolfin.wrapping.parametrized_expression import ParametrizedExpression
@@ -87,7 +89,7 @@ from rbnics.backends.dolfin.wrapping.solution_identify_component import solution
 from rbnics.backends.dolfin.wrapping.solution_iterator import solution_iterator
 from rbnics.backends.dolfin.wrapping.tensor_copy import tensor_copy
 from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
-from rbnics.backends.dolfin.wrapping.vector_mul import vector_mul_vector
+from rbnics.backends.dolfin.wrapping.vector_mul import vector_mul_vector, vectors_mul_vector
 
 __all__ = [
     "assemble",
@@ -157,6 +159,7 @@ __all__ = [
     "is_time_dependent",
     "map_functionspaces_between_mesh_and_submesh",
     "matrix_mul_vector",
+    "matrix_transpose_mul_vector",
     "ParametrizedConstant",
     "parametrized_constant_to_float",
     "ParametrizedExpression",
@@ -171,7 +174,9 @@ __all__ = [
     "tensor_copy",
     "to_petsc4py",
     "vector_mul_vector",
-    "vectorized_matrix_inner_vectorized_matrix"
+    "vectorized_matrix_inner_vectorized_matrix",
+    "vectors_mul_matrix_mul_vectors",
+    "vectors_mul_vector"
 ]
 
 __overridden__ = {
@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 from dolfin import Function, FunctionSpace
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
 
 
 def basis_functions_matrix_mul_online_matrix(basis_functions_matrix, online_matrix, BasisFunctionsMatrixType):
@@ -13,18 +14,17 @@ def basis_functions_matrix_mul_online_matrix(basis_functions_matrix, online_matr
 
     output = BasisFunctionsMatrixType(space)
     assert isinstance(online_matrix.M, dict)
+    vecs = [to_petsc4py(fun_i) for component_name in basis_functions_matrix._components_name
+            for fun_i in basis_functions_matrix._components[component_name]]
     j = 0
     for col_component_name in basis_functions_matrix._components_name:
         for _ in range(online_matrix.M[col_component_name]):
             assert len(online_matrix[:, j]) == sum(
                 len(functions_list) for functions_list in basis_functions_matrix._components)
             output_j = Function(space)
-            i = 0
-            for row_component_name in basis_functions_matrix._components_name:
-                for fun_i in basis_functions_matrix._components[row_component_name]:
-                    output_j.vector().add_local(fun_i.vector().get_local() * online_matrix[i, j])
-                    i += 1
-            output_j.vector().apply("add")
+            if len(vecs) > 0:
+                to_petsc4py(output_j).maxpy([online_matrix[i, j] for i in range(len(vecs))], vecs)
+                output_j.vector().apply("insert")
             output.enrich(output_j)
             j += 1
     return output
@@ -38,10 +38,10 @@ def basis_functions_matrix_mul_online_vector(basis_functions_matrix, online_vect
     if sum(basis_functions_matrix._component_name_to_basis_component_length.values()) == 0:
         return output
     else:
-        i = 0
-        for component_name in basis_functions_matrix._components_name:
-            for fun_i in basis_functions_matrix._components[component_name]:
-                output.vector().add_local(fun_i.vector().get_local() * online_vector[i])
-                i += 1
-        output.vector().apply("add")
+        # Linear combination of all basis functions at once (VecMAXPY), without allocating a temporary
+        # for each of them
+        vecs = [to_petsc4py(fun_i) for component_name in basis_functions_matrix._components_name
+                for fun_i in basis_functions_matrix._components[component_name]]
+        to_petsc4py(output).maxpy([online_vector[i] for i in range(len(vecs))], vecs)
+        output.vector().apply("insert")
         return output
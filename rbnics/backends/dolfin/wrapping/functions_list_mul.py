@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 from dolfin import Function, FunctionSpace
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
 
 
 def functions_list_mul_online_matrix(functions_list, online_matrix, FunctionsListType):
@@ -12,13 +13,14 @@ def functions_list_mul_online_matrix(functions_list, online_matrix, FunctionsLis
     assert isinstance(space, FunctionSpace)
 
     output = FunctionsListType(space)
-    assert isinstance(online_matrix.M, int)
-    for j in range(online_matrix.M):
+    assert isinstance(online_matrix.N, int)
+    vecs = [to_petsc4py(fun_i) for fun_i in functions_list]
+    for j in range(online_matrix.N):
         assert len(online_matrix[:, j]) == len(functions_list)
         output_j = Function(space)
-        for (i, fun_i) in enumerate(functions_list):
-            output_j.vector().add_local(fun_i.vector().get_local() * online_matrix[i, j])
-        output_j.vector().apply("add")
+        if len(functions_list) > 0:
+            to_petsc4py(output_j).maxpy([online_matrix[i, j] for i in range(len(functions_list))], vecs)
+            output_j.vector().apply("insert")
         output.enrich(output_j)
     return output
 
@@ -31,7 +33,8 @@ def functions_list_mul_online_vector(functions_list, online_vector):
     if len(functions_list) == 0:
         return output
     else:
-        for (i, fun_i) in enumerate(functions_list):
-            output.vector().add_local(fun_i.vector().get_local() * online_vector[i])
-        output.vector().apply("add")
+        # Linear combination of all functions at once (VecMAXPY), without allocating a temporary for each of them
+        to_petsc4py(output).maxpy(
+            [online_vector[i] for i in range(len(functions_list))], [to_petsc4py(fun_i) for fun_i in functions_list])
+        output.vector().apply("insert")
         return output
@@ -4,13 +4,68 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
-from dolfin import compile_cpp_code
+from numpy import array, empty, zeros
+from mpi4py.MPI import SUM
+from petsc4py import PETSc
+from dolfin import compile_cpp_code, PETScVector
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
 
 
 def matrix_mul_vector(matrix, vector):
     return matrix * vector
 
 
+def matrix_transpose_mul_vector(matrix, vector):
+    output = PETScVector(matrix.mpi_comm())
+    matrix.init_vector(output, 1)
+    matrix.transpmult(vector, output)
+    return output
+
+
+# Maximum number of vectors stored at once in the dense right operand of vectors_mul_matrix_mul_vectors
+_vectors_mul_matrix_mul_vectors_block_width = 64
+
+
+# Compute the dense matrix of entries vectors[i]^T * matrix * other_vectors[j]. The local rows of the vectors are
+# stored in dense blocks, so that the computation requires a sparse-times-dense product and a dense product for each
+# block of (at most _vectors_mul_matrix_mul_vectors_block_width) columns, and a single reduction, rather than
+# a matrix-vector product for each j and a reduction for each (i, j). Columns are processed in blocks so that, besides
+# the dense copy of vectors, only the product of matrix with a block of columns is stored at once.
+def vectors_mul_matrix_mul_vectors(vectors, matrix, other_vectors):
+    output = zeros((len(vectors), len(other_vectors)))
+    if len(vectors) == 0 or len(other_vectors) == 0:
+        return output
+    mat = to_petsc4py(matrix)
+    # Each row of block stores the local entries of one vector, so that the transpose of a range of consecutive
+    # rows is the (local size) x (number of vectors) column-major dense matrix expected by PETSc, without further
+    # copies. The right operand reuses block if it is made of the same vectors, or a single buffer of
+    # bounded width otherwise
+    block = array([vector.get_local() for vector in vectors])
+    if other_vectors is vectors:
+        other_block = block
+    else:
+        other_block = empty((min(len(other_vectors), _vectors_mul_matrix_mul_vectors_block_width),
+                             other_vectors[0].local_size()))
+    local_output = zeros(output.shape)
+    for begin in range(0, len(other_vectors), _vectors_mul_matrix_mul_vectors_block_width):
+        end = min(begin + _vectors_mul_matrix_mul_vectors_block_width, len(other_vectors))
+        if other_vectors is vectors:
+            other_block_view = other_block[begin:end]
+        else:
+            other_block_view = other_block[:end - begin]
+            for j in range(begin, end):
+                other_block_view[j - begin] = other_vectors[j].get_local()
+        other_mat = PETSc.Mat().createDense(
+            ((other_block_view.shape[1], PETSc.DETERMINE), (PETSc.DECIDE, other_block_view.shape[0])),
+            array=other_block_view.T, comm=mat.comm)
+        matrix_times_other_mat = mat.matMult(other_mat)
+        local_output[:, begin:end] = block @ matrix_times_other_mat.getDenseArray()
+        matrix_times_other_mat.destroy()
+        other_mat.destroy()
+    mat.comm.tompi4py().Allreduce(local_output, output, op=SUM)
+    return output
+
+
 cpp_code = """
     #include <pybind11/pybind11.h>
     #include <dolfin/la/LinearAlgebraObject.h>
@@ -894,6 +894,12 @@ def PullBackFormsToReferenceDomainDecoratedProblem(**decorator_kwargs):
                 else:
                     return ParametrizedDifferentialProblem_DerivedClass.compute_theta(self, term)
 
+            def compute_theta_batch(self, term, mus):
+                if term in self._pulled_back_theta_factors or term in self._stability_factor_terms_blacklist:
+                    return NotImplemented  # thetas are modified by compute_theta, use it instead
+                else:
+                    return ParametrizedDifferentialProblem_DerivedClass.compute_theta_batch(self, term, mus)
+
             def _map_facet_id_to_subdomain_id(self, **kwargs):
                 mesh = self.V.mesh()
                 mpi_comm = mesh.mpi_comm()
@@ -4,6 +4,17 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+from numpy import zeros
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
+
 
 def vector_mul_vector(vector1, vector2):
     return vector1.inner(vector2)
+
+
+# Compute the inner products of each of the vectors with vector, carrying out all of them at once (VecMDot),
+# and thus with a single reduction
+def vectors_mul_vector(vectors, vector):
+    if len(vectors) == 0:
+        return zeros(0)
+    return to_petsc4py(vector).mDot([to_petsc4py(vector_i) for vector_i in vectors])
@@ -4,7 +4,10 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+from numbers import Number
+from numpy import array as dense_array, ndindex
 from rbnics.backends.online.basic import AffineExpansionStorage as BasicAffineExpansionStorage
+from rbnics.backends.online.basic.wrapping import slice_to_array
 from rbnics.backends.online.numpy.copy import function_copy, tensor_copy
 from rbnics.backends.online.numpy.function import Function
 from rbnics.backends.online.numpy.matrix import Matrix
@@ -21,4 +24,101 @@ AffineExpansionStorage_Base = BasicAffineExpansionStorage(backend, wrapping)
 @BackendFor("numpy", inputs=((int, tuple_of(Matrix.Type()), tuple_of(Vector.Type())), (int, None)))
 class AffineExpansionStorage(AffineExpansionStorage_Base):
     def __init__(self, arg1, arg2=None):
+        self._array = None  # dense array of shape (Q, ...) or (Q0, Q1, ...), created on demand by to_array
         AffineExpansionStorage_Base.__init__(self, arg1, arg2)
+
+    def __getitem__(self, key):
+        output = AffineExpansionStorage_Base.__getitem__(self, key)
+        if output is not self and isinstance(output, AffineExpansionStorage) and output._array is None:
+            # Leading blocks (e.g. [:N] or [:N, :N]) of a dense storage are stored as views of its dense array
+            leading_block = self._leading_block(key)
+            if leading_block is not None:
+                output._set_array(self.to_array()[(Ellipsis, ) + leading_block])
+        return output
+
+    def __setitem__(self, key, item):
+        AffineExpansionStorage_Base.__setitem__(self, key, item)
+        self._array = None
+
+    def load(self, directory, filename):
+        loaded = AffineExpansionStorage_Base.load(self, directory, filename)
+        if loaded:
+            self._array = None
+        return loaded
+
+    def is_dense(self):
+        """
+        Return True if every element of the storage is an online matrix, vector or scalar, so that the
+        whole storage can be represented by a dense array.
+        """
+        if self._array is not None:
+            return True
+        if self._content.size == 0:
+            return False
+        first_item = self._content.flat[0]
+        if isinstance(first_item, Matrix.Type()):
+            item_type = Matrix.Type()
+        elif isinstance(first_item, Vector.Type()):
+            item_type = Vector.Type()
+        elif isinstance(first_item, Number):
+            item_type = Number
+        else:
+            return False
+        return all(isinstance(item, item_type) for item in self._content.flat)
+
+    def to_array(self):
+        """
+        Return a dense array of shape (Q, M, N) (matrix elements), (Q, N) (vector elements) or (Q, )
+        (scalar elements) for a storage of order one, and similarly of shape (Q0, Q1, ...) for a storage
+        of order two. The array is assembled once, and the content of every stored matrix or vector
+        is then replaced by a view of the corresponding block, so that no data is duplicated.
+        """
+        if self._array is None:
+            assert self.is_dense()
+            self._set_array(dense_array([
+                self._item_content(self._content[index]) for index in ndindex(self._content.shape)
+            ], dtype=float).reshape(self._content.shape + self._item_shape(self._content.flat[0])))
+        return self._array
+
+    def _set_array(self, array):
+        self._array = array
+        for index in ndindex(self._content.shape):
+            item = self._content[index]
+            if isinstance(item, (Matrix.Type(), Vector.Type())):
+                item.content = array[index]
+
+    @staticmethod
+    def _item_content(item):
+        if isinstance(item, (Matrix.Type(), Vector.Type())):
+            return item.content
+        else:
+            return item
+
+    @staticmethod
+    def _item_shape(item):
+        if isinstance(item, (Matrix.Type(), Vector.Type())):
+            return item.content.shape
+        else:
+            return ()
+
+    def _leading_block(self, key):
+        """
+        Return the tuple of slices corresponding to key if it selects the leading block of each element,
+        or None otherwise (e.g. when key selects a subset of several components). Internal method.
+        """
+        if not isinstance(key, tuple):
+            key = (key, )
+        if not all(isinstance(key_i, slice) for key_i in key) or not self.is_dense():
+            return None
+        first_item = self._content.flat[0]
+        if not isinstance(first_item, (Matrix.Type(), Vector.Type())):
+            return None
+        indices = slice_to_array(first_item, key if len(key) > 1 else key[0],
+                                 self._component_name_to_basis_component_length,
+                                 self._component_name_to_basis_component_index)
+        if len(key) == 1:
+            indices = (indices, )
+        assert len(indices) == len(key)
+        if not all(tuple(indices_i) == tuple(range(len(indices_i))) for indices_i in indices):
+            return None
+        return tuple(slice(0, len(indices_i)) for indices_i in indices)
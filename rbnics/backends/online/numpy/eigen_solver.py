@@ -35,12 +35,20 @@ class EigenSolver(AbstractEigenSolver):
 
     def solve(self, n_eigs=None):
         assert "problem_type" in self.parameters
+        assert "spectrum" in self.parameters
         if self.parameters["problem_type"] in ("hermitian", "gen_hermitian"):
-            eigs, eigv = eigh(self.A, self.B)
+            if n_eigs is not None and 0 < n_eigs < self.A.N:
+                # only compute the required eigenpairs
+                if self.parameters["spectrum"] == "largest real":
+                    subset_by_index = [self.A.N - n_eigs, self.A.N - 1]
+                else:
+                    subset_by_index = [0, n_eigs - 1]
+                eigs, eigv = eigh(self.A, self.B, subset_by_index=subset_by_index)
+            else:
+                eigs, eigv = eigh(self.A, self.B)
         else:
             eigs, eigv = eig(self.A, self.B)
 
-        assert "spectrum" in self.parameters
         if self.parameters["spectrum"] == "largest real":
             idx = eigs.argsort()  # sort by increasing value
             idx = idx[::-1]  # reverse the order
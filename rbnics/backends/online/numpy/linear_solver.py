@@ -4,7 +4,9 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
-from numpy.linalg import solve
+from numpy import abs as numpy_abs, allclose, eye, finfo, outer
+from numpy.linalg import cholesky, LinAlgError, solve
+from scipy.linalg import solve_triangular
 from rbnics.backends.abstract import LinearProblemWrapper
 from rbnics.backends.online.basic import LinearSolver as BasicLinearSolver
 from rbnics.backends.online.numpy.function import Function
@@ -31,3 +33,54 @@ class LinearSolver(LinearSolver_Base):
         self.solution.vector()[:] = solution
         if self.monitor is not None:
             self.monitor(self.solution)
+
+    def solve_nested(self, solutions):
+        """
+        Solve the linear systems obtained by restricting the left-hand and right-hand sides to their leading
+        blocks, one for each of the provided solutions, whose dimension determines the size of the block.
+        A single factorization of the whole left-hand side is required, since the Cholesky factors (for
+        symmetric positive definite matrices) and the LU factors without pivoting of a leading principal
+        block are the leading blocks of the factors of the whole matrix.
+
+        :param solutions: list of online functions, of dimension not larger than the one of the left-hand side.
+        """
+        lhs = self.lhs.content
+        rhs = self.rhs.content
+        (lower, upper, N_factorized) = _nested_factorization(lhs)
+        # Forward substitution is nested as well, so it is carried out only once
+        if N_factorized > 0:
+            forward = solve_triangular(lower, rhs[:N_factorized], lower=True, unit_diagonal=(upper is not None))
+        for solution in solutions:
+            N = solution.vector().content.shape[0]
+            assert N <= lhs.shape[0]
+            if N <= N_factorized:
+                if upper is None:  # Cholesky factorization
+                    solution.vector()[:] = solve_triangular(lower[:N, :N], forward[:N], trans="T", lower=True)
+                else:  # LU factorization
+                    solution.vector()[:] = solve_triangular(upper[:N, :N], forward[:N], lower=False)
+            else:
+                # the factorization broke down, due to a (numerically) singular leading principal block
+                solution.vector()[:] = solve(lhs[:N, :N], rhs[:N])
+
+
+def _nested_factorization(matrix):
+    """
+    Return a tuple (lower, upper, N), where lower and upper are the factors of the leading N x N block of
+    matrix, and N is the size of the largest leading block which could be factorized. upper is None when
+    lower is the Cholesky factor of a symmetric positive definite matrix.
+    """
+    if allclose(matrix, matrix.T):
+        try:
+            return (cholesky(matrix), None, matrix.shape[0])
+        except LinAlgError:
+            pass  # not positive definite: fall back to LU factorization
+    # LU factorization without pivoting, since row exchanges would spoil the nesting property
+    upper = matrix.copy()
+    lower = eye(matrix.shape[0])
+    tolerance = finfo(matrix.dtype).eps * matrix.shape[0] * numpy_abs(matrix).max()
+    for k in range(matrix.shape[0]):
+        if abs(upper[k, k]) <= tolerance:
+            return (lower[:k, :k], upper[:k, :k], k)
+        lower[k + 1:, k] = upper[k + 1:, k] / upper[k, k]
+        upper[k + 1:, k:] -= outer(lower[k + 1:, k], upper[k, k:])
+    return (lower, upper, matrix.shape[0])
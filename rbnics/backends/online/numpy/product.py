@@ -4,6 +4,7 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+from numpy import einsum, tensordot
 from rbnics.backends.online.basic import product as basic_product
 from rbnics.backends.online.numpy.affine_expansion_storage import AffineExpansionStorage
 from rbnics.backends.online.numpy.function import Function
@@ -22,4 +23,34 @@ wrapping = ModuleWrapper(DelayedTransposeWithArithmetic=DelayedTransposeWithArit
 # even though this one actually carries out both the sum and the product!
 @backend_for("numpy", inputs=(ThetaType, (AffineExpansionStorage, NonAffineExpansionStorage), ThetaType + (None,)))
 def product(thetas, operators, thetas2=None):
-    return product_base(thetas, operators, thetas2)
+    if isinstance(operators, AffineExpansionStorage) and operators.is_dense():
+        return ProductOutput(_dense_product(thetas, operators, thetas2))
+    else:
+        return product_base(thetas, operators, thetas2)
+
+
+def _dense_product(thetas, operators, thetas2):
+    # The affine expansion is stored as a single dense array, so that the linear combination of its
+    # terms can be computed by a single tensordot (order one) or einsum (order two) contraction,
+    # rather than by accumulating a temporary for each term
+    order = operators.order()
+    assert order in (1, 2)
+    operators_array = operators.to_array()
+    if order == 1:
+        assert thetas2 is None
+        assert len(thetas) == len(operators)
+        output_content = tensordot(thetas, operators_array, axes=1)
+    else:
+        assert thetas2 is not None
+        assert operators_array.shape[:2] == (len(thetas), len(thetas2))
+        output_content = einsum("i,ij...,j->...", thetas, operators_array, thetas2)
+    first_operator = operators[(0, ) * order]
+    if isinstance(first_operator, Matrix.Type()):
+        output = Matrix.Type()(first_operator.M, first_operator.N, output_content)
+    elif isinstance(first_operator, Vector.Type()):
+        output = Vector.Type()(first_operator.N, output_content)
+    else:
+        return float(output_content)
+    output._component_name_to_basis_component_index = first_operator._component_name_to_basis_component_index
+    output._component_name_to_basis_component_length = first_operator._component_name_to_basis_component_length
+    return output
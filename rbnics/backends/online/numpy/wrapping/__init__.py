@@ -15,10 +15,11 @@ from rbnics.backends.online.numpy.wrapping.functions_list_mul import (
 from rbnics.backends.online.numpy.wrapping.get_mpi_comm import get_mpi_comm
 from rbnics.backends.online.numpy.wrapping.gram_schmidt_projection_step import gram_schmidt_projection_step
 from rbnics.backends.online.numpy.wrapping.matrix_mul import (
-    matrix_mul_vector, vectorized_matrix_inner_vectorized_matrix)
+    matrix_mul_vector, matrix_transpose_mul_vector, vectorized_matrix_inner_vectorized_matrix,
+    vectors_mul_matrix_mul_vectors)
 from rbnics.backends.online.numpy.wrapping.tensor_load import tensor_load
 from rbnics.backends.online.numpy.wrapping.tensor_save import tensor_save
-from rbnics.backends.online.numpy.wrapping.vector_mul import vector_mul_vector
+from rbnics.backends.online.numpy.wrapping.vector_mul import vector_mul_vector, vectors_mul_vector
 
 __all__ = [
     "basis_functions_matrix_mul_online_matrix",
@@ -31,9 +32,12 @@ __all__ = [
     "get_mpi_comm",
     "gram_schmidt_projection_step",
     "matrix_mul_vector",
+    "matrix_transpose_mul_vector",
     "Slicer",
     "tensor_load",
     "tensor_save",
     "vector_mul_vector",
-    "vectorized_matrix_inner_vectorized_matrix"
+    "vectorized_matrix_inner_vectorized_matrix",
+    "vectors_mul_matrix_mul_vectors",
+    "vectors_mul_vector"
 ]
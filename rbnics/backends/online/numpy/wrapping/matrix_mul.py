@@ -4,10 +4,27 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+from numpy import array, asarray, zeros
+
 
 def matrix_mul_vector(matrix, vector):
     return matrix * vector
 
 
+def matrix_transpose_mul_vector(matrix, vector):
+    return asarray(matrix).T @ asarray(vector)
+
+
+def vectors_mul_matrix_mul_vectors(vectors, matrix, other_vectors):
+    if len(vectors) == 0 or len(other_vectors) == 0:
+        return zeros((len(vectors), len(other_vectors)))
+    block = array([asarray(vector) for vector in vectors])
+    if other_vectors is vectors:
+        other_block = block
+    else:
+        other_block = array([asarray(vector) for vector in other_vectors])
+    return block @ (asarray(matrix) @ other_block.T)
+
+
 def vectorized_matrix_inner_vectorized_matrix(matrix, other_matrix):
     return (matrix * other_matrix).sum()
@@ -4,8 +4,14 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
-from numpy import dot
+from numpy import array, asarray, dot, zeros
 
 
 def vector_mul_vector(vector1, vector2):
     return dot(vector1, vector2)
+
+
+def vectors_mul_vector(vectors, vector):
+    if len(vectors) == 0:
+        return zeros(0)
+    return array([asarray(vector_i) for vector_i in vectors]) @ asarray(vector)
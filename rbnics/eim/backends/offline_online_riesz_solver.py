@@ -5,7 +5,7 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 from numbers import Number
-from rbnics.backends import LinearSolver
+from rbnics.backends import copy, LinearSolver
 from rbnics.backends.basic.wrapping import DelayedLinearSolver, DelayedProduct
 from rbnics.eim.backends.offline_online_switch import OfflineOnlineSwitch
 from rbnics.utils.cache import cache
@@ -50,10 +50,13 @@ def OfflineOnlineRieszSolver(problem_name):
                 if not self.delay:
                     solver = LinearSolver(*args)
                     solver.set_parameters(problem._linear_solver_parameters)
+                    solver.set_factorization_cache(problem.truth_problem._factorization_cache)
                     solver.solve()
                     return problem._riesz_solve_storage
                 else:
                     solver = DelayedLinearSolver(*args)
+                    # The factorization cache is retrieved from the truth problem when solving, rather than
+                    # being passed as a parameter, since parameters of delayed solvers are saved to file
                     solver.set_parameters(problem._linear_solver_parameters)
                     return solver
 
@@ -67,4 +70,11 @@ def OfflineOnlineRieszSolver(problem_name):
                     rhs *= basis_function
                 return self.solve(rhs)
 
+            def solve_block(self, solve_args):
+                # Right-hand sides may be parametrized tensors, rather than assembled vectors: solve one at a time
+                if not self.delay:
+                    return [copy(self.solve(*args)) for args in solve_args]
+                else:
+                    return [self.solve(*args) for args in solve_args]
+
     return _OfflineOnlineRieszSolver
@@ -76,17 +76,21 @@ class EIMApproximationReductionMethod(ReductionMethod):
         # speedup analysis folder is required only in the speedup analysis
         at_least_one_required_folder_created = required_folders.create()
         at_least_one_optional_folder_created = optional_folders.create()  # noqa: F841
-        if not at_least_one_required_folder_created:
+        if not self._need_to_do_offline_stage(at_least_one_required_folder_created):
             return False  # offline construction should be skipped, since data are already available
         else:
             self.EIM_approximation.init("offline")
-            return True  # offline construction should be carried out
+            return True  # offline construction should be carried out (or resumed)
 
     @snapshot_links_to_cache
     def _offline(self):
         interpolation_method_name = self.EIM_approximation.parametrized_expression.interpolation_method_name()
         description = self.EIM_approximation.parametrized_expression.description()
 
+        # Mark offline stage as started, so that an interruption does not result in partial offline data
+        if self._offline_checkpoint is None:
+            self._save_offline_checkpoint(False)
+
         # Evaluate the parametrized expression for all parameters in the training set
         print(TextBox(interpolation_method_name + " preprocessing phase begins for" + "\n"
                       + "\n".join(description), fill="="))
@@ -121,10 +125,17 @@ class EIMApproximationReductionMethod(ReductionMethod):
         print("")
 
         if self.EIM_approximation.basis_generation == "Greedy":
-            # Initialize first parameter to be used
-            (error_max, relative_error_max) = self.greedy()
-            print("initial maximum interpolation error =", error_max)
-            print("initial maximum interpolation relative error =", relative_error_max)
+            if self._offline_checkpoint is None:
+                # Initialize first parameter to be used
+                (error_max, relative_error_max) = self.greedy()
+                print("initial maximum interpolation error =", error_max)
+                print("initial maximum interpolation relative error =", relative_error_max)
+            else:
+                # Resume from the last completed iteration
+                (error_max, relative_error_max) = self._resume_offline()
+                print("resumed maximum interpolation error =", error_max)
+                print("resumed maximum interpolation relative error =", relative_error_max)
+            self._save_offline_checkpoint(False, self._offline_checkpoint_state(error_max, relative_error_max))
 
             print("")
 
@@ -152,6 +163,8 @@ class EIMApproximationReductionMethod(ReductionMethod):
                 print("maximum interpolation error =", error_max)
                 print("maximum interpolation relative error =", relative_error_max)
 
+                self._save_offline_checkpoint(False, self._offline_checkpoint_state(error_max, relative_error_max))
+
                 print("")
         else:
             while self.EIM_approximation.N < N_POD:
@@ -174,10 +187,55 @@ class EIMApproximationReductionMethod(ReductionMethod):
 
                 print("")
 
+        self._save_offline_checkpoint(True)
+
         print(TextBox(interpolation_method_name + " offline phase ends for" + "\n"
                       + "\n".join(description), fill="="))
         print("")
 
+    def _offline_checkpoint_state(self, error_max, relative_error_max):
+        """
+        Internal method.
+
+        :param error_max: current maximum interpolation error.
+        :param relative_error_max: current maximum relative interpolation error.
+        :return: the data required to resume the greedy selection from the current iteration.
+        """
+        return {
+            "greedy_selected_parameters": list(self.greedy_selected_parameters),
+            "greedy_errors": list(self.greedy_errors),
+            "tol": self.tol,
+            "error_max": error_max,
+            "relative_error_max": relative_error_max
+        }
+
+    def _resume_offline(self):
+        """
+        Internal method. Rebuild basis functions, interpolation locations and interpolation matrix by replaying
+        the parameters selected by the interrupted greedy, without carrying out greedy searches over the
+        training set.
+
+        :return: the maximum interpolation error and relative error of the last completed iteration.
+        """
+        state = self._offline_checkpoint
+        greedy_selected_parameters = state["greedy_selected_parameters"]
+        for mu in greedy_selected_parameters[:-1]:
+            print("replay interpolation for mu =", mu)
+            self.EIM_approximation.set_mu(mu)
+            self.EIM_approximation.solve()
+            self.EIM_approximation.snapshot = self.load_snapshot()
+            (error, maximum_error, maximum_location) = self.EIM_approximation.compute_maximum_interpolation_error()
+            self.update_interpolation_locations(maximum_location)
+            self.update_basis_greedy(error, maximum_error)
+            self.update_interpolation_matrix()
+        self.greedy_selected_parameters.extend(greedy_selected_parameters)
+        self.greedy_selected_parameters.save(self.folder["post_processing"], "mu_greedy")
+        self.greedy_errors.extend(state["greedy_errors"])
+        self.greedy_errors.save(self.folder["post_processing"], "error_max")
+        self.tol = state["tol"]
+        self.EIM_approximation.set_mu(greedy_selected_parameters[-1])
+        return (state["error_max"], state["relative_error_max"])
+
     # Finalize data structures required after the offline phase
     def _finalize_offline(self):
         self.EIM_approximation.init("online")
@@ -4,7 +4,9 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
-from rbnics.backends import LinearProblemWrapper, LinearSolver
+from rbnics.backends import (LinearProblemWrapper, LinearSolver, NonlinearProblemWrapper,
+                             TimeDependentProblemWrapper)
+from rbnics.backends.online import OnlineFunction
 from rbnics.utils.decorators import PreserveClassName, RequiredBaseDecorators
 
 
@@ -29,5 +31,21 @@ def LinearReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
                 solver.set_parameters(problem._linear_solver_parameters)
                 solver.solve()
 
+        # Perform online solves for several nested dimensions from a single factorization (internal)
+        def _solve_nested(self, Ns, **kwargs):
+            # Leading blocks of the reduced system are the reduced systems of smaller dimension only in the case
+            # of a linear stationary problem with one component
+            if (issubclass(self.ProblemSolver, (NonlinearProblemWrapper, TimeDependentProblemWrapper))
+                    or len(self.components) > 1):
+                return ParametrizedReducedDifferentialProblem_DerivedClass._solve_nested(self, Ns, **kwargs)
+            solutions = [OnlineFunction(N) for N in Ns]
+            problem_solver = self.ProblemSolver(self, Ns[-1], **kwargs)
+            solver = LinearSolver(problem_solver, solutions[-1])
+            if not hasattr(solver, "solve_nested"):
+                return ParametrizedReducedDifferentialProblem_DerivedClass._solve_nested(self, Ns, **kwargs)
+            solver.set_parameters(self._linear_solver_parameters)
+            solver.solve_nested(solutions)
+            return solutions
+
     # return value (a class) for the decorator
     return LinearReducedProblem_Class
@@ -5,12 +5,14 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 from abc import ABCMeta, abstractmethod
+import inspect
 import os
 import hashlib
 from numbers import Number
+from numpy import array, zeros
 from rbnics.problems.base.parametrized_problem import ParametrizedProblem
 from rbnics.backends import AffineExpansionStorage, assign, copy, export, Function, import_, product, sum
-from rbnics.utils.cache import Cache
+from rbnics.utils.cache import Cache, FactorizationCache
 from rbnics.utils.decorators import (StoreMapFromProblemNameToProblem, StoreMapFromProblemToTrainingStatus,
                                      StoreMapFromSolutionToProblem)
 from rbnics.utils.test import PatchInstanceMethod
@@ -60,6 +62,9 @@ class ParametrizedDifferentialProblem(ParametrizedProblem, metaclass=ABCMeta):
         # with several components)
         self.dirichlet_bc_are_homogeneous = None
         self._combined_and_homogenized_dirichlet_bc = None
+        # Factorizations of truth matrices (e.g. inner products), shared by linear solvers
+        # which repeatedly solve with the same left-hand side
+        self._factorization_cache = FactorizationCache()
         # Solution
         self._solution = Function(self.V)
         self._output = 0.
@@ -494,6 +499,58 @@ class ParametrizedDifferentialProblem(ParametrizedProblem, metaclass=ABCMeta):
         """
         raise NotImplementedError("The method compute_theta() is problem-specific and needs to be overridden.")
 
+    def compute_theta_batch(self, term, mus):
+        """
+        Return theta multiplicative terms of the affine expansion of the problem for several parameters at once.
+        Overriding this method is optional, and it is worthwhile when thetas have a closed-form expression.
+        Terms which are not handled should return NotImplemented, in which case compute_theta will be
+        called for each parameter instead. compute_theta is always called also when it is replaced at runtime
+        (e.g. by EIM) or when thetas are modified by the pull back of forms to the reference domain.
+        Example of implementation for Poisson problem:
+           if term == "a":
+               theta_a0 = mus[:, 0]
+               theta_a1 = mus[:, 1]
+               theta_a2 = mus[:, 0] * mus[:, 1] + mus[:, 2] / 7.0
+               return numpy.column_stack((theta_a0, theta_a1, theta_a2))
+           elif term == "f":
+               theta_f0 = mus[:, 0] * mus[:, 2]
+               return numpy.column_stack((theta_f0,))
+           else:
+               return NotImplemented
+
+        :param term: the forms of the class of the problem.
+        :param mus: parameters, stacked in a (n x P) array.
+        :return: computed thetas, stacked in a (n x Q) array, or NotImplemented.
+        """
+        return NotImplemented
+
+    def _compute_theta_batch(self, term, mus):
+        """
+        Return theta multiplicative terms of the affine expansion of the problem for several parameters, using
+        compute_theta_batch if available, or looping over the parameters otherwise. Internal method.
+
+        :param term: the forms of the class of the problem.
+        :param mus: list of parameters.
+        :return: computed thetas, stacked in a (len(mus) x Q) array.
+        """
+        if len(mus) == 0:
+            return zeros((0, self.Q.get(term, 0)))
+        # The vectorized implementation cannot be employed if compute_theta has been replaced at runtime,
+        # e.g. by EIM or by exact parametrized functions decorators
+        if inspect.ismethod(self.compute_theta) and self.compute_theta.__func__ is type(self).compute_theta:
+            thetas = self.compute_theta_batch(term, array([tuple(mu) for mu in mus], dtype=float))
+        else:
+            thetas = NotImplemented
+        if thetas is NotImplemented:
+            mu = self.mu
+            thetas = list()
+            for mu_i in mus:
+                self.set_mu(mu_i)
+                thetas.append(self.compute_theta(term))
+            self.set_mu(mu)
+        thetas = array(thetas, dtype=float).reshape(len(mus), -1)
+        return thetas
+
     @abstractmethod
     def assemble_operator(self, term):
         """
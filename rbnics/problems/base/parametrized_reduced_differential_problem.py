@@ -7,10 +7,11 @@
 from abc import ABCMeta, abstractmethod
 import os
 from math import sqrt
-from numpy import isclose
+from numpy import array, asarray, isclose
 from rbnics.problems.base.parametrized_problem import ParametrizedProblem
 from rbnics.backends import assign, BasisFunctionsMatrix, copy, product, sum, transpose
-from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineFunction, OnlineLinearSolver
+from rbnics.backends.online import (OnlineAffineExpansionStorage, OnlineFunction, OnlineLinearSolver, OnlineMatrix,
+                                    OnlineVector)
 from rbnics.utils.cache import Cache
 from rbnics.utils.decorators import StoreMapFromProblemToReducedProblem, sync_setters
 from rbnics.utils.io import OnlineSizeDict
@@ -94,6 +95,10 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         self.truth_problem = truth_problem
         # Basis functions matrix: BasisFunctionsMatrix
         self.basis_functions = None
+        # Reduced operators, stored so that they can be updated incrementally when the basis is enriched:
+        # from string (term name, possibly followed by q) to a tuple containing the truth operator,
+        # the basis functions for each component and the resulting reduced operator
+        self._incrementally_projected_operators = dict()
         # I/O
         self.folder["basis"] = os.path.join(self.folder_prefix, "basis")
         self.folder["reduced_operators"] = os.path.join(self.folder_prefix, "reduced_operators")
@@ -376,6 +381,79 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         problem_solver = self.ProblemSolver(self, N, **kwargs)
         problem_solver.solve()
 
+    def solve_nested(self, N=None, **kwargs):
+        """
+        Perform an online solve for several dimensions of the reduced problem, at the current parameter.
+        Solutions are stored in the cache, so that subsequent calls to solve(n) will not require any further solve.
+        self.N will be used as largest dimension if the default value is provided for N.
+
+        :param N : Largest dimension of the reduced problem, in which case all dimensions n = 1, ..., N are solved
+            for, or list of dimensions
+        :type N : integer or list of integers
+        :return: list of reduced solutions, one for each dimension
+        """
+        Ns = self._nested_dimensions(N)
+        solutions = self._solve_nested_and_cache(Ns, **kwargs)
+        if solutions is NotImplemented:
+            solutions = [self.solve(n, **kwargs) for n in Ns]
+        return solutions
+
+    def _nested_dimensions(self, N):
+        """
+        Return the list of dimensions requested to solve_nested. Internal method.
+        """
+        if N is None:
+            N = self.N
+        if isinstance(N, dict):
+            N = min(N.values())
+        if isinstance(N, int):
+            return list(range(1, N + 1))
+        else:
+            Ns = list(N)
+            assert all(isinstance(n, int) for n in Ns)
+            return Ns
+
+    def _solve_nested_and_cache(self, N, **kwargs):
+        """
+        Perform online solves for several dimensions through _solve_nested, storing the solutions in the cache.
+        Internal method.
+
+        :param N : Largest dimension of the reduced problem or list of dimensions, as in solve_nested.
+        :return: list of reduced solutions, one for each dimension, or NotImplemented if nested solves are
+            not available.
+        """
+        Ns = self._nested_dimensions(N)
+        if len(Ns) == 0:  # trivial case
+            return list()
+        # Dimensions are passed to _solve_nested in increasing order and without repetitions
+        sorted_Ns = sorted(set(Ns))
+        online_sizes = list()
+        for n in sorted_Ns:
+            online_size, online_kwargs = self._online_size_from_kwargs(n, **kwargs)
+            online_size += self.N_bc
+            online_sizes.append(online_size)
+        sorted_solutions = self._solve_nested(online_sizes, **online_kwargs)
+        if sorted_solutions is NotImplemented:
+            return NotImplemented
+        assert len(sorted_solutions) == len(online_sizes)
+        for (online_size, solution) in zip(online_sizes, sorted_solutions):
+            self._solution_cache[self.mu, online_size, online_kwargs] = copy(solution)
+        self._latest_solve_kwargs = online_kwargs
+        solutions = [sorted_solutions[sorted_Ns.index(n)] for n in Ns]
+        self._solution = solutions[-1]
+        return solutions
+
+    def _solve_nested(self, Ns, **kwargs):
+        """
+        Perform online solves for several nested dimensions at the current parameter (internal), provided in
+        increasing order. Problems which are able to obtain all of them from a single factorization of the largest
+        reduced system should override it.
+
+        :return: list of reduced solutions, one for each dimension in Ns, or NotImplemented if nested solves are
+            not available, in which case solve_nested calls solve for each dimension.
+        """
+        return NotImplemented
+
     def project(self, snapshot, N=None, on_dirichlet_bc=True, **kwargs):
         N, kwargs = self._online_size_from_kwargs(N, **kwargs)
         N += self.N_bc
@@ -426,6 +504,74 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         """
         self._output = NotImplemented
 
+    def solve_batch(self, mus, N=None, **kwargs):
+        """
+        Perform an online solve for each parameter in mus. The current parameter is not changed.
+        self.N will be used as matrix dimension if the default value is provided for N.
+
+        :param mus: list of parameters.
+        :param N : Dimension of the reduced problem
+        :type N : integer
+        :return: reduced solutions, stacked in a (len(mus) x N) array
+        """
+        online_size, online_kwargs = self._online_size_from_kwargs(N, **kwargs)
+        online_size += self.N_bc
+        solutions = self._solve_batch(online_size, mus, **online_kwargs)
+        if solutions is NotImplemented:
+            mu = self.mu
+            solutions = list()
+            for mu_i in mus:
+                self.set_mu(mu_i)
+                solutions.append(asarray(self.solve(N, **kwargs).vector()))
+            self.set_mu(mu)
+            solutions = array(solutions, dtype=float).reshape(len(mus), -1)
+        return solutions
+
+    def _solve_batch(self, N, mus, **kwargs):
+        """
+        Perform a vectorized online solve for several parameters (internal). Problems which are able to
+        assemble and solve a stack of reduced systems should override it.
+
+        :return: reduced solutions, stacked in a (len(mus) x N) array, or NotImplemented if a vectorized
+            solve is not available, in which case solve_batch loops over the parameters.
+        """
+        return NotImplemented
+
+    def compute_output_batch(self, mus, N=None, **kwargs):
+        """
+        Perform an online solve and an online evaluation of the output for each parameter in mus.
+        The current parameter is not changed.
+
+        :param mus: list of parameters.
+        :param N : Dimension of the reduced problem
+        :type N : integer
+        :return: reduced outputs, stacked in an array (or NotImplemented if the problem has no output)
+        """
+        online_size, online_kwargs = self._online_size_from_kwargs(N, **kwargs)
+        online_size += self.N_bc
+        outputs = self._compute_output_batch(online_size, mus, **online_kwargs)
+        if outputs is NotImplemented:
+            mu = self.mu
+            outputs = list()
+            for mu_i in mus:
+                self.set_mu(mu_i)
+                self.solve(N, **kwargs)
+                outputs.append(self.compute_output())
+            self.set_mu(mu)
+            if any(output is NotImplemented for output in outputs):
+                return NotImplemented
+            outputs = array(outputs, dtype=float)
+        return outputs
+
+    def _compute_output_batch(self, N, mus, **kwargs):
+        """
+        Perform a vectorized online solve and online evaluation of the output for several parameters (internal).
+
+        :return: reduced outputs, stacked in an array, or NotImplemented if a vectorized evaluation
+            is not available, in which case compute_output_batch loops over the parameters.
+        """
+        return NotImplemented
+
     def _online_size_from_kwargs(self, N, **kwargs):
         return OnlineSizeDict.generate_from_N_and_kwargs(self.components, self.N, N, **kwargs)
 
@@ -695,6 +841,174 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         """
         return self.truth_problem.compute_theta(term)
 
+    def _compute_theta_batch(self, term, mus):
+        """
+        Return theta multiplicative terms of the affine expansion of the problem for several parameters.
+
+        :param term: the forms of the class of the problem.
+        :param mus: list of parameters.
+        :return: computed thetas, stacked in a (len(mus) x Q) array.
+        """
+        return self.truth_problem._compute_theta_batch(term, mus)
+
+    def _apply_dirichlet_bcs_batch(self, N, mus, lhs, rhs):
+        """
+        Apply (in-place) non homogeneous Dirichlet boundary conditions to a stack of reduced systems,
+        one for each parameter in mus. Internal method.
+        """
+        # Get helper strings and functions depending on the number of basis components
+        if len(self.components) > 1:
+            dirichlet_bc_string = "dirichlet_bc_{c}"
+
+            def has_non_homogeneous_dirichlet_bc(component):
+                return self.dirichlet_bc[component] and not self.dirichlet_bc_are_homogeneous[component]
+        else:
+            dirichlet_bc_string = "dirichlet_bc"
+
+            def has_non_homogeneous_dirichlet_bc(component):
+                return self.dirichlet_bc and not self.dirichlet_bc_are_homogeneous
+
+        # Lifting basis functions are stored first in each component block
+        block_index = 0
+        for component in self.components:
+            if has_non_homogeneous_dirichlet_bc(component):
+                theta_bc = self._compute_theta_batch(dirichlet_bc_string.format(c=component), mus)
+                for i in range(theta_bc.shape[1]):
+                    lhs[:, block_index + i, :] = 0.
+                    lhs[:, block_index + i, block_index + i] = 1.
+                    rhs[:, block_index + i] = theta_bc[:, i]
+            block_index += N[component]
+
+    @staticmethod
+    def _affine_expansion_storage_to_array(storage, *Q):
+        """
+        Return the content of an online affine expansion storage of shape Q as a dense array. Internal method.
+        """
+        assert len(Q) in (1, 2)
+        if hasattr(storage, "to_array") and storage.is_dense():
+            output = storage.to_array()
+            assert output.shape[:len(Q)] == Q
+            return output
+        elif len(Q) == 1:
+            return array([asarray(storage[q]) for q in range(Q[0])], dtype=float)
+        else:
+            return array([[asarray(storage[q0, q1]) for q1 in range(Q[1])] for q0 in range(Q[0])], dtype=float)
+
+    def _project_truth_operator_incrementally(self, key, truth_operator, order):
+        """
+        Project a truth operator onto the reduced basis. The previous reduced operator and basis functions are
+        stored, so that, if the basis has only been enriched since the previous call with the same key,
+        only entries associated to the newly added basis functions are computed. Internal method.
+
+        :param key: name under which the previous reduced operator is stored.
+        :param truth_operator: the truth matrix (order 2) or vector (order 1) to be projected.
+        :param order: order of the truth operator.
+        :return: the reduced operator.
+        """
+        assert order in (1, 2)
+        basis_functions = self._functions_by_component(self.basis_functions)
+        # Get the number of basis functions which were already available in the previous call, provided that
+        # the truth operator has not changed since then
+        N_previous = self._number_of_unchanged_functions(basis_functions, None)
+        previous_reduced_operator = None
+        if key in self._incrementally_projected_operators:
+            (previous_truth_operator, previous_basis_functions, previous_reduced_operator) = (
+                self._incrementally_projected_operators[key])
+            if previous_truth_operator is truth_operator:
+                N_previous = self._number_of_unchanged_functions(basis_functions, previous_basis_functions)
+        # Assemble the reduced operator, re-using the previous one for entries related to old basis functions
+        if order == 2:
+            reduced_operator = self._transpose_times_operator_times_incrementally(
+                self.basis_functions, N_previous, truth_operator, self.basis_functions, N_previous,
+                previous_reduced_operator)
+        else:
+            reduced_operator = OnlineVector(self._number_of_functions(basis_functions))
+            if any(N_previous[component] > 0 for component in self.components):
+                reduced_operator[:N_previous] = previous_reduced_operator
+            for (i, function_i) in self._new_functions(basis_functions, N_previous):
+                reduced_operator[i] = transpose(function_i) * truth_operator
+        self._incrementally_projected_operators[key] = (truth_operator, basis_functions, reduced_operator)
+        return reduced_operator
+
+    def _functions_by_component(self, functions):
+        """
+        Return a dict from each component to the list of its functions in a basis functions matrix. Internal method.
+        """
+        functions_by_component = dict()
+        if len(self.components) > 1:
+            for component in self.components:
+                functions_by_component[component] = list(functions[component])
+        else:
+            functions_by_component[self.components[0]] = list(functions)
+        return functions_by_component
+
+    def _number_of_functions(self, functions_by_component):
+        """
+        Return the number of functions for each component. Internal method.
+        """
+        N = OnlineSizeDict()
+        for component in self.components:
+            N[component] = len(functions_by_component[component])
+        return N
+
+    def _number_of_unchanged_functions(self, functions_by_component, previous_functions_by_component):
+        """
+        Return the number of functions of each component which were already available in a previous call.
+        This requires that functions have only been appended since then, otherwise all functions are
+        considered to be new. Internal method.
+        """
+        N_previous = OnlineSizeDict()
+        for component in self.components:
+            N_previous[component] = 0
+        if previous_functions_by_component is not None and all(
+                len(previous_functions_by_component[component]) <= len(functions_by_component[component])
+                and all(previous_function is function for (previous_function, function) in zip(
+                    previous_functions_by_component[component], functions_by_component[component]))
+                for component in self.components):
+            for component in self.components:
+                N_previous[component] = len(previous_functions_by_component[component])
+        return N_previous
+
+    def _new_functions(self, functions_by_component, N_previous):
+        """
+        Return a list of pairs (global index, function) of the functions which were not available
+        in a previous call. Internal method.
+        """
+        new_functions = list()
+        i = 0
+        for component in self.components:
+            for (n, function) in enumerate(functions_by_component[component]):
+                if n >= N_previous[component]:
+                    new_functions.append((i, function))
+                i += 1
+        return new_functions
+
+    def _transpose_times_operator_times_incrementally(self, left_functions, left_N_previous, operator,
+                                                      right_functions, right_N_previous, previous_output,
+                                                      symmetric=False):
+        """
+        Compute transpose(left_functions) * operator * right_functions, re-using the previous output for entries
+        related to functions which were already available in a previous call. Each new function requires
+        a single matrix-vector product with the truth operator (or with its transpose, unless the operator is
+        symmetric), and no product with old functions is stored. Internal method.
+        """
+        left_functions_by_component = self._functions_by_component(left_functions)
+        right_functions_by_component = self._functions_by_component(right_functions)
+        if (all(left_N_previous[component] == 0 for component in self.components)
+                or all(right_N_previous[component] == 0 for component in self.components)):
+            return transpose(left_functions) * operator * right_functions
+        output = OnlineMatrix(self._number_of_functions(left_functions_by_component),
+                              self._number_of_functions(right_functions_by_component))
+        output[:left_N_previous, :right_N_previous] = previous_output
+        for (j, function_j) in self._new_functions(right_functions_by_component, right_N_previous):
+            output[:, j] = transpose(left_functions) * operator * function_j
+        for (i, function_i) in self._new_functions(left_functions_by_component, left_N_previous):
+            if symmetric:
+                output[i, :] = transpose(right_functions) * operator * function_i
+            else:
+                output[i, :] = transpose(function_i) * operator * right_functions
+        return output
+
     # Assemble the reduced order affine expansion
     def assemble_operator(self, term, current_stage="online"):
         """
@@ -749,12 +1063,20 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                 for q in range(self.Q[term]):
                     assert self.terms_order[term] in (0, 1, 2)
                     if self.terms_order[term] == 2:
-                        self.operator[term][q] = (
-                            transpose(self.basis_functions) * self.truth_problem.operator[term][q]
-                            * self.basis_functions)
+                        if isinstance(self.operator[term], OnlineAffineExpansionStorage):
+                            self.operator[term][q] = self._project_truth_operator_incrementally(
+                                term + "_" + str(q), self.truth_problem.operator[term][q], 2)
+                        else:
+                            self.operator[term][q] = (
+                                transpose(self.basis_functions) * self.truth_problem.operator[term][q]
+                                * self.basis_functions)
                     elif self.terms_order[term] == 1:
-                        self.operator[term][q] = (
-                            transpose(self.basis_functions) * self.truth_problem.operator[term][q])
+                        if isinstance(self.operator[term], OnlineAffineExpansionStorage):
+                            self.operator[term][q] = self._project_truth_operator_incrementally(
+                                term + "_" + str(q), self.truth_problem.operator[term][q], 1)
+                        else:
+                            self.operator[term][q] = (
+                                transpose(self.basis_functions) * self.truth_problem.operator[term][q])
                     elif self.terms_order[term] == 0:
                         self.operator[term][q] = self.truth_problem.operator[term][q]
                     else:
@@ -769,9 +1091,8 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                     # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.inner_product[component]) == 1
                     # the affine expansion storage contains only the inner product matrix
-                    self.inner_product[component][0] = (
-                        transpose(self.basis_functions) * self.truth_problem.inner_product[component][0]
-                        * self.basis_functions)
+                    self.inner_product[component][0] = self._project_truth_operator_incrementally(
+                        term, self.truth_problem.inner_product[component][0], 2)
                     self.inner_product[component].save(self.folder["reduced_operators"], term)
                     return self.inner_product[component]
                 else:
@@ -780,8 +1101,8 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                     # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.inner_product) == 1
                     # the affine expansion storage contains only the inner product matrix
-                    self.inner_product[0] = (
-                        transpose(self.basis_functions) * self.truth_problem.inner_product[0] * self.basis_functions)
+                    self.inner_product[0] = self._project_truth_operator_incrementally(
+                        term, self.truth_problem.inner_product[0], 2)
                     self.inner_product.save(self.folder["reduced_operators"], term)
                     return self.inner_product
             elif term.startswith("projection_inner_product"):
@@ -792,9 +1113,8 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                     # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.projection_inner_product[component]) == 1
                     # the affine expansion storage contains only the inner product matrix
-                    self.projection_inner_product[component][0] = (
-                        transpose(self.basis_functions) * self.truth_problem.projection_inner_product[component][0]
-                        * self.basis_functions)
+                    self.projection_inner_product[component][0] = self._project_truth_operator_incrementally(
+                        term, self.truth_problem.projection_inner_product[component][0], 2)
                     self.projection_inner_product[component].save(self.folder["reduced_operators"], term)
                     return self.projection_inner_product[component]
                 else:
@@ -803,9 +1123,8 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                     # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.projection_inner_product) == 1
                     # the affine expansion storage contains only the inner product matrix
-                    self.projection_inner_product[0] = (
-                        transpose(self.basis_functions) * self.truth_problem.projection_inner_product[0]
-                        * self.basis_functions)
+                    self.projection_inner_product[0] = self._project_truth_operator_incrementally(
+                        term, self.truth_problem.projection_inner_product[0], 2)
                     self.projection_inner_product.save(self.folder["reduced_operators"], term)
                     return self.projection_inner_product
             elif term.startswith("dirichlet_bc"):
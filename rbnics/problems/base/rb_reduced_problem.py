@@ -7,7 +7,9 @@
 import os
 from abc import ABCMeta, abstractmethod
 from numbers import Number
-from rbnics.backends import BasisFunctionsMatrix, Function, FunctionsList, LinearSolver, transpose
+from numpy import zeros
+from rbnics.backends import (BasisFunctionsMatrix, copy, Function, FunctionsList, import_, LinearSolver,
+                             transpose)
 from rbnics.backends.online import OnlineAffineExpansionStorage
 from rbnics.utils.decorators import overload, PreserveClassName, RequiredBaseDecorators
 
@@ -29,6 +31,8 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             ParametrizedReducedDifferentialProblem_DerivedClass.__init__(self, truth_problem, **kwargs)
 
             # $$ ONLINE DATA STRUCTURES $$ #
+            # Dimension selected by the latest call to solve with a tolerance on the error estimator
+            self.N_tol = None
             # Residual terms
             self.RieszExpansionStorage = OnlineAffineExpansionStorage
             self.riesz = dict()  # from string to RieszExpansionStorage
@@ -40,9 +44,14 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             # $$ OFFLINE DATA STRUCTURES $$ #
             # Residual terms
             self._riesz_solve_storage = Function(self.truth_problem.V)
+            self._riesz_solve_block_storage = list()  # of Function, grown as needed by RieszSolver.solve_block()
             self._riesz_solve_inner_product = None  # setup by init()
             self._riesz_solve_homogeneous_dirichlet_bc = None  # setup by init()
             self._error_estimation_inner_product = None  # setup by init()
+            # Riesz representors employed in the assembly of each error estimation operator, and the resulting
+            # operator, stored so that error estimation operators can be updated incrementally when the Riesz
+            # representation is enriched
+            self._error_estimation_operator_riesz = dict()  # from (term, q0, q1)
             # I/O
             self.folder["error_estimation"] = os.path.join(self.folder_prefix, "error_estimation")
 
@@ -139,6 +148,106 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             """
             return NotImplemented
 
+        def solve(self, N=None, tol=None, relative=False, **kwargs):
+            """
+            Perform an online solve. self.N will be used as matrix dimension if the default value is provided for N.
+            If a tolerance is provided, the smallest dimension (not larger than N) for which the error estimator
+            is below the tolerance is selected instead, and stored in self.N_tol.
+
+            :param N : Dimension (or largest dimension, if tol is provided) of the reduced problem
+            :type N : integer
+            :param tol: tolerance on the error estimator.
+            :param relative: if True, compare the relative error estimator, rather than the error estimator,
+                to the tolerance.
+            :return: reduced solution, or a tuple containing the reduced solution and the selected dimension
+                if tol is provided.
+            """
+            if tol is None:
+                assert relative is False
+                return ParametrizedReducedDifferentialProblem_DerivedClass.solve(self, N, **kwargs)
+            else:
+                return self._solve_with_tolerance(N, tol, relative, **kwargs)
+
+        def _solve_with_tolerance(self, N, tol, relative, **kwargs):
+            """
+            Select the smallest dimension for which the error estimator is below tol, doubling the dimension
+            until the tolerance is met and then bisecting. When available, reduced systems of all dimensions are
+            solved from a single factorization in advance. Internal method.
+            """
+            if N is None:
+                N = self.N
+            if isinstance(N, dict):
+                N = min(N.values())
+            assert isinstance(N, int)
+            # Solve for all dimensions from a single factorization, if possible, storing the solutions in the cache
+            self._solve_nested_and_cache(N, **kwargs)
+
+            error_estimators = dict()
+
+            def error_estimator(n):
+                if n not in error_estimators:
+                    self.solve(n, **kwargs)
+                    if relative:
+                        error_estimator_n = self.estimate_relative_error()
+                    else:
+                        error_estimator_n = self.estimate_error()
+                    if error_estimator_n is NotImplemented:
+                        raise ValueError("The requested error estimator is not available for this problem.")
+                    if not isinstance(error_estimator_n, Number):  # e.g. time dependent problems
+                        error_estimator_n = max(error_estimator_n)
+                    error_estimators[n] = error_estimator_n
+                return error_estimators[n]
+
+            # Double the dimension until the tolerance is met ...
+            (N_below, N_above) = (0, min(1, N))
+            while N_above < N and error_estimator(N_above) > tol:
+                (N_below, N_above) = (N_above, min(2 * N_above, N))
+            # ... and then bisect
+            if error_estimator(N_above) > tol:
+                print("Error estimator " + str(error_estimators[N_above]) + " is larger than the tolerance "
+                      + str(tol) + " also for the largest dimension " + str(N))
+            else:
+                while N_above - N_below > 1:
+                    N_middle = (N_below + N_above) // 2
+                    if error_estimator(N_middle) > tol:
+                        N_below = N_middle
+                    else:
+                        N_above = N_middle
+            # Make sure that the current solution is the one associated to the selected dimension
+            solution = self.solve(N_above, **kwargs)
+            self.N_tol = N_above
+            return (solution, N_above)
+
+        def estimate_error_batch(self, mus, N=None, **kwargs):
+            """
+            It solves the reduced problem and returns an error bound for each parameter in mus.
+            The current parameter is not changed.
+
+            :param mus: list of parameters.
+            :param N: dimension of the reduced problem.
+            :return: error bounds, stacked in an array.
+            """
+            online_size, online_kwargs = self._online_size_from_kwargs(N, **kwargs)
+            online_size += self.N_bc
+            error_estimators = self._solve_and_estimate_error_batch(online_size, mus, **online_kwargs)
+            if error_estimators is NotImplemented:
+                mu = self.mu
+                error_estimators = zeros(len(mus))
+                for (i, mu_i) in enumerate(mus):
+                    self.set_mu(mu_i)
+                    self.solve(N, **kwargs)
+                    error_estimators[i] = self.estimate_error()
+                self.set_mu(mu)
+            return error_estimators
+
+        def _solve_and_estimate_error_batch(self, N, mus, **kwargs):
+            """
+            It solves the reduced problem and returns an error bound for each parameter in mus in a vectorized
+            fashion, or NotImplemented if not available, in which case estimate_error_batch loops over mus.
+            Internal method.
+            """
+            return NotImplemented
+
         def build_error_estimation_operators(self, current_stage="offline"):
             self._build_error_estimation_operators(current_stage)
 
@@ -176,30 +285,66 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             :param term: the forms of the truth problem.
             """
             solver = self.RieszSolver(self)
-            # Compute the Riesz representor
+            # Gather the Riesz representors to be computed, and the storage they will be appended to, so that
+            # all Riesz problems (which share the same left-hand side) are solved at once as a block
             assert self.terms_order[term] in (1, 2)
+            storages = list()
+            solve_args = list()
             if self.terms_order[term] == 1:
                 for q in range(self.Q[term]):
-                    self.riesz[term][q].enrich(
-                        solver.solve(self.truth_problem.operator[term][q])
-                    )
-                self.riesz[term].save(self.folder["error_estimation"], "riesz_" + term)
+                    storages.append(self.riesz[term][q])
+                    solve_args.append((self.truth_problem.operator[term][q], ))
             elif self.terms_order[term] == 2:
                 for q in range(self.Q[term]):
                     if len(self.components) > 1:
                         for component in self.components:
                             for n in range(len(self.riesz[term][q][component]),
                                            self.N[component] + self.N_bc[component]):
-                                self.riesz[term][q][component].enrich(
-                                    solver.solve(-1., self.truth_problem.operator[term][q],
-                                                 self.basis_functions[component][n]))
+                                storages.append(self.riesz[term][q][component])
+                                solve_args.append(
+                                    (-1., self.truth_problem.operator[term][q], self.basis_functions[component][n]))
                     else:
                         for n in range(len(self.riesz[term][q]), self.N + self.N_bc):
-                            self.riesz[term][q].enrich(
-                                solver.solve(-1., self.truth_problem.operator[term][q], self.basis_functions[n]))
-                self.riesz[term].save(self.folder["error_estimation"], "riesz_" + term)
+                            storages.append(self.riesz[term][q])
+                            solve_args.append((-1., self.truth_problem.operator[term][q], self.basis_functions[n]))
             else:
                 raise ValueError("Invalid value for order of term " + term)
+            # Compute the Riesz representors
+            for (storage, riesz) in zip(storages, solver.solve_block(solve_args)):
+                storage.enrich(riesz)
+            self.riesz[term].save(self.folder["error_estimation"], "riesz_" + term)
+
+        def restore_riesz_representation(self, term):
+            """
+            It loads the Riesz representation of term associated to the current basis functions from the files
+            saved by compute_riesz_representation, rather than solving again the Riesz problems. Riesz representors
+            already available are kept, and further representors stored on file (e.g. by an interrupted iteration)
+            are discarded.
+
+            :param term: the forms of the truth problem.
+            """
+            assert self.terms_order[term] in (1, 2)
+            directory = os.path.join(str(self.folder["error_estimation"]), "riesz_" + term)
+
+            def load(storage, filename, N):
+                for index in range(len(storage), N):
+                    riesz = Function(self.truth_problem.V)
+                    import_(riesz, directory, filename + "_" + str(index))
+                    storage.enrich(riesz)
+
+            for q in range(self.Q[term]):
+                if self.terms_order[term] == 1:
+                    load(self.riesz[term][q], "content_item_" + str(q), 1)
+                elif len(self.components) > 1:
+                    for component in self.components:
+                        load(self.riesz[term][q][component], "content_item_" + str(q) + "_" + component,
+                             self.N[component] + self.N_bc[component])
+                else:
+                    load(self.riesz[term][q], "content_item_" + str(q), self.N + self.N_bc)
+            # The (term, term) Riesz representors product does not depend on N, and it is assembled only
+            # when the Riesz representation is computed, so it needs to be assembled here as well
+            if self.terms_order[term] == 1 and (term, term) in self.error_estimation_terms:
+                self.assemble_error_estimation_operators((term, term), "offline")
 
         class RieszSolver(object):
             def __init__(self, problem):
@@ -211,6 +356,7 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
                 solver = LinearSolver(problem._riesz_solve_inner_product, problem._riesz_solve_storage, rhs,
                                       problem._riesz_solve_homogeneous_dirichlet_bc)
                 solver.set_parameters(problem._linear_solver_parameters)
+                solver.set_factorization_cache(problem.truth_problem._factorization_cache)
                 solver.solve()
                 return problem._riesz_solve_storage
 
@@ -218,6 +364,34 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             def solve(self, coef: Number, matrix: object, basis_function: object):
                 return self.solve(coef * matrix * basis_function)
 
+            def solve_block(self, solve_args):
+                """
+                Solve several Riesz problems at once, reusing the same factorization of the inner product matrix.
+
+                :param solve_args: a list of tuples, each one containing the arguments of a call to solve().
+                :return: a list of Riesz representors, which will be overwritten by the next call to solve_block().
+                """
+                problem = self.problem
+                storage = problem._riesz_solve_block_storage
+                while len(storage) < len(solve_args):
+                    storage.append(copy(problem._riesz_solve_storage))
+                solutions = storage[:len(solve_args)]
+                rhs = [self._rhs(*args) for args in solve_args]
+                solver = LinearSolver(problem._riesz_solve_inner_product, solutions, rhs,
+                                      problem._riesz_solve_homogeneous_dirichlet_bc)
+                solver.set_parameters(problem._linear_solver_parameters)
+                solver.set_factorization_cache(problem.truth_problem._factorization_cache)
+                solver.solve()
+                return solutions
+
+            @overload
+            def _rhs(self, rhs: object):
+                return rhs
+
+            @overload
+            def _rhs(self, coef: Number, matrix: object, basis_function: object):
+                return coef * (matrix * basis_function)  # avoid scaling (and thus copying) the matrix
+
         def assemble_error_estimation_operators(self, term, current_stage="online"):
             """
             It assembles operators for error estimation.
@@ -239,12 +413,13 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
                     for q0 in range(self.Q[term[0]]):
                         for q1 in range(self.Q[term[1]]):
                             self.error_estimation_operator[term][q0, q1] = (
-                                transpose(self.riesz[term[0]][q0]) * self._error_estimation_inner_product
-                                * self.riesz[term[1]][q1])
+                                self._assemble_error_estimation_operator_incrementally(term, q0, q1))
                 elif self.terms_order[term[0]] == 2 and self.terms_order[term[1]] == 1:
                     for q0 in range(self.Q[term[0]]):
                         for q1 in range(self.Q[term[1]]):
                             assert len(self.riesz[term[1]][q1]) == 1
+                            # a single product with the inner product matrix is required, so there is no need
+                            # to re-use the previous operator
                             self.error_estimation_operator[term][q0, q1] = (
                                 transpose(self.riesz[term[0]][q0]) * self._error_estimation_inner_product
                                 * self.riesz[term[1]][q1][0])
@@ -264,5 +439,32 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             else:
                 raise ValueError("Invalid stage in assemble_error_estimation_operators().")
 
+        def _assemble_error_estimation_operator_incrementally(self, term, q0, q1):
+            """
+            It assembles the (q0, q1) block of the error estimation operator associated to term, computing only
+            entries related to Riesz representors which have been added since the previous call. Internal method.
+            """
+            assert self.terms_order[term[0]] == 2
+            assert self.terms_order[term[1]] == 2
+            riesz_0 = self._functions_by_component(self.riesz[term[0]][q0])
+            riesz_1 = self._functions_by_component(self.riesz[term[1]][q1])
+            # Get the number of Riesz representors which were already available in the previous call
+            N_previous_0 = self._number_of_unchanged_functions(riesz_0, None)
+            N_previous_1 = self._number_of_unchanged_functions(riesz_1, None)
+            previous_output = None
+            if (term, q0, q1) in self._error_estimation_operator_riesz:
+                (previous_inner_product, previous_riesz_0, previous_riesz_1, previous_output) = (
+                    self._error_estimation_operator_riesz[term, q0, q1])
+                if previous_inner_product is self._error_estimation_inner_product:
+                    N_previous_0 = self._number_of_unchanged_functions(riesz_0, previous_riesz_0)
+                    N_previous_1 = self._number_of_unchanged_functions(riesz_1, previous_riesz_1)
+            # Assemble, re-using the previous output for entries related to old Riesz representors
+            output = self._transpose_times_operator_times_incrementally(
+                self.riesz[term[0]][q0], N_previous_0, self._error_estimation_inner_product,
+                self.riesz[term[1]][q1], N_previous_1, previous_output, symmetric=True)
+            self._error_estimation_operator_riesz[term, q0, q1] = (
+                self._error_estimation_inner_product, riesz_0, riesz_1, output)
+            return output
+
     # return value (a class) for the decorator
     return RBReducedProblem_Class
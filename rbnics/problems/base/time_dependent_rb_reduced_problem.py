@@ -27,6 +27,15 @@ def TimeDependentRBReducedProblem(ParametrizedReducedDifferentialProblem_Derived
             # or dict of AffineExpansionStorage (for problem with several components)
             self.initial_condition_product = None
 
+        def solve(self, N=None, tol=None, relative=False, **kwargs):
+            # The time dependent solve overrides the one provided by RBReducedProblem, which however still
+            # takes care of the selection of the dimension when a tolerance is provided
+            if tol is None:
+                assert relative is False
+                return ParametrizedReducedDifferentialProblem_DerivedClass.solve(self, N, **kwargs)
+            else:
+                return self._solve_with_tolerance(N, tol, relative, **kwargs)
+
         def _init_error_estimation_operators(self, current_stage="online"):
             ParametrizedReducedDifferentialProblem_DerivedClass._init_error_estimation_operators(self, current_stage)
             # Also initialize data structures related to initial condition error estimation
@@ -5,7 +5,7 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 from math import sqrt
-from numpy import isclose
+from numpy import abs as numpy_abs, all as numpy_all, isclose, sqrt as numpy_sqrt
 from rbnics.problems.elliptic.elliptic_coercive_compliant_problem import EllipticCoerciveCompliantProblem
 from rbnics.problems.elliptic.elliptic_coercive_compliant_reduced_problem import EllipticCoerciveCompliantReducedProblem
 from rbnics.problems.elliptic.elliptic_coercive_rb_reduced_problem import EllipticCoerciveRBReducedProblem
@@ -26,6 +26,14 @@ class EllipticCoerciveCompliantRBReducedProblem(EllipticCoerciveCompliantRBReduc
         assert beta >= 0.
         return sqrt(abs(eps2) / beta)
 
+    # Return an error bound for each of the (stacked) solutions associated to mus
+    def _estimate_error_batch(self, N, mus, solutions):
+        eps2 = self._get_residual_norm_squared_batch(N, mus, solutions)
+        beta = self._get_stability_factor_lower_bound_batch(mus)
+        assert numpy_all((eps2 >= 0.) | isclose(eps2, 0.))
+        assert numpy_all(beta >= 0.)
+        return numpy_sqrt(numpy_abs(eps2) / beta)
+
     # Return an error bound for the current compliant output
     def estimate_error_output(self):
         return self.estimate_error()**2
@@ -18,6 +18,10 @@ def EllipticCoerciveCompliantReducedProblem(EllipticCoerciveReducedProblem_Deriv
         def _compute_output(self, N):
             self._output = transpose(self._solution) * sum(product(self.compute_theta("f"), self.operator["f"][:N]))
 
+        # Perform a vectorized online evaluation of the compliant output for several parameters (internal)
+        def _compute_output_batch(self, N, mus, **kwargs):
+            return self._compute_linear_output_batch("f", N, mus, **kwargs)
+
         # Internal method for error computation
         def _compute_error(self, **kwargs):
             inner_product = dict()
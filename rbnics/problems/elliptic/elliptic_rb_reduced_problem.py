@@ -5,8 +5,9 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 from math import sqrt
-from numpy import isclose
+from numpy import abs as numpy_abs, all as numpy_all, array, einsum, isclose, sqrt as numpy_sqrt
 from rbnics.backends import product, sum, transpose
+from rbnics.backends.online import OnlineAffineExpansionStorage
 from rbnics.problems.base import LinearRBReducedProblem, ParametrizedReducedDifferentialProblem
 from rbnics.problems.elliptic.elliptic_problem import EllipticProblem
 from rbnics.problems.elliptic.elliptic_reduced_problem import EllipticReducedProblem
@@ -62,3 +63,52 @@ class EllipticRBReducedProblem(EllipticRBReducedProblem_Base):
                 + (transpose(self._solution)
                    * sum(product(theta_a, self.error_estimation_operator["a", "a"][:N, :N], theta_a))
                    * self._solution))
+
+    # Solve and return an error bound for several parameters at once
+    def _solve_and_estimate_error_batch(self, N, mus, **kwargs):
+        # Vectorized evaluation requires the error estimation operators to be stored as affine expansions
+        if not all(isinstance(operator, OnlineAffineExpansionStorage) for operator in (
+                self.error_estimation_operator["f", "f"], self.error_estimation_operator["a", "f"],
+                self.error_estimation_operator["a", "a"])):
+            return EllipticRBReducedProblem_Base._solve_and_estimate_error_batch(self, N, mus, **kwargs)
+        solutions = self._solve_batch(N, mus, **kwargs)
+        if solutions is NotImplemented:
+            return NotImplemented
+        return self._estimate_error_batch(N, mus, solutions)
+
+    # Return an error bound for each of the (stacked) solutions associated to mus
+    def _estimate_error_batch(self, N, mus, solutions):
+        eps2 = self._get_residual_norm_squared_batch(N, mus, solutions)
+        beta = self._get_stability_factor_lower_bound_batch(mus)
+        assert numpy_all((eps2 >= 0.) | isclose(eps2, 0.))
+        assert numpy_all(beta >= 0.)
+        return numpy_sqrt(numpy_abs(eps2)) / beta
+
+    # Return the numerator of the error bound for each of the (stacked) solutions associated to mus
+    def _get_residual_norm_squared_batch(self, N, mus, solutions):
+        theta_a = self._compute_theta_batch("a", mus)
+        theta_f = self._compute_theta_batch("f", mus)
+        Q_a = self.Q["a"]
+        Q_f = self.Q["f"]
+        # Collect the coefficients multiplying each (a, n) Riesz representor in a (len(mus) x Q_a*N) array
+        theta_a_solutions = einsum("mp,mi->mpi", theta_a, solutions).reshape(len(mus), -1)
+        # Reshape the error estimation operators so that the residual norm is a quadratic form
+        # in the previous coefficients, which can be evaluated with matrix-matrix products
+        ff = self._affine_expansion_storage_to_array(self.error_estimation_operator["f", "f"], Q_f, Q_f)
+        af = self._affine_expansion_storage_to_array(self.error_estimation_operator["a", "f"][:N], Q_a, Q_f)
+        af = af.transpose(0, 2, 1).reshape(theta_a_solutions.shape[1], Q_f)
+        aa = self._affine_expansion_storage_to_array(self.error_estimation_operator["a", "a"][:N, :N], Q_a, Q_a)
+        aa = aa.transpose(0, 2, 1, 3).reshape(theta_a_solutions.shape[1], theta_a_solutions.shape[1])
+        return (einsum("mp,pq,mq->m", theta_f, ff, theta_f)
+                + 2.0 * einsum("mk,mk->m", theta_a_solutions.dot(af), theta_f)
+                + einsum("mk,mk->m", theta_a_solutions.dot(aa), theta_a_solutions))
+
+    # Return the stability factor lower bound for each parameter in mus
+    def _get_stability_factor_lower_bound_batch(self, mus):
+        mu = self.mu
+        beta = list()
+        for mu_i in mus:
+            self.set_mu(mu_i)
+            beta.append(self.truth_problem.get_stability_factor_lower_bound())
+        self.set_mu(mu)
+        return array(beta, dtype=float)
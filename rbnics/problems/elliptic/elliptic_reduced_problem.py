@@ -4,8 +4,11 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+from numpy import einsum, newaxis, tensordot, zeros
+from numpy.linalg import solve
 from rbnics.problems.base import LinearReducedProblem
-from rbnics.backends import product, sum, transpose
+from rbnics.backends import NonlinearProblemWrapper, product, sum, TimeDependentProblemWrapper, transpose
+from rbnics.backends.online import OnlineAffineExpansionStorage
 
 
 def EllipticReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
@@ -27,9 +30,54 @@ def EllipticReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
                 N = self.N
                 return sum(product(problem.compute_theta("f"), problem.operator["f"][:N]))
 
+        # Perform a vectorized online solve for several parameters (internal)
+        def _solve_batch(self, N, mus, **kwargs):
+            """
+            Solve the reduced problem of dimension N for each parameter in mus at once, by assembling
+            a stack of reduced systems and solving them with a single call to the dense solver.
+
+            :return: reduced solutions, stacked in a (len(mus) x N) array.
+            """
+            # Vectorized assembly requires a linear stationary problem, with reduced operators stored as affine
+            # expansions
+            if (len(kwargs) > 0
+                    or issubclass(self.ProblemSolver, (NonlinearProblemWrapper, TimeDependentProblemWrapper))
+                    or not all(isinstance(self.operator[term], OnlineAffineExpansionStorage) for term in ("a", "f"))):
+                return EllipticReducedProblem_Base._solve_batch(self, N, mus, **kwargs)
+            if N == 0:  # trivial case
+                return zeros((len(mus), 0))
+            lhs = tensordot(
+                self._compute_theta_batch("a", mus),
+                self._affine_expansion_storage_to_array(self.operator["a"][:N, :N], self.Q["a"]), axes=1)
+            rhs = tensordot(
+                self._compute_theta_batch("f", mus),
+                self._affine_expansion_storage_to_array(self.operator["f"][:N], self.Q["f"]), axes=1)
+            self._apply_dirichlet_bcs_batch(N, mus, lhs, rhs)
+            return solve(lhs, rhs[..., newaxis])[..., 0]
+
         # Perform an online evaluation of the output
         def _compute_output(self, N):
             self._output = transpose(self._solution) * sum(product(self.compute_theta("s"), self.operator["s"][:N]))
 
+        # Perform a vectorized online evaluation of the output for several parameters (internal)
+        def _compute_output_batch(self, N, mus, **kwargs):
+            return self._compute_linear_output_batch("s", N, mus, **kwargs)
+
+        def _compute_linear_output_batch(self, term, N, mus, **kwargs):
+            """
+            Evaluate the output defined by the linear functional term for each parameter in mus,
+            as a batched quadratic form in the stacked thetas and reduced solutions. Internal method.
+            """
+            if term not in self.terms or not isinstance(self.operator[term], OnlineAffineExpansionStorage):
+                return EllipticReducedProblem_Base._compute_output_batch(self, N, mus, **kwargs)
+            solutions = self._solve_batch(N, mus, **kwargs)
+            if solutions is NotImplemented:
+                return NotImplemented
+            if N == 0:  # trivial case
+                return zeros(len(mus))
+            return einsum(
+                "mq,qn,mn->m", self._compute_theta_batch(term, mus),
+                self._affine_expansion_storage_to_array(self.operator[term][:N], self.Q[term]), solutions)
+
     # return value (a class) for the decorator
     return EllipticReducedProblem_Class
@@ -116,6 +116,7 @@ class StokesProblem(StokesProblem_Base):
             assembled_dirichlet_bc
         )
         solver.set_parameters(self._linear_solver_parameters)
+        solver.set_factorization_cache(self._factorization_cache)
         solver.solve()
 
     def _supremizer_cache_key_from_kwargs(self, **kwargs):
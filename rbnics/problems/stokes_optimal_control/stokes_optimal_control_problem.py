@@ -169,6 +169,7 @@ class StokesOptimalControlProblem(StokesOptimalControlProblem_Base):
             assembled_dirichlet_bc
         )
         solver.set_parameters(self._linear_solver_parameters)
+        solver.set_factorization_cache(self._factorization_cache)
         solver.solve()
 
     def solve_adjoint_supremizer(self, solution):
@@ -197,6 +198,7 @@ class StokesOptimalControlProblem(StokesOptimalControlProblem_Base):
             assembled_dirichlet_bc
         )
         solver.set_parameters(self._linear_solver_parameters)
+        solver.set_factorization_cache(self._factorization_cache)
         solver.solve()
 
     def _supremizer_cache_key_from_kwargs(self, **kwargs):
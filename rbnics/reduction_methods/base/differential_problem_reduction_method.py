@@ -64,11 +64,11 @@ class DifferentialProblemReductionMethod(ReductionMethod):
         # speedup analysis folder is required only in the speedup analysis
         at_least_one_required_folder_created = required_folders.create()
         at_least_one_optional_folder_created = optional_folders.create()  # noqa: F841
-        if not at_least_one_required_folder_created:
+        if not self._need_to_do_offline_stage(at_least_one_required_folder_created):
             return False  # offline construction should be skipped, since data are already available
         else:
             self.reduced_problem.init("offline")
-            return True  # offline construction should be carried out
+            return True  # offline construction should be carried out (or resumed)
 
     def postprocess_snapshot(self, snapshot, snapshot_index):
         """
@@ -110,6 +110,10 @@ class DifferentialProblemReductionMethod(ReductionMethod):
     # Finalize data structures required after the offline phase
     def _finalize_offline(self):
         self.reduced_problem.init("online")
+        # Report on and free factorizations of truth matrices, which are not required anymore
+        if len(self.truth_problem._factorization_cache) > 0:
+            print("truth factorization cache:", str(self.truth_problem._factorization_cache))
+        self.truth_problem._factorization_cache.clear()
 
     # Initialize data structures required for the error analysis phase
     def _init_error_analysis(self, **kwargs):
@@ -5,10 +5,12 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 import os
+from math import inf
 from numbers import Number
 from rbnics.backends import ProperOrthogonalDecomposition
 from rbnics.utils.decorators import PreserveClassName, RequiredBaseDecorators, snapshot_links_to_cache
-from rbnics.utils.io import ErrorAnalysisTable, OnlineSizeDict, SpeedupAnalysisTable, TextBox, TextLine, Timer
+from rbnics.utils.io import (ErrorAnalysisTable, Folders, OnlineSizeDict, SpeedupAnalysisTable, TextBox, TextIO,
+                             TextLine, Timer)
 
 
 @RequiredBaseDecorators(None)
@@ -44,6 +46,18 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
             else:
                 self.tol = 0.
 
+            # Algorithm used to compute the POD modes
+            self.POD_engine = ("exact", dict())
+
+            # Number of groups of a hierarchical approximate POD (0 if disabled), and tolerance
+            # used to compress the snapshots of each group
+            self.hierarchical_POD_groups = 0
+            self.hierarchical_POD_tol = 0.
+
+            # Folder storing which groups have completed compute_snapshots. It is not part of self.folder,
+            # since it does not affect the availability of offline data
+            self._snapshots_groups_folder = Folders.Folder(os.path.join(self.folder_prefix, "snapshots_groups"))
+
         def set_tolerance(self, tol, **kwargs):
             """
             It sets tolerance to be used as stopping criterion.
@@ -84,6 +98,42 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
 
             self.tol = tol
 
+        def set_POD_engine(self, engine, **kwargs):
+            """
+            It sets the algorithm used to compute the POD modes.
+
+            :param engine: "exact" (default), "partial", "randomized" or "incremental".
+            :param kwargs: further parameters of the engine, i.e. oversampling, power_iterations and seed
+                for the randomized engine, or tolerance for the incremental engine.
+            """
+            self.POD_engine = (engine, kwargs)
+
+        def set_hierarchical_POD(self, n_groups, tol):
+            """
+            It enables a hierarchical approximate POD: each of the n_groups groups computing the snapshots
+            (see compute_snapshots) compresses them by a POD with tolerance tol, and saves the resulting modes,
+            weighted by the square root of the POD eigenvalues. offline() then merges the compressed modes of
+            all groups, rather than the snapshots, and performs the final POD with the tolerance provided
+            to set_tolerance. Since the energy discarded at each level adds up, the relative error
+            of the final basis on the snapshots is bounded by the sum of the two tolerances
+            (plus the tolerance of the nested POD in time, if any); the actual bound is printed
+            at the end of the offline stage.
+
+            :param n_groups: total number of groups.
+            :param tol: the tolerance used to compress the snapshots of each group, as in set_tolerance.
+            """
+            assert n_groups > 0
+            self.hierarchical_POD_groups = n_groups
+            self.hierarchical_POD_tol = tol
+            self.folder["hierarchical_POD"] = os.path.join(self.folder_prefix, "hierarchical_POD")
+
+        def _get_PODs(self):
+            # Return a list of pairs (component, POD), with component None for problems with one component
+            if isinstance(self.POD, dict):
+                return list(self.POD.items())
+            else:
+                return [(None, self.POD)]
+
         def _init_offline(self):
             # Call parent to initialize inner product and reduced problem
             output = DifferentialProblemReductionMethod_DerivedClass._init_offline(self)
@@ -113,19 +163,133 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
             """
             need_to_do_offline_stage = self._init_offline()
             if need_to_do_offline_stage:
+                self._check_snapshots_groups()
                 self._offline()
             self._finalize_offline()
             return self.reduced_problem
 
-        @snapshot_links_to_cache
-        def _offline(self):
-            print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase begins", fill="="))
-            print("")
+        def initialize_snapshots_groups(self, ntrain, enable_import=True, sampling=None, **kwargs):
+            """
+            It generates (or imports) the training set shared by all groups of compute_snapshots(), and records
+            it so that groups initializing a different training set are detected. It must be called once, before
+            any group starts, e.g. by a launcher script with the following steps:
+
+            1. a first run calls initialize_snapshots_groups(ntrain);
+            2. n_groups runs, which may be concurrent, call initialize_training_set(ntrain) (which imports the
+               shared training set) and then compute_snapshots(group_index, n_groups), each with a different
+               group_index;
+            3. a final run calls initialize_training_set(ntrain) and then offline().
+
+            :param ntrain: size of the training set.
+            :param enable_import: import the training set from file, if available, rather than generating it.
+            :param sampling: distribution used to generate the training set.
+            """
+            import_successful = self.initialize_training_set(ntrain, enable_import, sampling, **kwargs)
+            self._snapshots_groups_folder.create()
+            TextIO.save_file(self.training_set.content_hash(), self._snapshots_groups_folder, "training_set")
+            return import_successful
 
-            for (mu_index, mu) in enumerate(self.training_set):
+        def compute_snapshots(self, group_index, n_groups):
+            """
+            It computes the truth snapshots for the portion of the training set assigned to a group of processes,
+            storing them in the disk cache of the truth problem. Each group is expected to be a separate run
+            (with its own communicator, possibly consisting of a single process) sharing the same training set
+            and folders: groups solve disjoint slices of the training set concurrently, after which offline()
+            loads all snapshots from the cache rather than solving for them again. offline() raises an error
+            if some groups have not completed their call to this method, or have used a different training set.
+            The shared training set should be created once with initialize_snapshots_groups() before starting
+            the groups, since each group generates its own random training set if none is available on file.
+
+            :param group_index: index of the current group, between 0 and n_groups - 1.
+            :param n_groups: total number of groups.
+            """
+            from rbnics.utils.config import config  # cannot import at global scope
+            assert "disk" in config.get("problems", "cache"), (
+                "Snapshots computed by a group can be shared only through the disk cache")
+            assert 0 <= group_index < n_groups
+            assert len(self.training_set) > 0
+            if (TextIO.exists_file(self._snapshots_groups_folder, "training_set")
+                    and TextIO.load_file(self._snapshots_groups_folder, "training_set")
+                    != self.training_set.content_hash()):
+                raise RuntimeError(
+                    "The training set of group " + str(group_index) + " differs from the one shared by all groups."
+                    + " Please initialize it with initialize_training_set(), importing it from file.")
+
+            if self.hierarchical_POD_groups > 0:
+                assert n_groups == self.hierarchical_POD_groups
+                self._compute_compressed_snapshots(group_index)
+                return
+
+            self.truth_problem.init()
+            self.truth_problem.folder["cache"].create()
+            for mu_index in range(group_index, len(self.training_set), n_groups):
                 print(TextLine(str(mu_index), fill="#"))
 
-                self.truth_problem.set_mu(mu)
+                self.truth_problem.set_mu(self.training_set[mu_index])
+
+                print("truth solve for mu =", self.truth_problem.mu)
+                self.truth_problem.solve()  # will also add to cache
+
+                print("")
+
+            self._save_snapshots_group_marker(group_index, n_groups)
+
+        def _save_snapshots_group_marker(self, group_index, n_groups):
+            # Mark the snapshots of the current group as computed, so that offline() can check that all groups
+            # have completed before assembling the snapshots matrix
+            self._snapshots_groups_folder.create()
+            TextIO.save_file(n_groups, self._snapshots_groups_folder, "n_groups")
+            TextIO.save_file(self._snapshots_group_marker(n_groups), self._snapshots_groups_folder,
+                             "group_" + str(group_index))
+
+        def _snapshots_group_marker(self, n_groups):
+            # Groups are consistent only if they have sliced the same training set in the same number of groups
+            return (n_groups, len(self.training_set), self.training_set.content_hash())
+
+        def _check_snapshots_groups(self):
+            # Check that all groups which were expected to compute snapshots through compute_snapshots have
+            # completed, rather than silently solving again for the missing snapshots. In a hierarchical
+            # approximate POD all groups are always expected, since offline() merges their compressed snapshots
+            # and cannot compute them by itself
+            if self.hierarchical_POD_groups > 0:
+                n_groups = self.hierarchical_POD_groups
+            elif TextIO.exists_file(self._snapshots_groups_folder, "n_groups"):
+                n_groups = TextIO.load_file(self._snapshots_groups_folder, "n_groups")
+            else:
+                return
+            marker = self._snapshots_group_marker(n_groups)
+            missing_groups = list()
+            for group_index in range(n_groups):
+                filename = "group_" + str(group_index)
+                if (not TextIO.exists_file(self._snapshots_groups_folder, filename)
+                        or TextIO.load_file(self._snapshots_groups_folder, filename) != marker):
+                    missing_groups.append(group_index)
+            if len(missing_groups) > 0:
+                if self.hierarchical_POD_groups > 0:
+                    alternative = "."
+                else:
+                    alternative = (", or remove the folder " + str(self._snapshots_groups_folder)
+                                   + " to compute all snapshots within offline().")
+                raise RuntimeError(
+                    "Snapshots of groups " + ", ".join(str(group_index) for group_index in missing_groups)
+                    + " (out of " + str(n_groups) + " groups) have not been computed for the current training set."
+                    + " Please call compute_snapshots(group_index, " + str(n_groups) + ") for each missing group_index "
+                    + "before calling offline()" + alternative)
+
+        def _compute_compressed_snapshots(self, group_index):
+            # Leaf of the hierarchical approximate POD: compute the snapshots assigned to the current group,
+            # and save their compression
+            self._init_offline()
+            if self.reduced_problem.basis_functions is None:
+                # offline data structures have not been initialized, because folders were created by another group
+                self.reduced_problem.init("offline")
+            for (_, POD) in self._get_PODs():
+                POD.set_engine(self.POD_engine[0], **self.POD_engine[1])
+
+            for mu_index in range(group_index, len(self.training_set), self.hierarchical_POD_groups):
+                print(TextLine(str(mu_index), fill="#"))
+
+                self.truth_problem.set_mu(self.training_set[mu_index])
 
                 print("truth solve for mu =", self.truth_problem.mu)
                 snapshot = self.truth_problem.solve()
@@ -137,13 +301,74 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
 
                 print("")
 
+            print(TextLine("compress snapshots", fill="#"))
+            for (component, POD) in self._get_PODs():
+                if component is None:
+                    tol = self.hierarchical_POD_tol
+                    filename = "group_" + str(group_index)
+                else:
+                    tol = (self.hierarchical_POD_tol[component] if isinstance(self.hierarchical_POD_tol, dict)
+                           else self.hierarchical_POD_tol)
+                    filename = "group_" + str(group_index) + "_" + component
+                    print("# POD for component", component)
+                N = POD.compress(inf, tol)
+                print("compressed snapshots to", N, "modes, discarding a fraction", POD.relative_error_bound,
+                      "of their energy")
+                POD.save(self.folder["hierarchical_POD"], filename)
+
+            # The call to _init_offline above has created all required folders, which would make offline() skip
+            # the offline stage as if reduced order data were already available. Mark instead the offline stage
+            # as not complete, without any state to resume it from, so that offline() carries it out from scratch
+            # (see _need_to_do_offline_stage), merging the compressed snapshots of all groups
+            self._save_offline_checkpoint(False)
+            self._save_snapshots_group_marker(group_index, self.hierarchical_POD_groups)
+
+        @snapshot_links_to_cache
+        def _offline(self):
+            print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase begins", fill="="))
+            print("")
+
+            for (_, POD) in self._get_PODs():
+                POD.set_engine(self.POD_engine[0], **self.POD_engine[1])
+
+            if self.hierarchical_POD_groups > 0:
+                print("merge compressed snapshots of", self.hierarchical_POD_groups, "groups")
+                for (component, POD) in self._get_PODs():
+                    for group_index in range(self.hierarchical_POD_groups):
+                        filename = "group_" + str(group_index) + ("" if component is None else "_" + component)
+                        POD.load(self.folder["hierarchical_POD"], filename)
+                print("")
+            else:
+                for (mu_index, mu) in enumerate(self.training_set):
+                    print(TextLine(str(mu_index), fill="#"))
+
+                    self.truth_problem.set_mu(mu)
+
+                    print("truth solve for mu =", self.truth_problem.mu)
+                    snapshot = self.truth_problem.solve()
+                    self.truth_problem.export_solution(self.folder["snapshots"], "truth_" + str(mu_index), snapshot)
+                    snapshot = self.postprocess_snapshot(snapshot, mu_index)
+
+                    print("update snapshots matrix")
+                    self.update_snapshots_matrix(snapshot)
+
+                    print("")
+
             print(TextLine("perform POD", fill="#"))
             self.compute_basis_functions()
+            for (component, POD) in self._get_PODs():
+                POD.print_elapsed_time()
+                print("POD relative error bound" + ("" if component is None else " for component " + component)
+                      + ":", POD.relative_error_bound)
 
             print("")
             print("build reduced operators")
             self.reduced_problem.build_reduced_operators()
 
+            # Mark the offline stage as complete, since groups of a hierarchical approximate POD have marked it
+            # as not complete
+            self._save_offline_checkpoint(True)
+
             print("")
             print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase ends", fill="="))
             print("")
@@ -248,8 +473,17 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
 
                 self.reduced_problem.set_mu(mu)
 
-                for (n_int, n_arg) in N_generator_items():
-                    self.reduced_problem.solve(n_arg, **kwargs)
+                # Solve for all dimensions from a single factorization, if the reduced problem allows it
+                nested_solutions = NotImplemented
+                if all(isinstance(n_arg, int) for (_, n_arg) in N_generator_items()):
+                    nested_solutions = self.reduced_problem._solve_nested_and_cache(
+                        [n_arg for (_, n_arg) in N_generator_items()], **kwargs)
+
+                for (n_index, (n_int, n_arg)) in enumerate(N_generator_items()):
+                    if nested_solutions is not NotImplemented:
+                        self.reduced_problem._solution = nested_solutions[n_index]
+                    else:
+                        self.reduced_problem.solve(n_arg, **kwargs)
                     error = self.reduced_problem.compute_error(**kwargs)
                     relative_error = self.reduced_problem.compute_relative_error(**kwargs)
 
@@ -6,8 +6,10 @@
 
 import os
 from math import sqrt
+from numpy import concatenate, full, inf
 from logging import DEBUG, getLogger
-from rbnics.backends import GramSchmidt
+from rbnics.backends import Function, GramSchmidt, import_
+from rbnics.sampling import ParameterSpaceSubset
 from rbnics.utils.decorators import PreserveClassName, RequiredBaseDecorators, snapshot_links_to_cache
 from rbnics.utils.io import (ErrorAnalysisTable, GreedySelectedParametersList, GreedyErrorEstimatorsList,
                              OnlineSizeDict, SpeedupAnalysisTable, TextBox, TextLine, Timer)
@@ -43,6 +45,65 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             self.greedy_selected_parameters = GreedySelectedParametersList()
             self.greedy_error_estimators = GreedyErrorEstimatorsList()
             self.label = "RB"
+            # Number of training parameters for which the error estimator is evaluated at once during the greedy
+            # search, by a vectorized sweep over the training set (None means one parameter at a time)
+            self.greedy_chunk_size = None
+            # Saturation constant for the lazy greedy search, which only re-evaluates the error estimator
+            # for training parameters whose previous error estimator (times the saturation constant)
+            # exceeds the current maximum (None means that the error estimator is evaluated on the whole
+            # training set at each iteration)
+            self.greedy_saturation_constant = None
+            self._greedy_previous_error_estimators = None  # array over the training set
+            # Multi-stage greedy: once the tolerance is reached on the training set, the reduced order model
+            # is validated on a fresh sample, and the training set is enriched until validation succeeds
+            # (None means that the training set is not enriched)
+            self.training_set_enrichment = None
+            # Length of the training set when it was last saved for the offline checkpoint (None if not saved yet)
+            self._offline_checkpoint_training_set_length = None
+            # Number of parameters selected at each greedy iteration, and minimum distance between them
+            self.greedy_batch_size = 1
+            self.greedy_batch_min_distance = 0.
+            self._greedy_batch = list()  # of (error estimator, parameter), besides the maximum one
+
+        # OFFLINE: set the number of training parameters for which the error estimator is evaluated at once
+        def set_greedy_chunk_size(self, chunk_size):
+            assert chunk_size is None or chunk_size > 0
+            self.greedy_chunk_size = chunk_size
+
+        # OFFLINE: set the saturation constant for the lazy greedy search
+        def set_greedy_saturation_constant(self, saturation_constant):
+            assert saturation_constant is None or saturation_constant > 0
+            self.greedy_saturation_constant = saturation_constant
+
+        # OFFLINE: set the number of parameters selected at each greedy iteration
+        def set_greedy_batch_size(self, batch_size, min_distance=0.):
+            """
+            Select, at each greedy iteration, up to batch_size parameters with the largest error estimators,
+            rather than only the maximum one. Truth solutions for all selected parameters are added to the basis
+            before reduced operators and error estimation operators are updated.
+
+            :param batch_size: maximum number of parameters selected at each greedy iteration.
+            :param min_distance: minimum distance between any two parameters selected at the same iteration.
+            """
+            assert batch_size > 0
+            assert min_distance >= 0.
+            self.greedy_batch_size = batch_size
+            self.greedy_batch_min_distance = min_distance
+
+        # OFFLINE: enable the multi-stage greedy, which starts from the (coarse) training set provided by
+        # initialize_training_set and enriches it when the tolerance is reached but not confirmed by validation
+        def set_training_set_enrichment(self, ntrain_enrichment, nvalidation, sampling=None):
+            """
+            Enable the enrichment of the training set during the greedy algorithm.
+
+            :param ntrain_enrichment: number of random parameters to be added to the training set at each stage,
+                in addition to the validation parameters which do not satisfy the tolerance.
+            :param nvalidation: number of parameters in the validation set, sampled anew at each stage.
+            :param sampling: (optional) distribution used to sample the training and validation parameters.
+            """
+            assert ntrain_enrichment >= 0
+            assert nvalidation > 0
+            self.training_set_enrichment = (ntrain_enrichment, nvalidation, sampling)
 
         def _init_offline(self):
             # Call parent to initialize inner product and reduced problem
@@ -83,24 +144,45 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             # Initialize first parameter to be used
             self.reduced_problem.build_reduced_operators()
             self.reduced_problem.build_error_estimation_operators()
-            (absolute_error_estimator_max, relative_error_estimator_max) = self.greedy()
-            print("initial maximum absolute error estimator over training set =", absolute_error_estimator_max)
-            print("initial maximum relative error estimator over training set =", relative_error_estimator_max)
+            if self._offline_checkpoint is None:
+                self._save_offline_checkpoint(False)
+                snapshot_parameters = list()
+                (absolute_error_estimator_max, relative_error_estimator_max) = self.greedy()
+                print("initial maximum absolute error estimator over training set =", absolute_error_estimator_max)
+                print("initial maximum relative error estimator over training set =", relative_error_estimator_max)
+            else:
+                (snapshot_parameters, absolute_error_estimator_max, relative_error_estimator_max) = (
+                    self._resume_offline())
+                print("maximum absolute error estimator over training set =", absolute_error_estimator_max)
+                print("maximum relative error estimator over training set =", relative_error_estimator_max)
+            self._save_offline_checkpoint(False, self._offline_checkpoint_state(
+                snapshot_parameters, absolute_error_estimator_max, relative_error_estimator_max))
 
             print("")
 
-            iteration = 0
+            iteration = len(snapshot_parameters)
             while self.reduced_problem.N < self.Nmax and relative_error_estimator_max >= self.tol:
                 print(TextLine("N = " + str(self.reduced_problem.N), fill="#"))
 
-                print("truth solve for mu =", self.truth_problem.mu)
-                snapshot = self.truth_problem.solve()
-                self.truth_problem.export_solution(self.folder["snapshots"], "truth_" + str(iteration), snapshot)
-                snapshot = self.postprocess_snapshot(snapshot, iteration)
-
-                print("update basis matrix")
-                self.update_basis_matrix(snapshot)
-                iteration += 1
+                for (batch_index, (_, mu)) in enumerate(self._greedy_batch):
+                    # Only the first parameter is guaranteed to be added, since it has already been set
+                    # (and recorded) by greedy(). Further parameters are recorded only once they are added
+                    if batch_index > 0:
+                        if not self.reduced_problem.N < self.Nmax:
+                            break
+                        self.truth_problem.set_mu(mu)
+
+                    print("truth solve for mu =", self.truth_problem.mu)
+                    snapshot = self.truth_problem.solve()
+                    self.truth_problem.export_solution(self.folder["snapshots"], "truth_" + str(iteration), snapshot)
+                    snapshot = self.postprocess_snapshot(snapshot, iteration)
+
+                    print("update basis matrix")
+                    self.update_basis_matrix(snapshot)
+                    snapshot_parameters.append(self.truth_problem.mu)
+                    if batch_index > 0:
+                        self._greedy_record(batch_index)
+                    iteration += 1
 
                 print("build reduced operators")
                 self.reduced_problem.build_reduced_operators()
@@ -111,15 +193,154 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 print("build operators for error estimation")
                 self.reduced_problem.build_error_estimation_operators()
 
-                (absolute_error_estimator_max, relative_error_estimator_max) = self.greedy()
+                # Greedy search results are stored only after a possible enrichment of the training set,
+                # so that a search superseded by the enrichment is not recorded
+                (absolute_error_estimator_max, relative_error_estimator_max) = self._greedy_select()
                 print("maximum absolute error estimator over training set =", absolute_error_estimator_max)
                 print("maximum relative error estimator over training set =", relative_error_estimator_max)
 
+                if (self.reduced_problem.N < self.Nmax and relative_error_estimator_max < self.tol
+                        and self.enrich_training_set()):
+                    (absolute_error_estimator_max, relative_error_estimator_max) = self._greedy_select()
+                    print("maximum absolute error estimator over enriched training set =",
+                          absolute_error_estimator_max)
+                    print("maximum relative error estimator over enriched training set =",
+                          relative_error_estimator_max)
+                self._greedy_record()
+
+                self._save_offline_checkpoint(False, self._offline_checkpoint_state(
+                    snapshot_parameters, absolute_error_estimator_max, relative_error_estimator_max))
+
                 print("")
 
+            self._save_offline_checkpoint(True)
+
             print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase ends", fill="="))
             print("")
 
+        def _offline_checkpoint_state(self, snapshot_parameters, absolute_error_estimator_max,
+                                      relative_error_estimator_max):
+            """
+            It collects the data required to resume the offline stage after the current greedy iteration.
+            Internal method.
+
+            :param snapshot_parameters: parameters whose truth solutions have been added to the basis.
+            :param absolute_error_estimator_max: maximum absolute error estimator at the current iteration.
+            :param relative_error_estimator_max: maximum relative error estimator at the current iteration.
+            :return: a dictionary with the data to be stored in the offline checkpoint.
+            """
+            # The training set may be large, and is changed only by enrichments which append new parameters:
+            # rather than storing it in the checkpoint, save it to a separate file (only appending the new
+            # parameters, if any), and store its length and content hash to check its consistency on resume.
+            # A separate file is required since initialize_training_set() replaces the "training_set" file
+            # with a newly generated one when its size differs from the requested one, e.g. after enrichments
+            if len(self.training_set) != self._offline_checkpoint_training_set_length:
+                self.training_set.save(self.folder["training_set"], "offline_checkpoint_training_set")
+                self._offline_checkpoint_training_set_length = len(self.training_set)
+            N = self.reduced_problem.N
+            return {
+                "snapshot_parameters": list(snapshot_parameters),
+                "N": dict(N) if isinstance(N, dict) else N,
+                "training_set_length": len(self.training_set),
+                "training_set_hash": self.training_set.content_hash(),
+                "greedy_selected_parameters": list(self.greedy_selected_parameters),
+                "greedy_error_estimators": list(self.greedy_error_estimators),
+                "greedy_batch": list(self._greedy_batch),
+                "absolute_error_estimator_max": absolute_error_estimator_max,
+                "relative_error_estimator_max": relative_error_estimator_max
+            }
+
+        def _resume_offline(self):
+            """
+            It restores the state of an interrupted offline stage from the offline checkpoint. The basis functions
+            and Riesz representors of the last completed iteration are loaded from file, so that no truth problem
+            is solved again, and operators are assembled once for the resulting basis. Internal method.
+
+            :return: parameters whose truth solutions have been added to the basis, and maximum absolute and
+                relative error estimators at the last completed iteration.
+            """
+            state = self._offline_checkpoint
+            print("resume offline phase from the checkpoint with N =", state["N"])
+
+            # Restore training set and greedy data. Parameters saved by an enrichment after the last completed
+            # iteration are discarded
+            training_set = ParameterSpaceSubset()
+            training_set.load(self.folder["training_set"], "offline_checkpoint_training_set")
+            training_set = training_set[:state["training_set_length"]]
+            if training_set.content_hash() != state["training_set_hash"]:
+                raise RuntimeError(
+                    "The training set saved for the offline checkpoint is not consistent with the checkpoint."
+                    + " Please remove the folder " + str(self.folder_prefix) + " to carry out the offline stage"
+                    + " from scratch.")
+            self.training_set.clear()
+            self.training_set.extend(training_set)
+            self.training_set.save(self.folder["training_set"], "training_set")
+            for mu in state["greedy_selected_parameters"]:
+                self.greedy_selected_parameters.append(mu)
+            self.greedy_error_estimators.extend(state["greedy_error_estimators"])
+            self._greedy_batch = list(state["greedy_batch"])
+
+            # Restore basis functions and Riesz representors
+            self._restore_basis_functions(state)
+            for term in self.reduced_problem.riesz_terms:
+                self.reduced_problem.restore_riesz_representation(term)
+
+            # Restore reduced operators and error estimation operators. Only the Riesz representors which
+            # could not be restored are computed again
+            self.reduced_problem.build_reduced_operators()
+            self.reduced_problem.build_error_estimation_operators()
+
+            # Restore the next parameter to be used
+            self.truth_problem.set_mu(self._greedy_batch[0][1])
+            return (list(state["snapshot_parameters"]), state["absolute_error_estimator_max"],
+                    state["relative_error_estimator_max"])
+
+        def _restore_basis_functions(self, state):
+            """
+            It loads from file the basis functions computed up to the iteration stored in the offline checkpoint.
+            Further basis functions stored on file (e.g. by an interrupted iteration) are discarded.
+            Internal method.
+
+            :param state: the data stored in the offline checkpoint.
+            """
+            basis_functions = self.reduced_problem.basis_functions
+            directory = self.reduced_problem.folder["basis"]
+
+            def load_basis_function(filename):
+                basis_function = Function(self.truth_problem.V)
+                import_(basis_function, directory, filename)
+                return basis_function
+
+            if len(self.truth_problem.components) > 1:
+                for component in self.truth_problem.components:
+                    N_bc = self.reduced_problem.N_bc[component]
+                    for index in range(N_bc, N_bc + state["N"][component]):
+                        basis_functions.enrich(load_basis_function("basis_" + component + "_" + str(index)),
+                                               component=component)
+                    self.reduced_problem.N[component] = state["N"][component]
+            else:
+                N_bc = self.reduced_problem.N_bc
+                for index in range(N_bc, N_bc + state["N"]):
+                    basis_functions.enrich(load_basis_function("basis_" + str(index)))
+                self.reduced_problem.N = state["N"]
+            basis_functions.save(directory, "basis")
+
+        def _replay_basis_functions(self, state):
+            """
+            It computes again the basis functions up to the iteration stored in the offline checkpoint, by adding
+            the truth solutions (loaded from the cache, if available) for the selected parameters in the same order.
+            This is required when the basis construction depends on further data which are not saved to file.
+            Internal method.
+
+            :param state: the data stored in the offline checkpoint.
+            """
+            for (iteration, mu) in enumerate(state["snapshot_parameters"]):
+                self.truth_problem.set_mu(mu)
+                snapshot = self.truth_problem.solve()
+                snapshot = self.postprocess_snapshot(snapshot, iteration)
+                self.update_basis_matrix(snapshot)
+            assert self.reduced_problem.N == state["N"]
+
         def update_basis_matrix(self, snapshot):
             """
             It updates basis matrix.
@@ -141,6 +362,52 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 self.reduced_problem.N += 1
                 self.reduced_problem.basis_functions.save(self.reduced_problem.folder["basis"], "basis")
 
+        def enrich_training_set(self):
+            """
+            It validates the current reduced order model on a fresh sample of parameters and, if the tolerance
+            is not satisfied, it enriches the training set with the parameters which do not satisfy the tolerance
+            and with further random parameters.
+
+            :return: True if the training set has been enriched, False otherwise.
+            """
+            if self.training_set_enrichment is None:
+                return False
+            (ntrain_enrichment, nvalidation, sampling) = self.training_set_enrichment
+
+            # Compute the relative error estimator on the validation set
+            validation_set = ParameterSpaceSubset()
+            validation_set.generate(self.truth_problem.mu_range, nvalidation, sampling)
+            error_estimators = list()
+            if self.greedy_chunk_size is None:
+                for mu in validation_set:
+                    self.reduced_problem.set_mu(mu)
+                    self.reduced_problem.solve()
+                    error_estimators.append(self.reduced_problem.estimate_error())
+            else:
+                for chunk_begin in range(0, len(validation_set), self.greedy_chunk_size):
+                    error_estimators.extend(self.reduced_problem.estimate_error_batch(
+                        validation_set[chunk_begin:chunk_begin + self.greedy_chunk_size]._list))
+            relative_error_estimators = [
+                error_estimator / self.greedy_error_estimators[0] for error_estimator in error_estimators]
+            print("maximum relative error estimator over validation set =", max(relative_error_estimators))
+            new_parameters = [mu for (mu, relative_error_estimator) in zip(validation_set, relative_error_estimators)
+                              if relative_error_estimator >= self.tol]
+            if len(new_parameters) == 0:
+                return False
+
+            # Enrich the training set
+            if ntrain_enrichment > 0:
+                random_parameters = ParameterSpaceSubset()
+                random_parameters.generate(self.truth_problem.mu_range, ntrain_enrichment, sampling)
+                new_parameters.extend(random_parameters)
+            print("enrich training set with", len(new_parameters), "parameters")
+            self.training_set.extend(new_parameters)
+            self.training_set.save(self.folder["training_set"], "training_set")
+            if self._greedy_previous_error_estimators is not None:
+                self._greedy_previous_error_estimators = concatenate(
+                    (self._greedy_previous_error_estimators, full(len(new_parameters), inf)))
+            return True
+
         def greedy(self):
             """
             It chooses the next parameter in the offline stage in a greedy fashion:
@@ -149,13 +416,41 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
 
             :return: max error estimator and the comparison with the first one calculated.
             """
+            output = self._greedy_select()
+            self._greedy_record()
+            return output
+
+        def _greedy_select(self):
+            """
+            It chooses the next parameter in the offline stage in a greedy fashion, and sets it as the current
+            parameter of the truth problem, without storing it in the greedily selected parameters. Internal method.
+
+            :return: max error estimator and the comparison with the first one calculated.
+            """
+            self._greedy_batch = list()
             (error_estimator_max, error_estimator_argmax) = self._greedy()
             self.truth_problem.set_mu(self.training_set[error_estimator_argmax])
-            self.greedy_selected_parameters.append(self.training_set[error_estimator_argmax])
+            if len(self._greedy_batch) == 0:
+                self._greedy_batch.append((error_estimator_max, self.training_set[error_estimator_argmax]))
+            if len(self.greedy_error_estimators) > 0:
+                first_error_estimator_max = self.greedy_error_estimators[0]
+            else:
+                first_error_estimator_max = error_estimator_max
+            return (error_estimator_max, error_estimator_max / first_error_estimator_max)
+
+        def _greedy_record(self, batch_index=0):
+            """
+            It stores a parameter chosen by the last call to _greedy_select(), and saves it to file.
+            Internal method.
+
+            :param batch_index: index of the parameter in the batch of selected parameters. Parameters other than
+                the first one are recorded only if they are actually added to the basis.
+            """
+            (error_estimator, mu) = self._greedy_batch[batch_index]
+            self.greedy_selected_parameters.append(mu)
+            self.greedy_error_estimators.append(error_estimator)
             self.greedy_selected_parameters.save(self.folder["post_processing"], "mu_greedy")
-            self.greedy_error_estimators.append(error_estimator_max)
             self.greedy_error_estimators.save(self.folder["post_processing"], "error_estimator_max")
-            return (error_estimator_max, error_estimator_max / self.greedy_error_estimators[0])
 
         def _greedy(self):
             """
@@ -170,19 +465,68 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 print("absolute error estimator for current mu =", self.reduced_problem.estimate_error())
 
             # Carry out the actual greedy search
+            evaluations = [0]
+
             def solve_and_estimate_error(mu):
                 self.reduced_problem.set_mu(mu)
                 self.reduced_problem.solve()
                 error_estimator = self.reduced_problem.estimate_error()
                 logger.log(DEBUG, "Error estimator for mu = " + str(mu) + " is " + str(error_estimator))
+                evaluations[0] += 1
                 return error_estimator
 
+            def solve_and_estimate_error_batch(mus):
+                error_estimators = self.reduced_problem.estimate_error_batch(mus)
+                for (mu, error_estimator) in zip(mus, error_estimators):
+                    logger.log(DEBUG, "Error estimator for mu = " + str(mu) + " is " + str(error_estimator))
+                evaluations[0] += len(mus)
+                return error_estimators
+
             if self.reduced_problem.N == 0:
                 print("find initial mu")
             else:
                 print("find next mu")
 
-            return self.training_set.max(solve_and_estimate_error)
+            if self.greedy_batch_size > 1:
+                assert self.greedy_saturation_constant is None, (
+                    "Lazy greedy requires that a single parameter is selected at each iteration")
+                if self.greedy_chunk_size is None:
+                    (error_estimators, indices) = self.training_set.diverse_max(
+                        solve_and_estimate_error, self.greedy_batch_size, self.greedy_batch_min_distance)
+                else:
+                    (error_estimators, indices) = self.training_set.diverse_max(
+                        solve_and_estimate_error_batch, self.greedy_batch_size, self.greedy_batch_min_distance,
+                        self.greedy_chunk_size)
+                self._greedy_batch = [
+                    (error_estimator, self.training_set[i]) for (error_estimator, i) in zip(error_estimators, indices)]
+                return (error_estimators[0], indices[0])
+            elif self.greedy_saturation_constant is None:
+                if self.greedy_chunk_size is None:
+                    output = self.training_set.max(solve_and_estimate_error)
+                else:
+                    output = self.training_set.chunked_max(solve_and_estimate_error_batch, self.greedy_chunk_size)
+                if (self.training_set.distributed_max
+                        and self.training_set.dynamic_load_balancing_chunk_size is not None):
+                    busy_times = self.training_set.gather_busy_times()
+                    print("greedy search busy time per process: min =", min(busy_times), "max =", max(busy_times))
+                return output
+            else:
+                if (self._greedy_previous_error_estimators is None
+                        or len(self._greedy_previous_error_estimators) != len(self.training_set)):
+                    self._greedy_previous_error_estimators = full(len(self.training_set), inf)
+                if self.greedy_chunk_size is None:
+                    output = self.training_set.lazy_max(
+                        solve_and_estimate_error, self._greedy_previous_error_estimators,
+                        self.greedy_saturation_constant)
+                else:
+                    output = self.training_set.lazy_max(
+                        solve_and_estimate_error_batch, self._greedy_previous_error_estimators,
+                        self.greedy_saturation_constant, self.greedy_chunk_size)
+                if self.training_set.distributed_max:
+                    evaluations[0] = self.training_set.mpi_comm.allreduce(evaluations[0])
+                print("lazy greedy skipped", len(self.training_set) - evaluations[0], "out of",
+                      len(self.training_set), "error estimator evaluations")
+                return output
 
         def error_analysis(self, N_generator=None, filename=None, **kwargs):
             """
@@ -314,8 +658,17 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
 
                 self.reduced_problem.set_mu(mu)
 
-                for (n_int, n_arg) in N_generator_items():
-                    self.reduced_problem.solve(n_arg, **kwargs)
+                # Solve for all dimensions from a single factorization, if the reduced problem allows it
+                nested_solutions = NotImplemented
+                if all(isinstance(n_arg, int) for (_, n_arg) in N_generator_items()):
+                    nested_solutions = self.reduced_problem._solve_nested_and_cache(
+                        [n_arg for (_, n_arg) in N_generator_items()], **kwargs)
+
+                for (n_index, (n_int, n_arg)) in enumerate(N_generator_items()):
+                    if nested_solutions is not NotImplemented:
+                        self.reduced_problem._solution = nested_solutions[n_index]
+                    else:
+                        self.reduced_problem.solve(n_arg, **kwargs)
                     error = self.reduced_problem.compute_error(**kwargs)
                     if len(components) > 1:
                         error[all_components_string] = sqrt(
@@ -7,7 +7,7 @@
 import os
 from abc import ABCMeta, abstractmethod
 from rbnics.sampling import ParameterSpaceSubset
-from rbnics.utils.io import Folders
+from rbnics.utils.io import Folders, OfflineCheckpointIO
 
 
 # Implementation of a class containing an offline/online decomposition of ROM for parametrized problems
@@ -26,6 +26,8 @@ class ReductionMethod(object, metaclass=ABCMeta):
         self.training_set = ParameterSpaceSubset()
         # I/O
         self.folder["training_set"] = os.path.join(self.folder_prefix, "training_set")
+        # Content of the consistency manifest of an interrupted offline stage, which is being resumed
+        self._offline_checkpoint = None
 
         # $$ ERROR ANALYSIS AND SPEEDUP ANALYSIS DATA STRUCTURES $$ #
         # Testing set
@@ -83,6 +85,31 @@ class ReductionMethod(object, metaclass=ABCMeta):
             self.testing_set.save(self.folder["testing_set"], "testing_set")
         return import_successful
 
+    # Load the consistency manifest of a previous offline stage, if available
+    def _load_offline_checkpoint(self):
+        if OfflineCheckpointIO.exists_file(self.folder_prefix, "offline_checkpoint"):
+            return OfflineCheckpointIO.load_file(self.folder_prefix, "offline_checkpoint")
+        else:
+            return None
+
+    # Save the consistency manifest of the offline stage: if the offline stage is not complete, state contains
+    # the data required to resume it (or None, if the offline stage should be restarted from scratch)
+    def _save_offline_checkpoint(self, complete, state=None):
+        assert not complete or state is None
+        OfflineCheckpointIO.save_file({"complete": complete, "state": state}, self.folder_prefix, "offline_checkpoint")
+
+    # Decide whether the offline stage should be carried out, possibly resuming it from a checkpoint
+    def _need_to_do_offline_stage(self, at_least_one_required_folder_created):
+        self._offline_checkpoint = None
+        if at_least_one_required_folder_created:
+            return True  # offline construction should be carried out from scratch
+        checkpoint = self._load_offline_checkpoint()
+        if checkpoint is None or checkpoint["complete"]:
+            return False  # offline construction should be skipped, since data are already available
+        else:
+            self._offline_checkpoint = checkpoint["state"]  # None if no iteration was completed
+            return True  # offline construction should be resumed
+
     # Perform the offline phase of the reduced order model
     @abstractmethod
     def offline(self):
@@ -108,16 +108,16 @@ def TimeDependentPODGalerkinReduction(DifferentialProblemReductionMethod_Derived
             if self.nested_POD:
                 if len(self.truth_problem.components) > 1:
                     for component in self.truth_problem.components:
-                        (eigs1, basis_functions1) = self._nested_POD_compress_time_trajectory(
-                            snapshot_over_time, component=component)
-                        self.POD[component].store_snapshot(
-                            basis_functions1, weight=[sqrt(e) for e in eigs1], component=component)
+                        self.POD[component].merge(
+                            self._nested_POD_compress_time_trajectory(snapshot_over_time, component=component))
                 else:
-                    (eigs1, basis_functions1) = self._nested_POD_compress_time_trajectory(snapshot_over_time)
-                    self.POD.store_snapshot(basis_functions1, weight=[sqrt(e) for e in eigs1])
+                    self.POD.merge(self._nested_POD_compress_time_trajectory(snapshot_over_time))
             else:
                 DifferentialProblemReductionMethod_DerivedClass.update_snapshots_matrix(self, snapshot_over_time)
 
+        # Compress the time trajectory, so that the resulting POD can be merged in the POD over the parameter
+        # dependence as a leaf of a hierarchical approximate POD. The energy discarded by the compression
+        # is accounted for in the relative error bound of the POD over the parameter dependence.
         def _nested_POD_compress_time_trajectory(self, snapshot_over_time, component=None):
             N1 = self.N1
             if component is None:
@@ -128,7 +128,7 @@ def TimeDependentPODGalerkinReduction(DifferentialProblemReductionMethod_Derived
                 tol1 = self.tol1[component]
             POD_time_trajectory.clear()
             POD_time_trajectory.store_snapshot(snapshot_over_time, component=component)
-            (eigs1, _, basis_functions1, N1) = POD_time_trajectory.apply(N1, tol1)
+            N1 = POD_time_trajectory.compress(N1, tol1)
             POD_time_trajectory.print_eigenvalues(N1)
             if component is None:
                 POD_time_trajectory.save_eigenvalues_file(self.folder["post_processing"], "eigs")
@@ -138,7 +138,7 @@ def TimeDependentPODGalerkinReduction(DifferentialProblemReductionMethod_Derived
                     self.folder["post_processing"], "eigs_" + component)
                 POD_time_trajectory.save_retained_energy_file(
                     self.folder["post_processing"], "retained_energy_" + component)
-            return (eigs1, basis_functions1)
+            return POD_time_trajectory
 
         # Compute the error of the reduced order approximation with respect to the full order one
         # over the testing set
@@ -148,6 +148,14 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
             # Return
             return output
 
+        # Restore basis functions when resuming an interrupted offline stage
+        def _restore_basis_functions(self, state):
+            if self.POD_greedy_basis_extension == "POD":
+                # The POD of previous basis extensions is required to carry on, but it is not saved to file
+                self._replay_basis_functions(state)
+            else:
+                DifferentialProblemReductionMethod_DerivedClass._restore_basis_functions(self, state)
+
         # Update basis matrix by POD-Greedy
         def update_basis_matrix(self, snapshot_over_time):
             if self.POD_greedy_basis_extension == "orthogonal":
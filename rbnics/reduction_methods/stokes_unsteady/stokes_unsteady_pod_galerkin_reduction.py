@@ -4,7 +4,6 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
-from math import sqrt
 from rbnics.backends import ProperOrthogonalDecomposition
 from rbnics.utils.decorators import ReductionMethodFor
 from rbnics.problems.stokes_unsteady.stokes_unsteady_problem import StokesUnsteadyProblem
@@ -48,15 +47,11 @@ def AbstractCFDUnsteadyPODGalerkinReduction(
 
             if self.nested_POD:
                 for component in ("u", "p"):
-                    (eigs1, basis_functions1) = self._nested_POD_compress_time_trajectory(
-                        snapshot_over_time, component=component)
-                    self.POD[component].store_snapshot(
-                        basis_functions1, weight=[sqrt(e) for e in eigs1], component=component)
+                    self.POD[component].merge(
+                        self._nested_POD_compress_time_trajectory(snapshot_over_time, component=component))
                 for component in ("s", ):
-                    (eigs1, basis_functions1) = self._nested_POD_compress_time_trajectory(
-                        supremizer_over_time, component=component)
-                    self.POD[component].store_snapshot(
-                        basis_functions1, weight=[sqrt(e) for e in eigs1])
+                    self.POD[component].merge(
+                        self._nested_POD_compress_time_trajectory(supremizer_over_time, component=component))
             else:
                 # Call the steady method, which will add all snapshots and supremizers
                 AbstractCFDPODGalerkinReduction.update_snapshots_matrix(
@@ -4,6 +4,7 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+from numpy import array, round
 from rbnics.sampling.distributions.distribution import Distribution
 
 
@@ -14,11 +15,6 @@ class DiscreteDistribution(Distribution):
 
     def sample(self, box, n):
         assert len(box) == len(self.box_step_size)
-        set_ = self.distribution.sample(box, n)
-        rounded_set = list()
-        for mu in set_:
-            rounded_mu = list()
-            for (p, step_size) in enumerate(self.box_step_size):
-                rounded_mu.append(round(mu[p] / step_size) * step_size)
-            rounded_set.append(tuple(rounded_mu))
-        return rounded_set
+        set_ = array(self.distribution.sample(box, n), dtype=float)
+        step_size = array(self.box_step_size, dtype=float)
+        return round(set_ / step_size) * step_size
@@ -8,6 +8,8 @@ from abc import ABCMeta, abstractmethod
 
 
 class Distribution(object, metaclass=ABCMeta):
+    # Return a (n x P) array, where P is the length of box. Lists of n tuples are also accepted
+    # for backward compatibility
     @abstractmethod
     def sample(self, box, n):
         raise NotImplementedError("The method sample is distribution-specific and needs to be overridden.")
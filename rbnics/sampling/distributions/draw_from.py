@@ -4,6 +4,7 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+from numpy import array, shape
 from rbnics.sampling.distributions.distribution import Distribution
 
 
@@ -14,10 +15,13 @@ class DrawFrom(Distribution):
         self.kwargs = kwargs
 
     def sample(self, box, n):
-        set_ = list()  # of tuples
-        for i in range(n):
-            mu = list()  # of numbers
-            for box_p in box:
-                mu.append(box_p[0] + self.generator(*self.args, **self.kwargs) * (box_p[1] - box_p[0]))
-            set_.append(tuple(mu))
-        return set_
+        box = array(box, dtype=float)
+        # Draw all random numbers at once if the generator supports the size keyword argument,
+        # as numpy.random and scipy.stats generators do
+        try:
+            unit_set = self.generator(*self.args, size=(n, len(box)), **self.kwargs)
+        except TypeError:
+            unit_set = None
+        if unit_set is None or shape(unit_set) != (n, len(box)):
+            unit_set = [[self.generator(*self.args, **self.kwargs) for _ in box] for _ in range(n)]
+        return box[:, 0] + array(unit_set, dtype=float) * (box[:, 1] - box[:, 0])
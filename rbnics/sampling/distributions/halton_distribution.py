@@ -0,0 +1,29 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import array, random
+from scipy.stats import qmc
+from rbnics.sampling.distributions.distribution import Distribution
+
+
+class HaltonDistribution(Distribution):
+    """
+    Halton low-discrepancy sequence.
+
+    :param scramble: whether to scramble the sequence, which improves its uniformity in high dimensions.
+    :param seed: seed of the scrambling. If not provided, it is drawn from numpy.random, so that numpy.random.seed
+        controls reproducibility as for the other random distributions.
+    """
+
+    def __init__(self, scramble=True, seed=None):
+        self.scramble = scramble
+        self.seed = seed
+
+    def sample(self, box, n):
+        box = array(box, dtype=float)
+        seed = self.seed if self.seed is not None else random.randint(2**32)
+        sampler = qmc.Halton(d=len(box), scramble=self.scramble, seed=seed)
+        return qmc.scale(sampler.random(n), box[:, 0], box[:, 1])
@@ -0,0 +1,28 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import array, random
+from scipy.stats import qmc
+from rbnics.sampling.distributions.distribution import Distribution
+
+
+class LatinHypercubeDistribution(Distribution):
+    """
+    Latin hypercube sampling: each parameter component range is divided in n intervals of equal size,
+    and each interval contains exactly one sample.
+
+    :param seed: seed of the random permutations. If not provided, it is drawn from numpy.random, so that
+        numpy.random.seed controls reproducibility as for the other random distributions.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed
+
+    def sample(self, box, n):
+        box = array(box, dtype=float)
+        seed = self.seed if self.seed is not None else random.randint(2**32)
+        sampler = qmc.LatinHypercube(d=len(box), seed=seed)
+        return qmc.scale(sampler.random(n), box[:, 0], box[:, 1])
@@ -0,0 +1,30 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import array, random
+from scipy.stats import qmc
+from rbnics.sampling.distributions.distribution import Distribution
+
+
+class SobolDistribution(Distribution):
+    """
+    Sobol low-discrepancy sequence. Sets with a number of points which is a power of 2 have the best uniformity
+    properties.
+
+    :param scramble: whether to scramble the sequence (Owen scrambling).
+    :param seed: seed of the scrambling. If not provided, it is drawn from numpy.random, so that numpy.random.seed
+        controls reproducibility as for the other random distributions.
+    """
+
+    def __init__(self, scramble=True, seed=None):
+        self.scramble = scramble
+        self.seed = seed
+
+    def sample(self, box, n):
+        box = array(box, dtype=float)
+        seed = self.seed if self.seed is not None else random.randint(2**32)
+        sampler = qmc.Sobol(d=len(box), scramble=self.scramble, seed=seed)
+        return qmc.scale(sampler.random(n), box[:, 0], box[:, 1])
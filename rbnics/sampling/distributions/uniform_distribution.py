@@ -4,16 +4,12 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
-from numpy import random
+from numpy import array, random
 from rbnics.sampling.distributions.distribution import Distribution
 
 
 class UniformDistribution(Distribution):
     def sample(self, box, n):
-        set_ = list()  # of tuples
-        for i in range(n):
-            mu = list()  # of numbers
-            for box_p in box:
-                mu.append(random.uniform(box_p[0], box_p[1]))
-            set_.append(tuple(mu))
-        return set_
+        box = array(box, dtype=float)
+        # Random numbers are drawn in the same order as sampling one parameter at a time
+        return random.uniform(box[:, 0], box[:, 1], size=(n, len(box)))
@@ -4,22 +4,181 @@
 #
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
-import operator  # to find closest parameters
-from math import sqrt
-from mpi4py.MPI import COMM_WORLD
+import hashlib
+from heapq import heapify, heappop
+from logging import DEBUG, getLogger
+from time import time
+from mpi4py.MPI import COMM_WORLD, INT64_T, LOCK_SHARED, SUM, Win
 from numpy import zeros as array
-from numpy import argmax
+from numpy import argmax, array as numpy_array, asarray, concatenate, inf, int64, log, ones, zeros
+from numpy.linalg import norm
+from scipy.spatial import cKDTree
 from rbnics.sampling.distributions import CompositeDistribution, UniformDistribution
 from rbnics.utils.decorators import overload
 from rbnics.utils.io import ExportableList
+from rbnics.utils.io.numpy_io import NumpyIO
+from rbnics.utils.io.text_io import TextIO
 from rbnics.utils.mpi import parallel_io as parallel_generate, parallel_max
 
+logger = getLogger("rbnics/sampling/parameter_space_subset.py")
 
-class ParameterSpaceSubset(ExportableList):  # equivalent to a list of tuples
+
+class ParameterSpaceSubset(ExportableList):  # equivalent to a list of tuples, stored as a (n x P) array
     def __init__(self):
-        ExportableList.__init__(self, "text")
+        self._array = zeros((0, 0))
+        self._list_view = None  # list of tuples view of self._array, lazily created
+        self._version = 0  # incremented at every change to the set other than appending new parameters
+        self._index = None  # spatial index, lazily (re)built by closest() after any change to the set
+        ExportableList.__init__(self, "numpy")
         self.mpi_comm = COMM_WORLD
         self.distributed_max = True
+        self.dynamic_load_balancing_chunk_size = None
+        self.busy_time = 0.  # time spent by the current process in the last maximum computation
+        self.metric_weights = None
+        self.metric_log_scaled = None
+
+    @property
+    def _list(self):
+        if self._list_view is None:
+            self._list_view = [tuple(mu) for mu in self._array.tolist()]
+        return self._list_view
+
+    @_list.setter
+    def _list(self, parameters):
+        self._array = self._to_array(parameters)
+        self._list_view = None
+        self._version += 1
+        self._index = None
+
+    @staticmethod
+    def _to_array(parameters):
+        """
+        Internal method.
+
+        :param parameters: a list of parameters (tuples), or a (n x P) array.
+        :return: a copy of the parameters, as a (n x P) array.
+        """
+        if len(parameters) == 0:
+            return zeros((0, 0))
+        else:
+            parameters = numpy_array(parameters, dtype=float)
+            assert len(parameters.shape) == 2
+            return parameters
+
+    def to_array(self):
+        """
+        :return: the parameters in this set, as a (n x P) array. The array must not be modified in-place.
+        """
+        return self._array
+
+    def content_hash(self):
+        """
+        :return: a string identifying the parameters in this set and their order, e.g. to check that the set
+            used by another run (possibly saved to file) is the same as the current one.
+        """
+        return hashlib.sha1(str(self._array.shape).encode("utf-8")
+                            + self._array.astype(float).tobytes(order="C")).hexdigest()
+
+    def set_metric(self, weights=None, log_scaled=None):
+        """
+        Set the metric used to compute distances between parameters, e.g. in closest(). Distances are
+        Euclidean distances between transformed parameters, where the p-th component mu_p is transformed into
+        weights[p] * mu_p, or into weights[p] * log(mu_p) if log_scaled[p] is True.
+
+        :param weights: list of weights for each parameter component (anisotropic metric). Defaults to all ones.
+        :param log_scaled: list of booleans, True for parameter components which should be log-scaled.
+            Defaults to all False.
+        """
+        self.metric_weights = weights
+        self.metric_log_scaled = log_scaled
+        self._index = None
+
+    def _copy_metric_to(self, output):
+        output.metric_weights = self.metric_weights
+        output.metric_log_scaled = self.metric_log_scaled
+
+    def _transform(self, parameters):
+        """
+        Internal method.
+
+        :param parameters: a list of parameters (or a single parameter).
+        :return: a (list of) parameters transformed so that the metric becomes the Euclidean one.
+        """
+        parameters = asarray(parameters, dtype=float)
+        if self.metric_log_scaled is not None:
+            assert len(self.metric_log_scaled) == parameters.shape[-1]
+            parameters = parameters.copy()
+            for (p, log_scaled) in enumerate(self.metric_log_scaled):
+                if log_scaled:
+                    parameters[..., p] = log(parameters[..., p])
+        if self.metric_weights is not None:
+            assert len(self.metric_weights) == parameters.shape[-1]
+            parameters = parameters * asarray(self.metric_weights, dtype=float)
+        return parameters
+
+    def _distance(self, mu, nu):
+        return norm(self._transform(mu) - self._transform(nu))
+
+    def append(self, element):
+        self.extend([element])
+
+    def extend(self, other_list):
+        if isinstance(other_list, ParameterSpaceSubset):
+            other_array = other_list._array
+        else:
+            other_array = self._to_array(other_list)
+        if len(other_array) == 0:
+            return
+        elif len(self._array) == 0:
+            self._array = other_array.copy()
+        else:
+            self._array = concatenate((self._array, other_array))
+        if self._list_view is not None:
+            self._list_view.extend(tuple(mu) for mu in other_array.tolist())
+        self._index = None
+
+    def clear(self):
+        self._list = list()
+
+    def save(self, directory, filename):
+        # Only append to file the parameters which have been added since the previous save to the same file,
+        # provided that the previously saved parameters have not been changed
+        (version, length) = self._saved.get((str(directory), filename), (None, None))
+        if (
+            version == self._version
+            and 0 < length < len(self)
+            and NumpyIO.append_file(self._array[:length], self._array[length:], directory, filename)
+        ):
+            pass
+        else:
+            NumpyIO.save_file(self._array, directory, filename)
+        self._saved[str(directory), filename] = (self._version, len(self))
+
+    # Returns False if the set had been already imported so no further action was needed.
+    # Returns True if it was possible to import the set, either from a binary file or from the
+    # text file used by previous versions.
+    # Raises an error if it was not possible to import the set.
+    def load(self, directory, filename):
+        if len(self) > 0:  # avoid loading multiple times
+            return False
+        if NumpyIO.exists_file(directory, filename):
+            self._list = NumpyIO.load_file(directory, filename)
+        elif TextIO.exists_file(directory, filename):
+            self._list = TextIO.load_file(directory, filename)
+        else:
+            raise OSError
+        self._saved[str(directory), filename] = (self._version, len(self))
+        return True
+
+    def __setitem__(self, key, item):
+        self._array[key] = item
+        if self._list_view is not None:
+            self._list_view[key] = tuple(self._array[key].tolist())
+        self._version += 1
+        self._index = None
+
+    def __len__(self):
+        return len(self._array)
 
     @overload
     def __getitem__(self, key: int):
@@ -29,7 +188,9 @@ class ParameterSpaceSubset(ExportableList):  # equivalent to a list of tuples
     def __getitem__(self, key: slice):
         output = ParameterSpaceSubset()
         output.distributed_max = self.distributed_max
-        output._list = self._list[key]
+        output.dynamic_load_balancing_chunk_size = self.dynamic_load_balancing_chunk_size
+        self._copy_metric_to(output)
+        output._list = self._array[key]
         return output
 
     # Method for generation of parameter space subsets
@@ -46,28 +207,202 @@ class ParameterSpaceSubset(ExportableList):  # equivalent to a list of tuples
 
             self._list = parallel_generate(run_sampling, self.mpi_comm)
         else:
-            for i in range(n):
-                self._list.append(tuple())
+            self._array = zeros((n, 0))
+            self._list_view = None
+            self._version += 1
+            self._index = None
 
     def max(self, generator, postprocessor=None):
+        (values, local_list_indices) = self._compute_local_values(generator)
+        return self._max(values, local_list_indices, postprocessor)
+
+    def chunked_max(self, generator, chunk_size, postprocessor=None):
+        """
+        Same as max(), but the generator is called on chunks of (at most) chunk_size parameters at once,
+        and is expected to return an array containing its value for each parameter in the chunk.
+        """
+        assert chunk_size > 0
+        (values, local_list_indices) = self._compute_local_values(generator, chunk_size)
+        return self._max(values, local_list_indices, postprocessor)
+
+    def diverse_max(self, generator, batch_size, min_distance=0., chunk_size=None, postprocessor=None):
+        """
+        Same as max() (or chunked_max(), if chunk_size is provided), but returning up to batch_size parameters
+        with the largest values. Parameters are selected in decreasing order of value, discarding those which are
+        closer than min_distance to an already selected parameter, so that the selected parameters are diverse.
+
+        :return: list of max values and list of the respective indices, in decreasing order of value.
+        """
+        assert batch_size > 0
+        assert min_distance >= 0.
         if postprocessor is None:
             def postprocessor(value):
                 return value
+        (values, local_list_indices) = self._compute_local_values(generator, chunk_size)
+        values_and_indices = list(zip(values, local_list_indices))
         if self.distributed_max:
-            local_list_indices = list(range(self.mpi_comm.rank, len(self._list), self.mpi_comm.size))
-            # start from index rank and take steps of length equal to size
+            values_and_indices = [
+                value_and_index for local_values_and_indices in self.mpi_comm.allgather(values_and_indices)
+                for value_and_index in local_values_and_indices]
+        values_and_indices.sort(key=lambda value_and_index: postprocessor(value_and_index[0]), reverse=True)
+        (batch_values, batch_indices) = (list(), list())
+        for (value, i) in values_and_indices:
+            if len(batch_indices) == batch_size:
+                break
+            if all(self._distance(self._list[i], self._list[j]) >= min_distance for j in batch_indices):
+                batch_values.append(value)
+                batch_indices.append(i)
+        return (batch_values, batch_indices)
+
+    def lazy_max(self, generator, previous_values, saturation_constant, chunk_size=None):
+        """
+        Same as max(), but assuming that, for each parameter, the current value of the (non-negative) generator
+        is at most saturation_constant times its previous value. Parameters are evaluated in decreasing order
+        of such upper bound, until the maximum is confirmed: parameters whose upper bound is lower than the
+        current maximum are not evaluated at all.
+
+        :param generator: function to be maximized. If chunk_size is provided, it is called on chunks of (at most)
+            chunk_size parameters at once, and is expected to return an array of values.
+        :param previous_values: array of previous values of the generator (or infinity, if not available) for
+            each parameter in this set. It is updated in-place with the values computed by this method.
+        :param saturation_constant: saturation constant.
+        :param chunk_size: (optional) number of parameters for which the generator is evaluated at once.
+        :return: max value and the respective index.
+        """
+        assert len(previous_values) == len(self._list)
+        assert saturation_constant > 0
+        assert chunk_size is None or chunk_size > 0
+        heap = [(- saturation_constant * previous_values[i], i) for i in self._local_list_indices()]
+        heapify(heap)
+        (local_value_max, local_i_max) = (None, None)
+        while len(heap) > 0 and (local_i_max is None or - heap[0][0] > local_value_max):
+            if chunk_size is None:
+                (_, i) = heappop(heap)
+                previous_values[i] = generator(self._list[i])
+                chunk_indices = [i]
+            else:
+                chunk_indices = list()
+                while (len(heap) > 0 and len(chunk_indices) < chunk_size
+                       and (local_i_max is None or - heap[0][0] > local_value_max)):
+                    chunk_indices.append(heappop(heap)[1])
+                chunk_values = generator([self._list[i] for i in chunk_indices])
+                assert len(chunk_values) == len(chunk_indices)
+                for (i, value) in zip(chunk_indices, chunk_values):
+                    previous_values[i] = value
+            for i in chunk_indices:
+                if local_i_max is None or previous_values[i] > local_value_max:
+                    (local_value_max, local_i_max) = (previous_values[i], i)
+        if self.distributed_max:
+            def postprocessor_or_lowest(value):
+                return value if value is not None else - inf
+
+            (global_value_max, global_i_max) = parallel_max(
+                local_value_max, (local_i_max, ), postprocessor_or_lowest, self.mpi_comm)
+            assert isinstance(global_i_max, tuple)
+            assert len(global_i_max) == 1
+            global_i_max = global_i_max[0]
         else:
-            local_list_indices = list(range(len(self._list)))
+            (global_value_max, global_i_max) = (local_value_max, local_i_max)
+        return (global_value_max, global_i_max)
+
+    def _compute_local_values(self, generator, chunk_size=None):
+        """
+        Internal method. Evaluate the generator on the parameters assigned to the current process,
+        either statically (round-robin) or dynamically (if enabled by set_dynamic_load_balancing()).
+
+        :return: values of the generator and the respective indices.
+        """
+        start = time()
+        if self.distributed_max and self.dynamic_load_balancing_chunk_size is not None:
+            (values, local_list_indices) = self._dynamic_local_values(generator, chunk_size)
+        else:
+            local_list_indices = self._local_list_indices()
+            values = self._local_values(generator, local_list_indices, chunk_size)
+        self.busy_time = time() - start
+        logger.log(DEBUG, "Evaluated " + str(len(local_list_indices)) + " parameters in " + str(self.busy_time)
+                   + " seconds on process " + str(self.mpi_comm.rank))
+        return (values, local_list_indices)
+
+    def _dynamic_local_values(self, generator, chunk_size=None):
+        """
+        Internal method. Parameters are assigned in chunks of dynamic_load_balancing_chunk_size consecutive
+        parameters to processes as soon as they finish their previous chunk. The next chunk is obtained by
+        an atomic increment of a counter stored on the first process, so that no process acts as a master.
+        """
+        scheduler_chunk_size = self.dynamic_load_balancing_chunk_size
+        counter_size = INT64_T.Get_size()
+        counter = Win.Allocate(counter_size if self.mpi_comm.rank == 0 else 0, counter_size, comm=self.mpi_comm)
+        if self.mpi_comm.rank == 0:
+            counter.Lock(0)
+            counter.Put(zeros(1, dtype=int64), 0)
+            counter.Unlock(0)
+        self.mpi_comm.Barrier()
+        (values, local_list_indices) = (list(), list())
+        (increment, chunk_id) = (ones(1, dtype=int64), zeros(1, dtype=int64))
+        while True:
+            counter.Lock(0, LOCK_SHARED)
+            counter.Fetch_and_op(increment, chunk_id, 0, op=SUM)
+            counter.Unlock(0)
+            chunk_begin = int(chunk_id[0]) * scheduler_chunk_size
+            if chunk_begin >= len(self):
+                break
+            chunk_indices = list(range(chunk_begin, min(chunk_begin + scheduler_chunk_size, len(self))))
+            values.append(self._local_values(generator, chunk_indices, chunk_size))
+            local_list_indices.extend(chunk_indices)
+        counter.Free()
+        if len(values) > 0:
+            values = concatenate(values)
+        else:
+            values = array(0)
+        return (values, local_list_indices)
+
+    def gather_busy_times(self):
+        """
+        Collect the time spent by each process in the last maximum computation. Must be called by all processes.
+
+        :return: list of times, one for each process.
+        """
+        return self.mpi_comm.allgather(self.busy_time)
+
+    def _local_values(self, generator, local_list_indices, chunk_size=None):
         values = array(len(local_list_indices))
+        if chunk_size is None:
+            for i in range(len(local_list_indices)):
+                values[i] = generator(self._list[local_list_indices[i]])
+        else:
+            for chunk_begin in range(0, len(local_list_indices), chunk_size):
+                chunk_indices = local_list_indices[chunk_begin:chunk_begin + chunk_size]
+                chunk_values = generator([self._list[i] for i in chunk_indices])
+                assert len(chunk_values) == len(chunk_indices)
+                values[chunk_begin:chunk_begin + len(chunk_indices)] = chunk_values
+        return values
+
+    def _local_list_indices(self):
+        if self.distributed_max:
+            return list(range(self.mpi_comm.rank, len(self._list), self.mpi_comm.size))
+            # start from index rank and take steps of length equal to size
+        else:
+            return list(range(len(self._list)))
+
+    def _max(self, values, local_list_indices, postprocessor=None):
+        if postprocessor is None:
+            def postprocessor(value):
+                return value
         values_with_postprocessing = array(len(local_list_indices))
         for i in range(len(local_list_indices)):
-            values[i] = generator(self._list[local_list_indices[i]])
             values_with_postprocessing[i] = postprocessor(values[i])
         if self.distributed_max:
-            local_i_max = argmax(values_with_postprocessing)
-            local_value_max = values[local_i_max]
+            if len(local_list_indices) > 0:
+                local_i_max = argmax(values_with_postprocessing)
+                (local_value_max, local_i_max) = (values[local_i_max], local_list_indices[local_i_max])
+            else:  # dynamic load balancing did not assign any parameter to this process
+                (local_value_max, local_i_max) = (None, None)
+
+            def postprocessor_or_lowest(value):
+                return postprocessor(value) if value is not None else - inf
+
             (global_value_max, global_i_max) = parallel_max(
-                local_value_max, local_list_indices[local_i_max], postprocessor, self.mpi_comm)
+                local_value_max, (local_i_max, ), postprocessor_or_lowest, self.mpi_comm)
             assert isinstance(global_i_max, tuple)
             assert len(global_i_max) == 1
             global_i_max = global_i_max[0]
@@ -79,9 +414,23 @@ class ParameterSpaceSubset(ExportableList):  # equivalent to a list of tuples
     def serialize_maximum_computations(self):
         self.distributed_max = False
 
+    def set_dynamic_load_balancing(self, chunk_size=1):
+        """
+        Assign parameters to processes dynamically in distributed maximum computations (except lazy_max()),
+        rather than with a static round-robin distribution. This is helpful when the evaluation cost largely
+        varies with the parameter, e.g. for nonlinear problems.
+
+        :param chunk_size: number of consecutive parameters assigned at once. Use None to disable.
+        """
+        assert chunk_size is None or chunk_size > 0
+        self.dynamic_load_balancing_chunk_size = chunk_size
+
     def diff(self, other_set):
         output = ParameterSpaceSubset()
         output.distributed_max = self.distributed_max
+        output.dynamic_load_balancing_chunk_size = self.dynamic_load_balancing_chunk_size
+        self._copy_metric_to(output)
+        other_set = set(other_set)
         output._list = [mu for mu in self._list if mu not in other_set]
         return output
 
@@ -95,15 +444,22 @@ class ParameterSpaceSubset(ExportableList):  # equivalent to a list of tuples
 
         output = ParameterSpaceSubset()
         output.distributed_max = self.distributed_max
+        output.dynamic_load_balancing_chunk_size = self.dynamic_load_balancing_chunk_size
+        self._copy_metric_to(output)
 
         # Trivial case 2:
         if M == 0:
             return output
 
-        parameters_and_distances = list()
-        for xi_i in self:
-            distance = sqrt(sum([(x - y)**2 for (x, y) in zip(mu, xi_i)]))
-            parameters_and_distances.append((xi_i, distance))
-        parameters_and_distances.sort(key=operator.itemgetter(1))
-        output._list = [xi_i for (xi_i, _) in parameters_and_distances[:M]]
+        # Trivial case 3: all parameters are at zero distance
+        if len(mu) == 0:
+            output._list = self._array[:M]
+            return output
+
+        if self._index is None:
+            self._index = cKDTree(self._transform(self._array))
+        (_, indices) = self._index.query(self._transform(mu), k=M)
+        if M == 1:
+            indices = [indices]
+        output._list = self._array[indices]
         return output
@@ -34,6 +34,9 @@ class SCMApproximation(ParametrizedProblem):
         self.training_set = None  # SCM algorithm needs the training set also in the online stage
         # greedy_selected_parameters: list storing the parameters selected during the training phase
         self.greedy_selected_parameters = GreedySelectedParametersList()
+        # greedy_selected_parameters_subset: dict, over N, of list storing the first N parameters
+        # selected during the training phase (cached to avoid rebuilding their spatial index at every query)
+        self.greedy_selected_parameters_subset = dict()
         # greedy_selected_parameters_complement: dict, over N, of list storing the complement of parameters
         # selected during the training phase
         self.greedy_selected_parameters_complement = dict()
@@ -164,16 +167,16 @@ class SCMApproximation(ParametrizedProblem):
         # 2a. Add constraints: a constraint is added for the closest samples to mu among the selected parameters
         mu_bak = self.mu
         closest_selected_parameters = self._closest_selected_parameters(M_e, N, self.mu)
+        # Compute theta for all closest samples at once
+        closest_selected_parameters_theta = self.truth_problem._compute_theta_batch(
+            "stability_factor_left_hand_matrix", closest_selected_parameters)
         for (j, omega) in enumerate(closest_selected_parameters):
             # Overwrite parameter values
             self.set_mu(omega)
 
-            # Compute theta
-            current_theta = self.truth_problem.compute_theta("stability_factor_left_hand_matrix")
-
             # Assemble the LHS of the constraint
             for q in range(Q):
-                constraints_matrix[j, q] = current_theta[q]
+                constraints_matrix[j, q] = closest_selected_parameters_theta[j, q]
 
             # Assemble the RHS of the constraint: note that computations for this call may be already cached
             (constraints_vector[j], _) = self.evaluate_stability_factor()
@@ -183,16 +186,16 @@ class SCMApproximation(ParametrizedProblem):
         #                      with RHS depending on previously computed lower bounds
         mu_bak = self.mu
         closest_selected_parameters_complement = self._closest_unselected_parameters(M_p, N, self.mu)
+        # Compute theta for all closest points at once
+        closest_selected_parameters_complement_theta = self.truth_problem._compute_theta_batch(
+            "stability_factor_left_hand_matrix", closest_selected_parameters_complement)
         for (j, nu) in enumerate(closest_selected_parameters_complement):
             # Overwrite parameter values
             self.set_mu(nu)
 
-            # Compute theta
-            current_theta = self.truth_problem.compute_theta("stability_factor_left_hand_matrix")
-
             # Assemble the LHS of the constraint
             for q in range(Q):
-                constraints_matrix[M_e + j, q] = current_theta[q]
+                constraints_matrix[M_e + j, q] = closest_selected_parameters_complement_theta[j, q]
 
             # Assemble the RHS of the constraint: note that computations for this call may be already cached
             if N > 1:
@@ -268,7 +271,9 @@ class SCMApproximation(ParametrizedProblem):
         return hashlib.sha1(str(self._cache_key(N)).encode("utf-8")).hexdigest()
 
     def _closest_selected_parameters(self, M, N, mu):
-        return self.greedy_selected_parameters[:N].closest(M, mu)
+        if N not in self.greedy_selected_parameters_subset:
+            self.greedy_selected_parameters_subset[N] = self.greedy_selected_parameters[:N]
+        return self.greedy_selected_parameters_subset[N].closest(M, mu)
 
     def _closest_unselected_parameters(self, M, N, mu):
         if N not in self.greedy_selected_parameters_complement:
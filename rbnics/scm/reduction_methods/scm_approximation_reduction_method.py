@@ -67,23 +67,30 @@ class SCMApproximationReductionMethod(ReductionMethod):
         # speedup analysis folder is required only in the speedup analysis
         at_least_one_required_folder_created = required_folders.create()
         at_least_one_optional_folder_created = optional_folders.create()  # noqa: F841
-        if not at_least_one_required_folder_created:
+        if not self._need_to_do_offline_stage(at_least_one_required_folder_created):
             return False  # offline construction should be skipped, since data are already available
         else:
             self.SCM_approximation.init("offline")
-            return True  # offline construction should be carried out
+            return True  # offline construction should be carried out (or resumed)
 
     def _offline(self):
         print(TextBox("SCM offline phase begins", fill="="))
         print("")
 
-        # Compute the bounding box \mathcal{B}
-        self.compute_bounding_box()
-        print("")
+        if self._offline_checkpoint is None:
+            self._save_offline_checkpoint(False)
+
+            # Compute the bounding box \mathcal{B}
+            self.compute_bounding_box()
+            print("")
 
-        # Arbitrarily start from the first parameter in the training set
-        self.SCM_approximation.set_mu(self.training_set[0])
-        relative_error_estimator_max = 2. * self.tol
+            # Arbitrarily start from the first parameter in the training set
+            self.SCM_approximation.set_mu(self.training_set[0])
+            relative_error_estimator_max = 2. * self.tol
+        else:
+            # Resume from the last completed iteration
+            relative_error_estimator_max = self._resume_offline()
+            print("")
 
         while self.SCM_approximation.N < self.Nmax and relative_error_estimator_max >= self.tol:
             print(TextLine("SCM N = " + str(self.SCM_approximation.N), fill="~"))
@@ -106,11 +113,65 @@ class SCMApproximationReductionMethod(ReductionMethod):
             print("maximum SCM error estimator =", error_estimator_max)
             print("maximum SCM relative error estimator =", relative_error_estimator_max)
 
+            self._save_offline_checkpoint(False, self._offline_checkpoint_state(relative_error_estimator_max))
+
             print("")
 
+        self._save_offline_checkpoint(True)
+
         print(TextBox("SCM offline phase ends", fill="="))
         print("")
 
+    def _offline_checkpoint_state(self, relative_error_estimator_max):
+        """
+        Internal method.
+
+        :param relative_error_estimator_max: current maximum relative error estimator.
+        :return: the data required to resume the greedy selection from the current iteration.
+        """
+        Q = self.SCM_approximation.truth_problem.Q["stability_factor_left_hand_matrix"]
+        return {
+            "bounding_box_min": [self.SCM_approximation.bounding_box_min[q] for q in range(Q)],
+            "bounding_box_max": [self.SCM_approximation.bounding_box_max[q] for q in range(Q)],
+            "greedy_selected_parameters": list(self.SCM_approximation.greedy_selected_parameters),
+            "upper_bound_vectors": [
+                [float(upper_bound_vector[q]) for q in range(Q)]
+                for upper_bound_vector in self.SCM_approximation.upper_bound_vectors],
+            "greedy_error_estimators": list(self.greedy_error_estimators),
+            "mu": self.SCM_approximation.mu,
+            "relative_error_estimator_max": relative_error_estimator_max
+        }
+
+    def _resume_offline(self):
+        """
+        Internal method. Restore the bounding box, the greedily selected parameters and the upper bound vectors
+        computed by the interrupted greedy, so that neither the bounding box eigenproblems nor the stability
+        factor eigenproblems at the selected parameters need to be solved again.
+
+        :return: the maximum relative error estimator of the last completed iteration.
+        """
+        state = self._offline_checkpoint
+        Q = self.SCM_approximation.truth_problem.Q["stability_factor_left_hand_matrix"]
+        for q in range(Q):
+            self.SCM_approximation.bounding_box_min[q] = state["bounding_box_min"][q]
+            self.SCM_approximation.bounding_box_max[q] = state["bounding_box_max"][q]
+        self.SCM_approximation.bounding_box_min.save(
+            self.SCM_approximation.folder["reduced_operators"], "bounding_box_min")
+        self.SCM_approximation.bounding_box_max.save(
+            self.SCM_approximation.folder["reduced_operators"], "bounding_box_max")
+        for (mu, upper_bound_vector_as_list) in zip(
+                state["greedy_selected_parameters"], state["upper_bound_vectors"]):
+            self.SCM_approximation.set_mu(mu)
+            self.store_greedy_selected_parameters()
+            upper_bound_vector = OnlineVector(Q)
+            for q in range(Q):
+                upper_bound_vector[q] = upper_bound_vector_as_list[q]
+            self.update_upper_bound_vectors(upper_bound_vector)
+        self.greedy_error_estimators.extend(state["greedy_error_estimators"])
+        self.greedy_error_estimators.save(self.folder["post_processing"], "error_estimator_max")
+        self.SCM_approximation.set_mu(state["mu"])
+        return state["relative_error_estimator_max"]
+
     # Finalize data structures required after the offline phase
     def _finalize_offline(self):
         self.SCM_approximation.init("online")
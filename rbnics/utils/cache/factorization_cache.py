@@ -0,0 +1,55 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from logging import DEBUG, getLogger
+
+logger = getLogger("rbnics/utils/cache/factorization_cache.py")
+
+
+class FactorizationCache(object):
+    """
+    Storage of factorized linear solvers, so that several linear systems sharing the same left-hand side
+    (e.g. Riesz representation problems, which all involve the same inner product matrix) require a single
+    factorization. Matrices are identified by reference, rather than by value: the cache must be explicitly
+    cleared if a stored matrix is modified in-place.
+    """
+
+    def __init__(self):
+        self._storage = dict()  # from key to (matrix, factorized solver)
+        self.factorizations = 0
+        self.reuses = 0
+
+    def get(self, matrix, key, factorize):
+        """
+        Return the factorized solver associated to matrix, calling factorize if it is not available yet.
+
+        :param matrix: the left-hand side of the linear system.
+        :param key: an hashable object identifying further data which affect the factorization,
+            e.g. boundary conditions or the linear solver type.
+        :param factorize: a callable, with no arguments, returning a factorized solver.
+        :return: the factorized solver.
+        """
+        storage_key = (id(matrix), key)
+        if storage_key in self._storage and self._storage[storage_key][0] is matrix:
+            self.reuses += 1
+            logger.log(DEBUG, "Re-using factorization with key " + str(storage_key))
+        else:
+            self._storage[storage_key] = (matrix, factorize())
+            self.factorizations += 1
+            logger.log(DEBUG, "Computing factorization with key " + str(storage_key))
+        return self._storage[storage_key][1]
+
+    def clear(self):
+        """
+        Remove all stored factorizations. This must be called if a stored matrix is modified in-place.
+        """
+        self._storage.clear()
+
+    def __len__(self):
+        return len(self._storage)
+
+    def __str__(self):
+        return (str(self.factorizations) + " factorizations, re-used " + str(self.reuses) + " times")
@@ -12,6 +12,7 @@ from rbnics.utils.io.folders import Folders
 from rbnics.utils.io.greedy_error_estimators_list import GreedyErrorEstimatorsList
 from rbnics.utils.io.greedy_selected_parameters_list import GreedySelectedParametersList
 from rbnics.utils.io.numpy_io import NumpyIO
+from rbnics.utils.io.offline_checkpoint_io import OfflineCheckpointIO
 from rbnics.utils.io.performance_table import PerformanceTable
 from rbnics.utils.io.online_size_dict import OnlineSizeDict
 from rbnics.utils.io.pickle_io import PickleIO
@@ -30,6 +31,7 @@ __all__ = [
     "GreedyErrorEstimatorsList",
     "GreedySelectedParametersList",
     "NumpyIO",
+    "OfflineCheckpointIO",
     "OnlineSizeDict",
     "PerformanceTable",
     "PickleIO",
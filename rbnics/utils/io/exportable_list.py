@@ -23,6 +23,7 @@ class ExportableList(object):
             raise ValueError("Invalid import/export backend")
         if original_list is not None:
             self._list.extend(original_list)
+        self._saved = dict()  # from (directory, filename) to list which has been saved there
 
     def append(self, element):
         self._list.append(element)
@@ -39,7 +40,20 @@ class ExportableList(object):
         self._list.clear()
 
     def save(self, directory, filename):
-        self._FileIO.save_file(self._list, directory, filename)
+        # Text files are only appended the elements which have been added since the previous save
+        # to the same file, provided that the previously saved elements have not been changed
+        saved = self._saved.get((str(directory), filename), None)
+        if (
+            self._FileIO is TextIO
+            and saved is not None
+            and 0 < len(saved) < len(self._list)
+            and self._list[:len(saved)] == saved
+            and TextIO.append_file(saved, self._list[len(saved):], directory, filename)
+        ):
+            pass
+        else:
+            self._FileIO.save_file(self._list, directory, filename)
+        self._saved[str(directory), filename] = list(self._list)
 
     # Returns False if the list had been already imported so no further
     # action was needed.
@@ -50,6 +64,7 @@ class ExportableList(object):
             return False
         if self._FileIO.exists_file(directory, filename):
             self._list = self._FileIO.load_file(directory, filename)
+            self._saved[str(directory), filename] = list(self._list)
             return True
         else:
             raise OSError
@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 import os
+from io import BytesIO
 import numpy
 from rbnics.utils.mpi import parallel_io
 
@@ -21,6 +22,49 @@ class NumpyIO(object):
 
         parallel_io(save_file_task)
 
+    # Append the rows of an array to a file which currently stores the array previous_content, growing the array
+    # in-place without rewriting previous_content. Returns False if the file does not store an array with the
+    # same shape and type as previous_content.
+    @staticmethod
+    def append_file(previous_content, content, directory, filename):
+        assert len(previous_content.shape) > 0 and previous_content.shape[0] > 0
+        assert previous_content.shape[1:] == content.shape[1:]
+        assert previous_content.dtype == content.dtype
+        if not filename.endswith(".npy"):
+            filename = filename + ".npy"
+
+        def append_file_task():
+            full_filename = os.path.join(str(directory), filename)
+            if not os.path.exists(full_filename):
+                return False
+            with open(full_filename, "r+b") as outfile:
+                version = numpy.lib.format.read_magic(outfile)
+                if version != (1, 0):
+                    return False
+                (shape, fortran_order, dtype) = numpy.lib.format.read_array_header_1_0(outfile)
+                if shape != previous_content.shape or fortran_order or dtype != previous_content.dtype:
+                    return False
+                header_length = outfile.tell()
+                # numpy reserves enough space in the header to grow the first dimension in-place
+                header = BytesIO()
+                numpy.lib.format.write_array_header_1_0(header, {
+                    "descr": numpy.lib.format.dtype_to_descr(dtype), "fortran_order": False,
+                    "shape": (shape[0] + content.shape[0], ) + shape[1:]})
+                if len(header.getvalue()) != header_length:
+                    return False
+                outfile.seek(header_length + previous_content.nbytes)
+                outfile.write(numpy.ascontiguousarray(content).tobytes())
+                outfile.truncate()
+                outfile.flush()
+                os.fsync(outfile.fileno())
+                outfile.seek(0)
+                outfile.write(header.getvalue())
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            return True
+
+        return parallel_io(append_file_task)
+
     # Load a variable from file
     @staticmethod
     def load_file(directory, filename):
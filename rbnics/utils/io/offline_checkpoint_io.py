@@ -0,0 +1,53 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+import pickle
+import os
+from rbnics.utils.mpi import parallel_io
+
+
+class OfflineCheckpointIO(object):
+    """
+    Input/output of the consistency manifest of an offline stage, which is saved after each iteration in order to
+    resume an interrupted offline stage from its last consistent state. The manifest is first written to a
+    temporary file, which then atomically replaces the previous one: after a crash, either the previous or the
+    current manifest is found, but never a partially written one.
+    """
+
+    # Save a variable to file
+    @staticmethod
+    def save_file(content, directory, filename):
+        if not filename.endswith(".pkl"):
+            filename = filename + ".pkl"
+
+        def save_file_task():
+            full_filename = os.path.join(str(directory), filename)
+            with open(full_filename + ".tmp", "wb") as outfile:
+                pickle.dump(content, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            os.replace(full_filename + ".tmp", full_filename)
+
+        parallel_io(save_file_task)
+
+    # Load a variable from file
+    @staticmethod
+    def load_file(directory, filename):
+        if not filename.endswith(".pkl"):
+            filename = filename + ".pkl"
+        with open(os.path.join(str(directory), filename), "rb") as infile:
+            return pickle.load(infile)
+
+    # Check if the file exists
+    @staticmethod
+    def exists_file(directory, filename):
+        if not filename.endswith(".pkl"):
+            filename = filename + ".pkl"
+
+        def exists_file_task():
+            return os.path.exists(os.path.join(str(directory), filename))
+
+        return parallel_io(exists_file_task)
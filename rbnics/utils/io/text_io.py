@@ -21,6 +21,35 @@ class TextIO(object):
 
         parallel_io(save_file_task)
 
+    # Append the items of a list to a file which currently stores the list previous_content,
+    # preserving the format of save_file. Returns False if the file does not store previous_content.
+    @staticmethod
+    def append_file(previous_content, content, directory, filename):
+        assert isinstance(previous_content, list) and len(previous_content) > 0
+        assert isinstance(content, list) and len(content) > 0
+        if os.path.splitext(filename)[1] == "":
+            filename = filename + ".txt"
+
+        def append_file_task():
+            full_filename = os.path.join(str(directory), filename)
+            if not os.path.exists(full_filename):
+                return False
+            expected_tail = (repr(previous_content[-1]) + "]").encode()
+            with open(full_filename, "r+b") as outfile:
+                outfile.seek(0, os.SEEK_END)
+                if outfile.tell() < len(expected_tail):
+                    return False
+                outfile.seek(- len(expected_tail), os.SEEK_END)
+                if outfile.read() != expected_tail:
+                    return False
+                outfile.seek(-1, os.SEEK_END)
+                outfile.write((", " + repr(content)[1:]).encode())
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            return True
+
+        return parallel_io(append_file_task)
+
     # Load a variable from file
     @staticmethod
     def load_file(directory, filename, globals=None):
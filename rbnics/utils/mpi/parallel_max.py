@@ -14,22 +14,13 @@ def parallel_max(local_value_max, local_args=None, postprocessor=None, mpi_comm=
             return value
     if mpi_comm is None:
         mpi_comm = COMM_WORLD
-    local_value_max_with_postprocessing = postprocessor(local_value_max)
-    global_value_max_with_postprocessing = mpi_comm.allreduce(local_value_max_with_postprocessing, op=MAX)
-    global_value_processor_argmax = -1
-    if global_value_max_with_postprocessing == local_value_max_with_postprocessing:
-        global_value_processor_argmax = mpi_comm.rank
-    global_value_processor_argmax = mpi_comm.allreduce(global_value_processor_argmax, op=MAX)
-    assert global_value_processor_argmax >= 0
-    global_value_max = mpi_comm.bcast(local_value_max, root=global_value_processor_argmax)
+    if local_args is not None and not isinstance(local_args, tuple):
+        local_args = (local_args, )
+    # Single MAXLOC-like reduction: tuples are compared lexicographically, and ties on the postprocessed value
+    # are broken by the rank (largest rank wins), so that value and arguments are never compared
+    (_, _, global_value_max, global_args) = mpi_comm.allreduce(
+        (postprocessor(local_value_max), mpi_comm.rank, local_value_max, local_args), op=MAX)
     if local_args is not None:
-        if not isinstance(local_args, tuple):
-            local_args = (local_args, )
-        global_args = list()
-        for local_arg in local_args:
-            global_args.append(
-                mpi_comm.bcast(local_arg, root=global_value_processor_argmax)
-            )
-        return (global_value_max, tuple(global_args))
+        return (global_value_max, global_args)
     else:
         return global_value_max
@@ -0,0 +1,219 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from dolfin import *
+from rbnics import *
+
+
+class ThermalBlock(EllipticCoerciveCompliantProblem):
+
+    # Default initialization of members
+    def __init__(self, V, **kwargs):
+        # Call the standard initialization
+        EllipticCoerciveCompliantProblem.__init__(self, V, **kwargs)
+        # ... and also store FEniCS data structures for assembly
+        assert "subdomains" in kwargs
+        assert "boundaries" in kwargs
+        self.subdomains, self.boundaries = kwargs["subdomains"], kwargs["boundaries"]
+        self.u = TrialFunction(V)
+        self.v = TestFunction(V)
+        self.dx = Measure("dx")(subdomain_data=self.subdomains)
+        self.ds = Measure("ds")(subdomain_data=self.boundaries)
+
+    # Return the alpha_lower bound.
+    def get_stability_factor_lower_bound(self):
+        return min(self.compute_theta("a"))
+
+    # Return theta multiplicative terms of the affine expansion of the problem.
+    def compute_theta(self, term):
+        mu = self.mu
+        if term == "a":
+            theta_a0 = mu[0]
+            theta_a1 = 1.
+            return (theta_a0, theta_a1)
+        elif term == "f":
+            theta_f0 = mu[1]
+            return (theta_f0,)
+        else:
+            raise ValueError("Invalid term for compute_theta().")
+
+    # Return forms resulting from the discretization of the affine expansion of the problem operators.
+    def assemble_operator(self, term):
+        v = self.v
+        dx = self.dx
+        if term == "a":
+            u = self.u
+            a0 = inner(grad(u), grad(v)) * dx(1)
+            a1 = inner(grad(u), grad(v)) * dx(2)
+            return (a0, a1)
+        elif term == "f":
+            ds = self.ds
+            f0 = v * ds(1)
+            return (f0,)
+        elif term == "dirichlet_bc":
+            bc0 = [DirichletBC(self.V, Constant(0.0), self.boundaries, 3)]
+            return (bc0,)
+        elif term == "inner_product":
+            u = self.u
+            x0 = inner(grad(u), grad(v)) * dx
+            return (x0,)
+        else:
+            raise ValueError("Invalid term for assemble_operator().")
+
+
+class ThermalBlockEnrichment(ThermalBlock):
+    def name(self):
+        return "ThermalBlockGreedyEnrichment"
+
+
+class ThermalBlockBatch(ThermalBlock):
+    def name(self):
+        return "ThermalBlockGreedyBatch"
+
+
+class ThermalBlockResume(ThermalBlock):
+    def name(self):
+        return "ThermalBlockGreedyResume"
+
+
+class ThermalBlockResumeEnrichment(ThermalBlock):
+    def name(self):
+        return "ThermalBlockGreedyResumeEnrichment"
+
+
+class Interruption(Exception):
+    pass
+
+
+# 1. Read the mesh for this problem
+mesh = Mesh("data/thermal_block.xml")
+subdomains = MeshFunction("size_t", mesh, "data/thermal_block_physical_region.xml")
+boundaries = MeshFunction("size_t", mesh, "data/thermal_block_facet_region.xml")
+
+# 2. Create Finite Element space (Lagrange P1)
+V = FunctionSpace(mesh, "Lagrange", 1)
+mu_range = [(0.1, 10.0), (-1.0, 1.0)]
+
+# 3. Greedy with training set enrichment: the training set is so coarse that the tolerance is met on it
+#    before Nmax is reached, so that it needs to be enriched
+problem = ThermalBlockEnrichment(V, subdomains=subdomains, boundaries=boundaries)
+problem.set_mu_range(mu_range)
+reduction_method = ReducedBasis(problem)
+reduction_method.set_Nmax(20)
+reduction_method.set_tolerance(1e-5)
+reduction_method.set_training_set_enrichment(10, 100)
+reduction_method.initialize_training_set(3)
+reduced_problem = reduction_method.offline()
+assert len(reduction_method.training_set) > 3
+# Only the greedy searches carried out on the final training set of each iteration are recorded:
+# one for each basis function, and the last one which met the stopping criterion
+assert len(reduction_method.greedy_selected_parameters) == reduced_problem.N + 1
+assert len(reduction_method.greedy_error_estimators) == reduced_problem.N + 1
+
+# 4. Greedy selecting several parameters at each iteration: Nmax is not a multiple of the batch size,
+#    so that the last batch is only partially added to the basis
+problem = ThermalBlockBatch(V, subdomains=subdomains, boundaries=boundaries)
+problem.set_mu_range(mu_range)
+reduction_method = ReducedBasis(problem)
+reduction_method.set_Nmax(5)
+reduction_method.set_tolerance(1e-15)
+reduction_method.set_greedy_batch_size(3, 0.1)
+reduction_method.initialize_training_set(100)
+reduced_problem = reduction_method.offline()
+assert reduced_problem.N == 5
+# Only parameters added to the basis are recorded, together with the one selected by the last greedy search
+assert len(reduction_method.greedy_selected_parameters) == reduced_problem.N + 1
+assert len(reduction_method.greedy_error_estimators) == reduced_problem.N + 1
+
+# 5. Resume an interrupted offline stage: basis functions and Riesz representors computed before the interruption
+#    are loaded from file, rather than solving again the corresponding truth problems
+problem = ThermalBlockResume(V, subdomains=subdomains, boundaries=boundaries)
+problem.set_mu_range(mu_range)
+reduction_method = ReducedBasis(problem)
+reduction_method.set_Nmax(4)
+reduction_method.set_tolerance(1e-15)
+reduction_method.initialize_training_set(100)
+update_basis_matrix = reduction_method.update_basis_matrix
+
+
+def interrupted_update_basis_matrix(snapshot):
+    if reduction_method.reduced_problem.N == 2:
+        raise Interruption()
+    update_basis_matrix(snapshot)
+
+
+reduction_method.update_basis_matrix = interrupted_update_basis_matrix
+try:
+    reduction_method.offline()
+except Interruption:
+    pass
+else:
+    raise AssertionError("The offline stage should have been interrupted")
+restored_parameters = list(reduction_method.greedy_selected_parameters)[:2]
+
+problem = ThermalBlockResume(V, subdomains=subdomains, boundaries=boundaries)
+problem.set_mu_range(mu_range)
+solved_parameters = list()
+solve = problem.solve
+
+
+def recording_solve(**kwargs):
+    solved_parameters.append(problem.mu)
+    return solve(**kwargs)
+
+
+problem.solve = recording_solve
+reduction_method = ReducedBasis(problem)
+reduction_method.set_Nmax(4)
+reduction_method.set_tolerance(1e-15)
+reduction_method.initialize_training_set(100)
+reduced_problem = reduction_method.offline()
+assert reduced_problem.N == 4
+assert list(reduction_method.greedy_selected_parameters)[:2] == restored_parameters
+assert all(mu not in restored_parameters for mu in solved_parameters)
+assert len(reduction_method.greedy_selected_parameters) == reduced_problem.N + 1
+
+# 6. Resume an interrupted offline stage after training set enrichments: the enriched training set is loaded
+#    from the file saved for the offline checkpoint, even though initialize_training_set() has generated a new
+#    training set of the requested size
+problem = ThermalBlockResumeEnrichment(V, subdomains=subdomains, boundaries=boundaries)
+problem.set_mu_range(mu_range)
+reduction_method = ReducedBasis(problem)
+reduction_method.set_Nmax(20)
+reduction_method.set_tolerance(1e-5)
+reduction_method.set_training_set_enrichment(10, 100)
+reduction_method.initialize_training_set(3)
+update_basis_matrix = reduction_method.update_basis_matrix
+
+
+def interrupted_update_basis_matrix(snapshot):
+    # At most three basis functions can be computed before the first enrichment of the training set
+    if reduction_method.reduced_problem.N == 4:
+        raise Interruption()
+    update_basis_matrix(snapshot)
+
+
+reduction_method.update_basis_matrix = interrupted_update_basis_matrix
+try:
+    reduction_method.offline()
+except Interruption:
+    pass
+else:
+    raise AssertionError("The offline stage should have been interrupted")
+enriched_training_set = list(reduction_method.training_set)
+assert len(enriched_training_set) > 3
+
+problem = ThermalBlockResumeEnrichment(V, subdomains=subdomains, boundaries=boundaries)
+problem.set_mu_range(mu_range)
+reduction_method = ReducedBasis(problem)
+reduction_method.set_Nmax(20)
+reduction_method.set_tolerance(1e-5)
+reduction_method.set_training_set_enrichment(10, 100)
+reduction_method.initialize_training_set(3)
+assert list(reduction_method.training_set) != enriched_training_set[:3]
+reduced_problem = reduction_method.offline()
+assert reduced_problem.N >= 4
+assert list(reduction_method.training_set)[:len(enriched_training_set)] == enriched_training_set
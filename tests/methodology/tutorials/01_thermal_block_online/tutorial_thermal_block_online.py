@@ -0,0 +1,138 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import array, isclose
+from dolfin import *
+from rbnics import *
+from rbnics.sampling import ParameterSpaceSubset
+
+
+class ThermalBlock(EllipticCoerciveCompliantProblem):
+
+    # Default initialization of members
+    def __init__(self, V, **kwargs):
+        # Call the standard initialization
+        EllipticCoerciveCompliantProblem.__init__(self, V, **kwargs)
+        # ... and also store FEniCS data structures for assembly
+        assert "subdomains" in kwargs
+        assert "boundaries" in kwargs
+        self.subdomains, self.boundaries = kwargs["subdomains"], kwargs["boundaries"]
+        self.u = TrialFunction(V)
+        self.v = TestFunction(V)
+        self.dx = Measure("dx")(subdomain_data=self.subdomains)
+        self.ds = Measure("ds")(subdomain_data=self.boundaries)
+
+    # Return custom problem name
+    def name(self):
+        return "ThermalBlockOnline"
+
+    # Return the alpha_lower bound.
+    def get_stability_factor_lower_bound(self):
+        return min(self.compute_theta("a"))
+
+    # Return theta multiplicative terms of the affine expansion of the problem.
+    def compute_theta(self, term):
+        mu = self.mu
+        if term == "a":
+            theta_a0 = mu[0]
+            theta_a1 = 1.
+            return (theta_a0, theta_a1)
+        elif term == "f":
+            theta_f0 = mu[1]
+            return (theta_f0,)
+        else:
+            raise ValueError("Invalid term for compute_theta().")
+
+    # Return forms resulting from the discretization of the affine expansion of the problem operators.
+    def assemble_operator(self, term):
+        v = self.v
+        dx = self.dx
+        if term == "a":
+            u = self.u
+            a0 = inner(grad(u), grad(v)) * dx(1)
+            a1 = inner(grad(u), grad(v)) * dx(2)
+            return (a0, a1)
+        elif term == "f":
+            ds = self.ds
+            f0 = v * ds(1)
+            return (f0,)
+        elif term == "dirichlet_bc":
+            bc0 = [DirichletBC(self.V, Constant(0.0), self.boundaries, 3)]
+            return (bc0,)
+        elif term == "inner_product":
+            u = self.u
+            x0 = inner(grad(u), grad(v)) * dx
+            return (x0,)
+        else:
+            raise ValueError("Invalid term for assemble_operator().")
+
+
+# 1. Read the mesh for this problem
+mesh = Mesh("data/thermal_block.xml")
+subdomains = MeshFunction("size_t", mesh, "data/thermal_block_physical_region.xml")
+boundaries = MeshFunction("size_t", mesh, "data/thermal_block_facet_region.xml")
+
+# 2. Create Finite Element space (Lagrange P1)
+V = FunctionSpace(mesh, "Lagrange", 1)
+
+# 3. Allocate an object of the ThermalBlock class
+problem = ThermalBlock(V, subdomains=subdomains, boundaries=boundaries)
+mu_range = [(0.1, 10.0), (-1.0, 1.0)]
+problem.set_mu_range(mu_range)
+
+# 4. Perform the offline phase
+reduction_method = ReducedBasis(problem)
+reduction_method.set_Nmax(5)
+reduction_method.set_tolerance(1e-15)
+reduction_method.initialize_training_set(50)
+reduced_problem = reduction_method.offline()
+assert reduced_problem.N == 5
+
+# 5. Online queries for several parameters at once must agree with the ones for each parameter
+mus = ParameterSpaceSubset()
+mus.generate(mu_range, 10)
+online_mu = (8.0, -1.0)
+reduced_problem.set_mu(online_mu)
+for N in (None, 3):
+    N_int = N if N is not None else reduced_problem.N
+    solutions = reduced_problem.solve_batch(mus, N)
+    outputs = reduced_problem.compute_output_batch(mus, N)
+    error_estimators = reduced_problem.estimate_error_batch(mus, N)
+    assert solutions.shape == (len(mus), N_int)
+    assert outputs.shape == (len(mus), )
+    assert error_estimators.shape == (len(mus), )
+    # The current parameter is not changed by the batched queries
+    assert reduced_problem.mu == online_mu
+    for (i, mu) in enumerate(mus):
+        reduced_problem.set_mu(mu)
+        solution = reduced_problem.solve(N)
+        assert isclose(solutions[i], array(solution.vector())).all()
+        assert isclose(outputs[i], reduced_problem.compute_output())
+        assert isclose(error_estimators[i], reduced_problem.estimate_error())
+    reduced_problem.set_mu(online_mu)
+
+# 6. Online solves for several dimensions from a single factorization must agree with the ones for each dimension
+for Ns in (None, [1, 3, 5], [4, 2]):
+    Ns_list = Ns if Ns is not None else list(range(1, reduced_problem.N + 1))
+    for mu in mus:
+        reduced_problem.set_mu(mu)
+        nested_solutions = [array(solution.vector()) for solution in reduced_problem.solve_nested(Ns)]
+        assert len(nested_solutions) == len(Ns_list)
+        reduced_problem._solution_cache.clear()
+        for (n, nested_solution) in zip(Ns_list, nested_solutions):
+            solution = reduced_problem.solve(n)
+            assert nested_solution.shape == (n, )
+            assert isclose(nested_solution, array(solution.vector())).all()
+
+# 7. Error analysis uses nested solves for the dimensions provided by the generator
+reduction_method.initialize_testing_set(5)
+
+
+def N_generator():
+    return iter([1, 3, 5])
+
+
+reduction_method.error_analysis(N_generator)
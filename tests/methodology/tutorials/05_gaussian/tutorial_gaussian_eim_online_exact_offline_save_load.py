@@ -0,0 +1,125 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import empty, isclose
+from dolfin import *
+from rbnics import *
+from rbnics.backends import copy, product, sum
+from rbnics.backends.basic.wrapping import DelayedLinearSolver
+
+
+@EIM("online")
+@ExactParametrizedFunctions("offline")
+class Gaussian(EllipticCoerciveProblem):
+
+    # Default initialization of members
+    def __init__(self, V, **kwargs):
+        # Call the standard initialization
+        EllipticCoerciveProblem.__init__(self, V, **kwargs)
+        # ... and also store FEniCS data structures for assembly
+        assert "subdomains" in kwargs
+        assert "boundaries" in kwargs
+        self.subdomains, self.boundaries = kwargs["subdomains"], kwargs["boundaries"]
+        self.u = TrialFunction(V)
+        self.v = TestFunction(V)
+        self.dx = Measure("dx")(subdomain_data=subdomains)
+        self.f = ParametrizedExpression(
+            self, "exp( - 2*pow(x[0]-mu[0], 2) - 2*pow(x[1]-mu[1], 2) )", mu=(0., 0.), element=V.ufl_element())
+        # note that we cannot use self.mu in the initialization of self.f, because self.mu has not been initialized yet
+
+    # Return custom problem name
+    def name(self):
+        return "GaussianEIMOnlineExactOfflineSaveLoad"
+
+    # Return the alpha_lower bound.
+    def get_stability_factor_lower_bound(self):
+        return 1.
+
+    # Return theta multiplicative terms of the affine expansion of the problem.
+    def compute_theta(self, term):
+        if term == "a":
+            return (1., )
+        elif term == "f":
+            return (1., )
+        else:
+            raise ValueError("Invalid term for compute_theta().")
+
+    # Return forms resulting from the discretization of the affine expansion of the problem operators.
+    def assemble_operator(self, term):
+        v = self.v
+        dx = self.dx
+        if term == "a":
+            u = self.u
+            a0 = inner(grad(u), grad(v)) * dx
+            return (a0,)
+        elif term == "f":
+            f = self.f
+            f0 = f * v * dx
+            return (f0,)
+        elif term == "dirichlet_bc":
+            bc0 = [DirichletBC(self.V, Constant(0.0), self.boundaries, 1),
+                   DirichletBC(self.V, Constant(0.0), self.boundaries, 2),
+                   DirichletBC(self.V, Constant(0.0), self.boundaries, 3)]
+            return (bc0,)
+        elif term == "inner_product":
+            u = self.u
+            x0 = inner(grad(u), grad(v)) * dx
+            return (x0,)
+        else:
+            raise ValueError("Invalid term for assemble_operator().")
+
+
+# 1. Read the mesh for this problem
+mesh = Mesh("data/gaussian.xml")
+subdomains = MeshFunction("size_t", mesh, "data/gaussian_physical_region.xml")
+boundaries = MeshFunction("size_t", mesh, "data/gaussian_facet_region.xml")
+
+# 2. Create Finite Element space (Lagrange P1)
+V = FunctionSpace(mesh, "Lagrange", 1)
+
+# 3. Allocate an object of the Gaussian class
+problem = Gaussian(V, subdomains=subdomains, boundaries=boundaries)
+mu_range = [(-1.0, 1.0), (-1.0, 1.0)]
+problem.set_mu_range(mu_range)
+
+# 4. Prepare reduction with a reduced basis method
+reduction_method = ReducedBasis(problem)
+reduction_method.set_Nmax(3, EIM=6)
+reduction_method.set_tolerance(1e-15, EIM=1e-15)
+
+# 5. Perform the offline phase
+reduction_method.initialize_training_set(10, EIM=12)
+reduced_problem = reduction_method.offline()
+
+# 6. Riesz representors of the non-affine right-hand side are delayed linear solvers in the offline stage,
+#    because of the exact evaluation: they must be loaded back as saved at the end of the offline stage
+OfflineOnlineSwitch = reduced_problem.offline_online_backend.OfflineOnlineSwitch
+OfflineOnlineSwitch.set_current_stage("offline")
+delayed_solver = reduced_problem.riesz["f"][0][0]
+assert isinstance(delayed_solver, DelayedLinearSolver)
+delayed_solver.save(reduced_problem.folder["error_estimation"], "delayed_riesz_f_0")
+loaded_solver = DelayedLinearSolver()
+loaded_solver.load(reduced_problem.folder["error_estimation"], "delayed_riesz_f_0")
+assert loaded_solver._parameters == delayed_solver._parameters
+assert loaded_solver._lhs is delayed_solver._lhs
+assert loaded_solver._solution is delayed_solver._solution
+assert loaded_solver._rhs is delayed_solver._rhs
+assert loaded_solver._bcs is delayed_solver._bcs
+
+# 7. The loaded solver must provide the same Riesz representor, and re-use the truth factorization cache
+online_mu = (0.3, -1.0)
+reduced_problem.set_mu(online_mu)
+factorization_cache = reduced_problem.truth_problem._factorization_cache
+reuses = factorization_cache.reuses
+riesz_representors = list()
+for solver in (delayed_solver, loaded_solver):
+    solvers = empty(1, dtype=object)
+    solvers[0] = solver
+    riesz_representors.append(copy(sum(product((1., ), solvers))))
+error = riesz_representors[1].vector() - riesz_representors[0].vector()
+assert isclose(error.norm("l2"), 0., atol=1e-10 * riesz_representors[0].vector().norm("l2"))
+assert factorization_cache.reuses == reuses + 1
+OfflineOnlineSwitch.set_current_stage("online")
@@ -178,3 +178,102 @@ def test_linear_solver():
         error_dense = _test_linear_solver_dense(V, a, f, X, exact_solution)
         assert isclose(error_dense, error_sparse_tensor_callbacks)
         assert isclose(error_dense, error_sparse_form_callbacks)
+
+
+# ~~~ Factorization cache ~~~ #
+def _assemble_linear_system():
+    mesh = IntervalMesh(132, 0, 2 * pi)
+    V = FunctionSpace(mesh, "Lagrange", 1)
+
+    def boundary(x):
+        return x[0] < 0 + DOLFIN_EPS or x[0] > 2 * pi - 10 * DOLFIN_EPS
+
+    exact_solution_expression = Expression("x[0] + sin(2 * x[0])", element=V.ufl_element())
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    g = Expression("4 * sin(2 * x[0])", element=V.ufl_element())
+    h = Expression("cos(x[0])", element=V.ufl_element())
+    A = assemble(inner(grad(u), grad(v)) * dx)
+    F = [assemble(g * v * dx), assemble(h * v * dx)]
+    bc = [DirichletBC(V, exact_solution_expression, boundary)]
+    return (V, A, F, bc)
+
+
+def _solve_linear_system(V, A, F, bc, factorization_cache=None, parameters=None):
+    from dolfin import Function
+    from rbnics.backends.dolfin import LinearSolver
+
+    solution = Function(V)
+    solver = LinearSolver(A, solution, F, bc)
+    if parameters is not None:
+        solver.set_parameters(parameters)
+    solver.set_factorization_cache(factorization_cache)
+    solver.solve()
+    return solution
+
+
+def test_linear_solver_factorization_cache():
+    from rbnics.utils.cache import FactorizationCache
+
+    (V, A, F, bc) = _assemble_linear_system()
+    A_copy = A.copy()
+    cache = FactorizationCache()
+
+    # Solutions computed with and without the cache must coincide
+    for F_i in F:
+        solution_without_cache = _solve_linear_system(V, A, F_i, bc)
+        solution_with_cache = _solve_linear_system(V, A, F_i, bc, cache)
+        error = solution_with_cache.vector() - solution_without_cache.vector()
+        assert isclose(error.norm("l2"), 0., atol=1.e-12)
+    assert cache.factorizations == 1
+    assert cache.reuses == 1
+    assert len(cache) == 1
+
+    # The cached matrix must not have been modified by the application of boundary conditions
+    assert isclose((A - A_copy).norm("frobenius"), 0.)
+
+    # A different linear solver type requires a new factorization
+    _solve_linear_system(V, A, F[0], bc, cache, {"linear_solver": "mumps"})
+    assert cache.factorizations == 2
+    assert len(cache) == 2
+
+    # Matrices are identified by reference, not by value
+    _solve_linear_system(V, A_copy, F[0], bc, cache)
+    assert cache.factorizations == 3
+
+    # Clearing the cache forces a new factorization
+    cache.clear()
+    assert len(cache) == 0
+    _solve_linear_system(V, A, F[0], bc, cache)
+    assert cache.factorizations == 4
+    assert cache.reuses == 1
+
+
+# ~~~ Block of right-hand sides ~~~ #
+def test_linear_solver_block():
+    from dolfin import Function
+    from rbnics.backends.dolfin import LinearSolver
+    from rbnics.utils.cache import FactorizationCache
+
+    (V, A, F, bc) = _assemble_linear_system()
+
+    # Solve all right-hand sides at once
+    cache = FactorizationCache()
+    solutions = [Function(V) for _ in F]
+    solver = LinearSolver(A, solutions, F, bc)
+    solver.set_factorization_cache(cache)
+    solver.solve()
+    assert cache.factorizations == 1
+
+    # Compare to the solution of each linear system on its own
+    for (F_i, solution_i) in zip(F, solutions):
+        reference_solution_i = _solve_linear_system(V, A, F_i, bc)
+        error = solution_i.vector() - reference_solution_i.vector()
+        assert isclose(error.norm("l2"), 0., atol=1.e-10 * reference_solution_i.vector().norm("l2"))
+
+    # Right-hand sides provided by the user must not have been modified by the application of boundary conditions
+    F_copy = [F_i.copy() for F_i in F]
+    solver = LinearSolver(A, [Function(V) for _ in F], F, bc)
+    solver.solve()
+    for (F_i, F_copy_i) in zip(F, F_copy):
+        assert isclose((F_i - F_copy_i).norm("l2"), 0.)
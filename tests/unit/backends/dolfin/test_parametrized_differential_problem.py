@@ -0,0 +1,113 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import column_stack, isclose, ones
+from dolfin import Constant, DirichletBC, dx, FunctionSpace, grad, inner, TestFunction, TrialFunction, UnitSquareMesh
+from rbnics.problems.elliptic import EllipticCoerciveProblem
+
+
+class Problem(EllipticCoerciveProblem):
+    def __init__(self, V, **kwargs):
+        EllipticCoerciveProblem.__init__(self, V, **kwargs)
+        self.u = TrialFunction(V)
+        self.v = TestFunction(V)
+        # Keep track of the calls to compute_theta and compute_theta_batch
+        self.compute_theta_calls = list()
+        self.compute_theta_batch_calls = list()
+
+    def compute_theta(self, term):
+        self.compute_theta_calls.append((term, self.mu))
+        mu = self.mu
+        if term == "a":
+            return (mu[0], 1.)
+        elif term == "f":
+            return (mu[0] * mu[1], )
+        else:
+            raise ValueError("Invalid term for compute_theta().")
+
+    def compute_theta_batch(self, term, mus):
+        self.compute_theta_batch_calls.append(term)
+        if term == "a":
+            return column_stack((mus[:, 0], ones(len(mus))))
+        else:
+            return NotImplemented
+
+    def assemble_operator(self, term):
+        u = self.u
+        v = self.v
+        if term == "a":
+            return (inner(grad(u), grad(v)) * dx, u * v * dx)
+        elif term == "f":
+            return (v * dx, )
+        elif term == "dirichlet_bc":
+            return ([DirichletBC(self.V, Constant(0.0), "on_boundary")], )
+        elif term == "inner_product":
+            return (inner(grad(u), grad(v)) * dx, )
+        else:
+            raise ValueError("Invalid term for assemble_operator().")
+
+
+# Auxiliary functions
+def _problem():
+    mesh = UnitSquareMesh(2, 2)
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    problem = Problem(V)
+    problem.set_mu_range([(1., 2.), (-1., 1.)])
+    problem.set_mu((1.5, 0.5))
+    return problem
+
+
+def _mus():
+    return [(1., -1.), (1.25, 0.), (2., 1.)]
+
+
+def _loop(problem, term, mus):
+    mu = problem.mu
+    thetas = list()
+    for mu_i in mus:
+        problem.set_mu(mu_i)
+        thetas.append(problem.compute_theta(term))
+    problem.set_mu(mu)
+    return thetas
+
+
+# ~~~ Vectorized thetas ~~~ #
+def test_compute_theta_batch():
+    problem = _problem()
+    thetas = problem._compute_theta_batch("a", _mus())
+    assert thetas.shape == (3, 2)
+    # The hook has been used, without evaluating compute_theta for each parameter
+    assert problem.compute_theta_batch_calls == ["a"]
+    assert len(problem.compute_theta_calls) == 0
+    assert isclose(thetas, _loop(problem, "a", _mus())).all()
+
+
+def test_compute_theta_batch_not_implemented():
+    problem = _problem()
+    thetas = problem._compute_theta_batch("f", _mus())
+    assert thetas.shape == (3, 1)
+    # The hook does not handle this term, so compute_theta has been evaluated for each parameter ...
+    assert problem.compute_theta_batch_calls == ["f"]
+    assert problem.compute_theta_calls == [("f", mu) for mu in _mus()]
+    assert isclose(thetas, _loop(problem, "f", _mus())).all()
+    # ... and the current parameter has been restored
+    assert problem.mu == (1.5, 0.5)
+
+
+def test_compute_theta_batch_replaced_compute_theta():
+    problem = _problem()
+
+    # Replace compute_theta at runtime, as done e.g. by EIM
+    def compute_theta(term):
+        assert term == "a"
+        return (2. * problem.mu[0], problem.mu[1])
+
+    problem.compute_theta = compute_theta
+    thetas = problem._compute_theta_batch("a", _mus())
+    # The hook would not be consistent with the replaced compute_theta, so it has not been used
+    assert len(problem.compute_theta_batch_calls) == 0
+    assert isclose(thetas, [(2. * mu[0], mu[1]) for mu in _mus()]).all()
+    assert problem.mu == (1.5, 0.5)
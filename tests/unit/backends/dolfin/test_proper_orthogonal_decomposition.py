@@ -0,0 +1,168 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+import pytest
+from numpy import isclose
+from numpy.random import RandomState
+from dolfin import assemble, dx, Expression, FunctionSpace, interpolate, TestFunction, TrialFunction, UnitSquareMesh
+from rbnics.backends.dolfin import ProperOrthogonalDecomposition
+
+
+# Auxiliary functions
+def _space_and_inner_product():
+    mesh = UnitSquareMesh(16, 16)
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    X = assemble(u * v * dx)
+    return (V, X)
+
+
+def _snapshots(V):
+    # Gaussian bumps centered at random points, whose POD eigenvalues decay moderately fast
+    centers = 0.25 + 0.5 * RandomState(0).rand(40, 2)
+    return [interpolate(Expression("exp(- (pow(x[0] - a, 2) + pow(x[1] - b, 2)) / 0.02)", a=a, b=b,
+                                   element=V.ufl_element()), V) for (a, b) in centers]
+
+
+def _inner(X, f, g):
+    return f.vector().inner(X * g.vector())
+
+
+def _pod(V, X, snapshots, engine, **kwargs):
+    pod = ProperOrthogonalDecomposition(V, X)
+    pod.set_engine(engine, **kwargs)
+    for snapshot in snapshots:
+        pod.store_snapshot(snapshot)
+    return pod
+
+
+def _projection_error(X, snapshots, basis_functions):
+    # Squared X-norm of S - P S, where P is the X-orthogonal projection onto the span of the
+    # (X-orthonormal) basis functions
+    error = 0.
+    for snapshot in snapshots:
+        error += _inner(X, snapshot, snapshot) - sum([_inner(X, snapshot, b)**2 for b in basis_functions])
+    return error
+
+
+def _energy(X, snapshots):
+    return sum([_inner(X, snapshot, snapshot) for snapshot in snapshots])
+
+
+# ~~~ Partial and randomized engines ~~~ #
+@pytest.mark.parametrize("engine", ["partial", "randomized"])
+def test_proper_orthogonal_decomposition_engine(engine):
+    (V, X) = _space_and_inner_product()
+    snapshots = _snapshots(V)
+    Nmax = 10
+    exact_pod = _pod(V, X, snapshots, "exact")
+    (_, _, exact_basis_functions, exact_N) = exact_pod.apply(Nmax, 0.)
+    pod = _pod(V, X, snapshots, engine)
+    (eigenvalues, _, basis_functions, N) = pod.apply(Nmax, 0.)
+    assert N == exact_N == Nmax
+    # Only the required eigenvalues are computed, and they agree with the leading exact ones
+    assert len(pod.eigenvalues) == Nmax
+    assert isclose(list(pod.eigenvalues), list(exact_pod.eigenvalues)[:Nmax], rtol=1e-6).all()
+    # Retained energy is computed with respect to the energy of all snapshots
+    assert isclose(list(pod.retained_energy), list(exact_pod.retained_energy)[:Nmax], rtol=1e-6).all()
+    # POD modes agree (up to their sign) with the exact ones
+    for (b, exact_b) in zip(basis_functions, exact_basis_functions):
+        assert isclose(abs(_inner(X, b, exact_b)), 1., rtol=1e-6)
+    assert isclose(_projection_error(X, snapshots, basis_functions),
+                   _projection_error(X, snapshots, exact_basis_functions), rtol=1e-4)
+
+
+def test_proper_orthogonal_decomposition_engine_tolerance():
+    (V, X) = _space_and_inner_product()
+    snapshots = _snapshots(V)
+    exact_pod = _pod(V, X, snapshots, "exact")
+    (_, _, _, exact_N) = exact_pod.apply(len(snapshots), 1e-3)
+    for engine in ("partial", "randomized"):
+        pod = _pod(V, X, snapshots, engine)
+        (_, _, _, N) = pod.apply(len(snapshots), 1e-3)
+        assert N == exact_N
+
+
+# ~~~ Incremental engine ~~~ #
+@pytest.mark.parametrize("tolerance", [1e-2, 1e-4, 1e-8])
+def test_proper_orthogonal_decomposition_incremental(tolerance):
+    (V, X) = _space_and_inner_product()
+    snapshots = _snapshots(V)
+    exact_pod = _pod(V, X, snapshots, "exact")
+    exact_pod.apply(len(snapshots), 0.)
+    pod = _pod(V, X, snapshots, "incremental", tolerance=tolerance)
+    # Snapshots are compressed as soon as they are stored
+    assert len(pod.snapshots_matrix) == 0
+    (eigenvalues, _, basis_functions, N) = pod.apply(len(snapshots), 0.)
+    assert N <= len(snapshots)
+    energy = _energy(X, snapshots)
+    # Compression error is bounded by the tolerance, up to round-off errors in its computation
+    projection_error = _projection_error(X, snapshots, basis_functions) - 1e-12 * energy
+    assert projection_error <= tolerance * energy
+    assert projection_error <= pod.relative_error_bound * energy
+    assert pod.relative_error_bound <= tolerance * (1. + 1e-8)
+    # Retained energy is computed with respect to the energy of all snapshots
+    assert pod.retained_energy[N - 1] >= 1. - tolerance * (1. + 1e-8)
+    # Eigenvalues agree with the leading exact ones, up to the discarded energy
+    assert isclose(list(eigenvalues), list(exact_pod.eigenvalues)[:N], rtol=0., atol=tolerance * energy).all()
+
+
+# ~~~ Hierarchical approximate POD ~~~ #
+def test_proper_orthogonal_decomposition_compress():
+    (V, X) = _space_and_inner_product()
+    snapshots = _snapshots(V)
+    tolerance = 1e-3
+    exact_pod = _pod(V, X, snapshots, "exact")
+    (exact_eigenvalues, _, _, exact_N) = exact_pod.apply(len(snapshots), tolerance)
+    pod = _pod(V, X, snapshots, "exact")
+    N = pod.compress(len(snapshots), tolerance)
+    assert N == exact_N
+    # Snapshots are replaced by the POD modes, weighted by the square root of the eigenvalues,
+    # so that they retain the energy of the first N eigenvalues
+    assert len(pod.snapshots_matrix) == N
+    assert isclose(_energy(X, pod.snapshots_matrix), sum(exact_eigenvalues), rtol=1e-8)
+    assert pod.relative_error_bound <= tolerance
+
+
+@pytest.mark.parametrize("tolerances", [(1e-3, 1e-3), (1e-6, 1e-2), (1e-2, 0.)])
+def test_proper_orthogonal_decomposition_merge_save_load(tempdir, tolerances):
+    (V, X) = _space_and_inner_product()
+    snapshots = _snapshots(V)
+    (leaf_tolerance, root_tolerance) = tolerances
+    n_groups = 3
+    # Leaves: compress the snapshots of each group, and save the compressed snapshots
+    leaf_pods = list()
+    for group_index in range(n_groups):
+        leaf_pod = _pod(V, X, snapshots[group_index::n_groups], "exact")
+        leaf_pod.compress(len(snapshots), leaf_tolerance)
+        assert leaf_pod.relative_error_bound <= leaf_tolerance
+        leaf_pod.save(tempdir, "group_" + str(group_index))
+        leaf_pods.append(leaf_pod)
+    # Root: collect the compressed snapshots either by merging the leaves or by loading them from file
+    merged_pod = ProperOrthogonalDecomposition(V, X)
+    for leaf_pod in leaf_pods:
+        merged_pod.merge(leaf_pod)
+    loaded_pod = ProperOrthogonalDecomposition(V, X)
+    for group_index in range(n_groups):
+        loaded_pod.load(tempdir, "group_" + str(group_index))
+    assert len(loaded_pod.snapshots_matrix) == len(merged_pod.snapshots_matrix)
+    (merged_eigenvalues, _, _, merged_N) = merged_pod.apply(len(snapshots), root_tolerance)
+    (eigenvalues, _, basis_functions, N) = loaded_pod.apply(len(snapshots), root_tolerance)
+    assert N == merged_N
+    assert isclose(list(eigenvalues), list(merged_eigenvalues), rtol=1e-8).all()
+    assert isclose(loaded_pod.relative_error_bound, merged_pod.relative_error_bound)
+    # The bound accounts for the energy discarded at each level, and is an upper bound
+    # of the compression error on the original snapshots
+    energy = _energy(X, snapshots)
+    projection_error = _projection_error(X, snapshots, basis_functions) - 1e-12 * energy
+    assert projection_error <= loaded_pod.relative_error_bound * energy
+    assert loaded_pod.relative_error_bound <= leaf_tolerance + root_tolerance
+    # The hierarchical approximate POD is close to the POD of all snapshots
+    exact_pod = _pod(V, X, snapshots, "exact")
+    exact_pod.apply(len(snapshots), 0.)
+    assert isclose(list(eigenvalues), list(exact_pod.eigenvalues)[:N], rtol=0.,
+                   atol=(leaf_tolerance + root_tolerance) * energy).all()
@@ -0,0 +1,88 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+import pytest
+from numpy import asarray, isclose, zeros
+from numpy.random import RandomState
+from dolfin import (assemble, dx, Expression, FunctionSpace, grad, inner, interpolate, TestFunction, TrialFunction,
+                    UnitSquareMesh)
+from rbnics.backends import FunctionsList, transpose
+from rbnics.backends.dolfin.wrapping.matrix_mul import (_vectors_mul_matrix_mul_vectors_block_width,
+                                                        vectors_mul_matrix_mul_vectors)
+
+
+# Auxiliary functions
+def _space_and_matrix():
+    mesh = UnitSquareMesh(16, 16)
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    # Non-symmetric matrix, so that the left and right operands cannot be swapped
+    A = assemble(inner(grad(u), grad(v)) * dx + u.dx(0) * v * dx)
+    return (V, A)
+
+
+def _functions(V, N, seed):
+    # Functions are interpolated from expressions, so that they do not depend on the mesh partition
+    coefficients = RandomState(seed).rand(N, 3)
+    return [interpolate(Expression("a + sin(b * x[0] + c * x[1])", a=a, b=5. * b, c=5. * c,
+                                   element=V.ufl_element()), V) for (a, b, c) in coefficients]
+
+
+def _pairwise(vectors, A, other_vectors):
+    output = zeros((len(vectors), len(other_vectors)))
+    for (j, other_vector) in enumerate(other_vectors):
+        A_other_vector = A * other_vector
+        for (i, vector) in enumerate(vectors):
+            output[i, j] = vector.inner(A_other_vector)
+    return output
+
+
+# ~~~ Dense block products ~~~ #
+@pytest.mark.parametrize("N, other_N", [(70, 150), (3, 2 * _vectors_mul_matrix_mul_vectors_block_width), (70, 1)])
+def test_vectors_mul_matrix_mul_vectors(N, other_N):
+    (V, A) = _space_and_matrix()
+    vectors = [f.vector() for f in _functions(V, N, 0)]
+    other_vectors = [f.vector() for f in _functions(V, other_N, 1)]
+    assert other_N == 1 or other_N > _vectors_mul_matrix_mul_vectors_block_width
+    output = vectors_mul_matrix_mul_vectors(vectors, A, other_vectors)
+    assert output.shape == (N, other_N)
+    expected = _pairwise(vectors, A, other_vectors)
+    assert isclose(output, expected, rtol=1e-10, atol=1e-12 * abs(expected).max()).all()
+
+
+def test_vectors_mul_matrix_mul_vectors_same_vectors():
+    (V, A) = _space_and_matrix()
+    N = 2 * _vectors_mul_matrix_mul_vectors_block_width + 5
+    vectors = [f.vector() for f in _functions(V, N, 0)]
+    # The dense block of the left operand is re-used for the right one
+    output = vectors_mul_matrix_mul_vectors(vectors, A, vectors)
+    expected = _pairwise(vectors, A, vectors)
+    assert isclose(output, expected, rtol=1e-10, atol=1e-12 * abs(expected).max()).all()
+    # Equal, but not identical, lists of vectors provide the same result
+    assert isclose(output, vectors_mul_matrix_mul_vectors(vectors, A, list(vectors)), rtol=1e-12).all()
+
+
+def test_vectors_mul_matrix_mul_vectors_empty():
+    (V, A) = _space_and_matrix()
+    vectors = [f.vector() for f in _functions(V, 3, 0)]
+    assert vectors_mul_matrix_mul_vectors(vectors, A, []).shape == (3, 0)
+    assert vectors_mul_matrix_mul_vectors([], A, vectors).shape == (0, 3)
+
+
+# ~~~ Transpose of functions lists ~~~ #
+def test_transpose_functions_list_mul_matrix_mul_functions_list():
+    (V, A) = _space_and_matrix()
+    S = FunctionsList(V)
+    S.enrich(_functions(V, 70, 0))
+    Z = FunctionsList(V)
+    Z.enrich(_functions(V, 150, 1))
+    S_vectors = [f.vector() for f in S]
+    Z_vectors = [f.vector() for f in Z]
+    for (left, left_vectors, right, right_vectors) in ((S, S_vectors, Z, Z_vectors), (Z, Z_vectors, Z, Z_vectors)):
+        output = asarray(transpose(left) * A * right)
+        expected = _pairwise(left_vectors, A, right_vectors)
+        assert isclose(output, expected, rtol=1e-10, atol=1e-12 * abs(expected).max()).all()
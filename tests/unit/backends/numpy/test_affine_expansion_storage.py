@@ -0,0 +1,148 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import allclose, einsum, random, shares_memory
+from rbnics.backends import product, sum
+from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineMatrix, OnlineVector
+
+
+# Auxiliary functions
+def _matrix_storage(Q, N):
+    storage = OnlineAffineExpansionStorage(Q)
+    for q in range(Q):
+        matrix = OnlineMatrix(N, N)
+        matrix[:, :] = random.rand(N, N)
+        storage[q] = matrix
+    return storage
+
+
+def _vector_storage(Q, N):
+    storage = OnlineAffineExpansionStorage(Q)
+    for q in range(Q):
+        vector = OnlineVector(N)
+        vector[:] = random.rand(N)
+        storage[q] = vector
+    return storage
+
+
+def _scalar_storage(Q0, Q1):
+    storage = OnlineAffineExpansionStorage(Q0, Q1)
+    for q0 in range(Q0):
+        for q1 in range(Q1):
+            storage[q0, q1] = random.rand()
+    return storage
+
+
+# ~~~ Dense array representation ~~~ #
+def test_affine_expansion_storage_to_array_matrix():
+    storage = _matrix_storage(3, 4)
+    expected = [storage[q].content.copy() for q in range(3)]
+    assert storage.is_dense()
+    storage_array = storage.to_array()
+    assert storage_array.shape == (3, 4, 4)
+    for q in range(3):
+        assert allclose(storage_array[q], expected[q])
+        # The content of each matrix is a view of the dense array, rather than a copy
+        assert shares_memory(storage[q].content, storage_array)
+    # The dense array is assembled only once
+    assert storage.to_array() is storage_array
+
+
+def test_affine_expansion_storage_to_array_vector():
+    storage = _vector_storage(3, 4)
+    expected = [storage[q].content.copy() for q in range(3)]
+    storage_array = storage.to_array()
+    assert storage_array.shape == (3, 4)
+    for q in range(3):
+        assert allclose(storage_array[q], expected[q])
+
+
+def test_affine_expansion_storage_to_array_scalar():
+    storage = _scalar_storage(2, 3)
+    storage_array = storage.to_array()
+    assert storage_array.shape == (2, 3)
+    for q0 in range(2):
+        for q1 in range(3):
+            assert storage_array[q0, q1] == storage[q0, q1]
+
+
+def test_affine_expansion_storage_setitem():
+    storage = _matrix_storage(3, 4)
+    storage.to_array()
+    # Storing again the elements (e.g. when reduced operators are rebuilt) invalidates the dense array,
+    # which is assembled again on demand
+    matrices = list()
+    for q in range(3):
+        matrix = OnlineMatrix(5, 5)
+        matrix[:, :] = random.rand(5, 5)
+        matrices.append(matrix.content.copy())
+        storage[q] = matrix
+    assert storage.to_array().shape == (3, 5, 5)
+    for q in range(3):
+        assert allclose(storage.to_array()[q], matrices[q])
+
+
+# ~~~ Slices ~~~ #
+def test_affine_expansion_storage_leading_block_matrix():
+    storage = _matrix_storage(3, 4)
+    storage_block = storage[:2, :2]
+    assert storage_block.is_dense()
+    assert storage_block.to_array().shape == (3, 2, 2)
+    # Leading blocks are views of the dense array of the parent storage
+    assert shares_memory(storage_block.to_array(), storage.to_array())
+    for q in range(3):
+        assert allclose(storage_block[q].content, storage.to_array()[q, :2, :2])
+
+
+def test_affine_expansion_storage_leading_block_vector():
+    storage = _vector_storage(3, 4)
+    storage_block = storage[:2]
+    assert storage_block.to_array().shape == (3, 2)
+    assert shares_memory(storage_block.to_array(), storage.to_array())
+    for q in range(3):
+        assert allclose(storage_block[q].content, storage.to_array()[q, :2])
+
+
+def test_affine_expansion_storage_non_leading_block():
+    storage = _vector_storage(3, 4)
+    storage_block = storage[1:3]
+    # Blocks which do not start from the first basis function are stored in a separate dense array
+    assert storage_block.to_array().shape == (3, 2)
+    assert not shares_memory(storage_block.to_array(), storage.to_array())
+    for q in range(3):
+        assert allclose(storage_block.to_array()[q], storage.to_array()[q, 1:3])
+
+
+# ~~~ Products ~~~ #
+def test_affine_expansion_storage_product_matrix():
+    storage = _matrix_storage(3, 4)
+    thetas = (1., 2., 3.)
+    expected = thetas[0] * storage[0].content + thetas[1] * storage[1].content + thetas[2] * storage[2].content
+    output = sum(product(thetas, storage))
+    assert isinstance(output, OnlineMatrix.Type())
+    assert allclose(output.content, expected)
+    output_block = sum(product(thetas, storage[:2, :2]))
+    assert allclose(output_block.content, expected[:2, :2])
+
+
+def test_affine_expansion_storage_product_vector():
+    storage = _vector_storage(3, 4)
+    thetas = (1., 2., 3.)
+    expected = thetas[0] * storage[0].content + thetas[1] * storage[1].content + thetas[2] * storage[2].content
+    output = sum(product(thetas, storage))
+    assert isinstance(output, OnlineVector.Type())
+    assert allclose(output.content, expected)
+    output_block = sum(product(thetas, storage[:2]))
+    assert allclose(output_block.content, expected[:2])
+
+
+def test_affine_expansion_storage_product_scalar():
+    storage = _scalar_storage(2, 3)
+    thetas = (1., 2.)
+    thetas2 = (3., 4., 5.)
+    expected = einsum("i,ij,j", thetas, storage.to_array(), thetas2)
+    output = sum(product(thetas, storage, thetas2))
+    assert allclose(output, expected)
@@ -0,0 +1,187 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import full, inf, isclose, random
+from rbnics.sampling import ParameterSpaceSubset
+
+
+# Auxiliary functions
+def _subset(n):
+    subset = ParameterSpaceSubset()
+    subset.extend([(float(i), float(i % 7)) for i in range(n)])
+    return subset
+
+
+def _generator(mu):
+    return mu[0] * (mu[1] + 1.)
+
+
+# ~~~ Lazy greedy search ~~~ #
+def test_lazy_max():
+    subset = _subset(50)
+    (value_max, i_max) = subset.max(_generator)
+    previous_values = full(len(subset), inf)
+    (lazy_value_max, lazy_i_max) = subset.lazy_max(_generator, previous_values, 1.)
+    assert isclose(lazy_value_max, value_max)
+    assert lazy_i_max == i_max
+    # Previous values have been all computed, since no bound was available (each process stores only the values
+    # of the parameters assigned to it)
+    assert all(isclose(previous_values[i], _generator(subset[i])) for i in subset._local_list_indices())
+
+
+def test_lazy_max_skipped_evaluations():
+    subset = _subset(50)
+    previous_values = full(len(subset), inf)
+    subset.lazy_max(_generator, previous_values, 1.)
+    evaluated = list()
+
+    def counting_generator(mu):
+        evaluated.append(mu)
+        return _generator(mu)
+
+    (value_max, i_max) = subset.lazy_max(counting_generator, previous_values, 1.)
+    assert (value_max, i_max) == subset.max(_generator)
+    # With a saturation constant equal to one and an unchanged generator only the maximizer is evaluated
+    assert len(evaluated) == 1
+
+
+def test_lazy_max_chunks():
+    subset = _subset(50)
+    previous_values = full(len(subset), inf)
+
+    def chunk_generator(mus):
+        return [_generator(mu) for mu in mus]
+
+    (value_max, i_max) = subset.lazy_max(chunk_generator, previous_values, 1., chunk_size=8)
+    assert (value_max, i_max) == subset.max(_generator)
+
+
+def test_lazy_max_empty():
+    # Processes which are not assigned any parameter must not break the distributed maximum computation
+    subset = _subset(0)
+    (value_max, i_max) = subset.lazy_max(_generator, full(0, inf), 1.)
+    assert value_max is None
+    assert i_max is None
+
+
+# ~~~ Batch of maxima ~~~ #
+def test_diverse_max():
+    subset = _subset(50)
+    (values, indices) = subset.diverse_max(_generator, 5)
+    expected_indices = sorted(range(len(subset)), key=lambda i: _generator(subset[i]), reverse=True)[:5]
+    assert indices == expected_indices
+    assert all(isclose(value, _generator(subset[i])) for (value, i) in zip(values, indices))
+    assert (values[0], indices[0]) == subset.max(_generator)
+
+
+def test_diverse_max_min_distance():
+    subset = _subset(50)
+    min_distance = 10.
+    (values, indices) = subset.diverse_max(_generator, 5, min_distance)
+    assert 1 < len(indices) <= 5
+    assert indices[0] == subset.max(_generator)[1]
+    assert all(values[k] >= values[k + 1] for k in range(len(values) - 1))
+    for (k, i) in enumerate(indices):
+        for j in indices[:k]:
+            assert subset._distance(subset[i], subset[j]) >= min_distance
+
+
+# ~~~ Chunked evaluation of the generator ~~~ #
+def test_chunked_max():
+    subset = _subset(50)
+    chunk_sizes = list()
+
+    def chunk_generator(mus):
+        chunk_sizes.append(len(mus))
+        return [_generator(mu) for mu in mus]
+
+    assert subset.chunked_max(chunk_generator, 8) == subset.max(_generator)
+    assert sum(chunk_sizes) == len(subset._local_list_indices())
+    assert all(chunk_size <= 8 for chunk_size in chunk_sizes)
+
+
+# ~~~ Dynamic load balancing ~~~ #
+def test_max_dynamic_load_balancing():
+    subset = _subset(50)
+    (value_max, i_max) = subset.max(_generator)
+    for scheduler_chunk_size in (1, 7, 100):
+        subset.set_dynamic_load_balancing(scheduler_chunk_size)
+        assert subset.max(_generator) == (value_max, i_max)
+        assert subset.chunked_max(lambda mus: [_generator(mu) for mu in mus], 3) == (value_max, i_max)
+        (values, indices) = subset.diverse_max(_generator, 5)
+        assert (values[0], indices[0]) == (value_max, i_max)
+        assert len(subset.gather_busy_times()) == subset.mpi_comm.size
+    subset.set_dynamic_load_balancing(None)
+    assert subset.max(_generator) == (value_max, i_max)
+
+
+def test_max_dynamic_load_balancing_ties():
+    subset = _subset(50)
+    subset.set_dynamic_load_balancing(4)
+    (value_max, i_max) = subset.max(lambda mu: 1.)
+    assert value_max == 1.
+    assert 0 <= i_max < len(subset)
+
+
+# ~~~ Array storage ~~~ #
+def test_to_array():
+    subset = _subset(10)
+    assert subset.to_array().shape == (10, 2)
+    assert [tuple(mu) for mu in subset.to_array().tolist()] == list(subset)
+    subset.append((10., 3.))
+    subset[0] = (-1., -1.)
+    assert subset.to_array().shape == (11, 2)
+    assert subset[0] == (-1., -1.)
+    assert subset[10] == (10., 3.)
+    assert tuple(subset.to_array()[0]) == (-1., -1.)
+
+
+def test_content_hash():
+    subset = _subset(10)
+    assert subset.content_hash() == _subset(10).content_hash()
+    assert subset.content_hash() != _subset(11).content_hash()
+    reversed_subset = ParameterSpaceSubset()
+    reversed_subset.extend(list(reversed(subset)))
+    assert subset.content_hash() != reversed_subset.content_hash()
+    content_hash = subset.content_hash()
+    subset[3] = (-1., -1.)
+    assert subset.content_hash() != content_hash
+
+
+def test_generate_vectorized():
+    from rbnics.sampling.distributions import DrawFrom, UniformDistribution
+    box = [(2., 5.), (10., 1000.)]
+    for sampling in (UniformDistribution(), DrawFrom(random.uniform, 0., 1.)):
+        subset = ParameterSpaceSubset()
+        subset.generate(box, 100, sampling)
+        parameters = subset.to_array()
+        assert parameters.shape == (100, 2)
+        for (p, (box_min, box_max)) in enumerate(box):
+            assert all(box_min <= parameters[:, p]) and all(parameters[:, p] <= box_max)
+
+
+def test_save_and_load(tempdir):
+    subset = _subset(10)
+    subset.save(tempdir, "subset")
+    subset.extend([(10., 3.), (11., 4.)])
+    subset.save(tempdir, "subset")  # only appends the new parameters
+    loaded_subset = ParameterSpaceSubset()
+    loaded_subset.load(tempdir, "subset")
+    assert list(loaded_subset) == list(subset)
+    subset[0] = (-1., -1.)
+    subset.append((12., 5.))
+    subset.save(tempdir, "subset")  # saves the whole set again, since a parameter was replaced
+    loaded_subset = ParameterSpaceSubset()
+    loaded_subset.load(tempdir, "subset")
+    assert list(loaded_subset) == list(subset)
+
+
+def test_load_from_text(tempdir):
+    from rbnics.utils.io import TextIO
+    TextIO.save_file([(1., 2.), (3., 4.)], tempdir, "subset")
+    subset = ParameterSpaceSubset()
+    subset.load(tempdir, "subset")
+    assert list(subset) == [(1., 2.), (3., 4.)]
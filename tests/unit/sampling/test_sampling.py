@@ -11,7 +11,9 @@ import matplotlib
 import matplotlib.pyplot as plt
 from distutils.version import LooseVersion
 from rbnics.sampling import ParameterSpaceSubset
-from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, LogUniformDistribution, UniformDistribution
+from rbnics.sampling.distributions import (DrawFrom, EquispacedDistribution, HaltonDistribution,
+                                           LatinHypercubeDistribution, LogUniformDistribution, SobolDistribution,
+                                           UniformDistribution)
 
 # Common data
 box = [(2., 5.), (10., 1000.)]
@@ -80,6 +82,42 @@ def test_sampling_uniform():
     plt.show()
 
 
+# Sobol generator
+def test_sampling_sobol():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=SobolDistribution(seed=0))
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max] - box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max] - box[1][min])
+    plt.show()
+
+
+# Halton generator
+def test_sampling_halton():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=HaltonDistribution(seed=0))
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max] - box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max] - box[1][min])
+    plt.show()
+
+
+# Latin hypercube generator
+def test_sampling_latin_hypercube():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=LatinHypercubeDistribution(seed=0))
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max] - box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max] - box[1][min])
+    plt.show()
+
+
+# Composite Sobol and log uniform generator
+def test_sampling_composite_sobol_and_log_uniform():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=(SobolDistribution(seed=0), LogUniformDistribution()))
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max] - box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats_loguniform, loc=box[1][min], scale=box[1][max] - box[1][min])
+    plt.show()
+
+
 # Composite uniform generator
 def test_sampling_composite_uniform():
     parameter_space_subset = ParameterSpaceSubset()
@@ -0,0 +1,32 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from numpy import arange, array_equal, concatenate
+from rbnics.utils.io import NumpyIO
+
+
+def test_numpy_io_append_file(tempdir):
+    content = arange(6, dtype=float).reshape(3, 2)
+    NumpyIO.save_file(content, tempdir, "array")
+    new_content = arange(6, 10, dtype=float).reshape(2, 2)
+    assert NumpyIO.append_file(content, new_content, tempdir, "array")
+    assert array_equal(NumpyIO.load_file(tempdir, "array"), concatenate((content, new_content)))
+    # Append again, starting from the grown array
+    content = concatenate((content, new_content))
+    new_content = arange(10, 12, dtype=float).reshape(1, 2)
+    assert NumpyIO.append_file(content, new_content, tempdir, "array")
+    assert array_equal(NumpyIO.load_file(tempdir, "array"), concatenate((content, new_content)))
+
+
+def test_numpy_io_append_file_mismatch(tempdir):
+    content = arange(6, dtype=float).reshape(3, 2)
+    NumpyIO.save_file(content, tempdir, "array")
+    new_content = arange(6, 8, dtype=float).reshape(1, 2)
+    # The file does not store an array with the same shape as the previous content
+    assert not NumpyIO.append_file(content[:2], new_content, tempdir, "array")
+    assert array_equal(NumpyIO.load_file(tempdir, "array"), content)
+    # The file does not exist
+    assert not NumpyIO.append_file(content, new_content, tempdir, "missing_array")
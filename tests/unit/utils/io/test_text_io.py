@@ -0,0 +1,46 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from rbnics.utils.io import ExportableList, TextIO
+
+
+def test_text_io_append_file(tempdir):
+    content = [(1., 2.), (3., 4.)]
+    TextIO.save_file(content, tempdir, "list")
+    assert TextIO.append_file(content, [(5., 6.)], tempdir, "list")
+    assert TextIO.load_file(tempdir, "list") == [(1., 2.), (3., 4.), (5., 6.)]
+
+
+def test_text_io_append_file_mismatch(tempdir):
+    TextIO.save_file([(1., 2.), (3., 4.)], tempdir, "list")
+    # The file does not end with the last element of the previous content
+    assert not TextIO.append_file([(1., 2.), (7., 8.)], [(5., 6.)], tempdir, "list")
+    assert TextIO.load_file(tempdir, "list") == [(1., 2.), (3., 4.)]
+    # The file does not exist
+    assert not TextIO.append_file([(1., 2.)], [(5., 6.)], tempdir, "missing_list")
+
+
+def test_exportable_list_incremental_save(tempdir):
+    exportable_list = ExportableList("text")
+    exportable_list.extend([1, 2])
+    exportable_list.save(tempdir, "list")
+    exportable_list.append(3)
+    exportable_list.save(tempdir, "list")
+    loaded_list = ExportableList("text")
+    loaded_list.load(tempdir, "list")
+    assert list(loaded_list) == [1, 2, 3]
+
+    # A file changed by someone else is rewritten entirely
+    TextIO.save_file([0], tempdir, "list")
+    exportable_list.append(4)
+    exportable_list.save(tempdir, "list")
+    assert TextIO.load_file(tempdir, "list") == [1, 2, 3, 4]
+
+    # A replaced element causes the whole list to be saved again
+    exportable_list[0] = 5
+    exportable_list.append(6)
+    exportable_list.save(tempdir, "list")
+    assert TextIO.load_file(tempdir, "list") == [5, 2, 3, 4, 6]
@@ -0,0 +1,84 @@
+# Copyright (C) 2015-2021 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+
+from mpi4py.MPI import COMM_WORLD
+from numpy import inf
+from rbnics.utils.mpi import parallel_max
+
+
+def test_parallel_max_without_args():
+    global_value_max = parallel_max(float(COMM_WORLD.rank))
+    assert global_value_max == float(COMM_WORLD.size - 1)
+
+
+def test_parallel_max_with_args():
+    (global_value_max, global_args) = parallel_max(float(COMM_WORLD.rank), (COMM_WORLD.rank, "rank"))
+    assert global_value_max == float(COMM_WORLD.size - 1)
+    assert global_args == (COMM_WORLD.size - 1, "rank")
+
+
+def test_parallel_max_with_single_arg():
+    (global_value_max, global_args) = parallel_max(float(COMM_WORLD.rank), COMM_WORLD.rank)
+    assert global_value_max == float(COMM_WORLD.size - 1)
+    assert global_args == (COMM_WORLD.size - 1, )
+
+
+def test_parallel_max_with_postprocessor():
+    (global_value_max, global_args) = parallel_max(- float(COMM_WORLD.rank), (COMM_WORLD.rank, ), abs)
+    assert global_value_max == - float(COMM_WORLD.size - 1)
+    assert global_args == (COMM_WORLD.size - 1, )
+
+
+class UncomparableArgument(object):
+    def __init__(self, rank):
+        self.rank = rank
+
+    def __lt__(self, other):
+        raise TypeError("Arguments should never be compared")
+
+    __gt__ = __le__ = __ge__ = __lt__
+
+
+def test_parallel_max_with_ties():
+    # Values are the same on every process, and arguments do not support comparison:
+    # the tie is broken by the rank, without comparing arguments
+    (global_value_max, global_args) = parallel_max(1., (UncomparableArgument(COMM_WORLD.rank), ))
+    assert global_value_max == 1.
+    assert global_args[0].rank == COMM_WORLD.size - 1
+
+
+def test_parallel_max_with_ties_after_postprocessing():
+    # Different values with the same postprocessed value are never compared either
+    local_value = [1.] if COMM_WORLD.rank % 2 == 0 else (- 1., )
+
+    def postprocessor(value):
+        return abs(value[0])
+
+    (global_value_max, global_args) = parallel_max(local_value, (COMM_WORLD.rank, ), postprocessor)
+    assert postprocessor(global_value_max) == 1.
+    assert global_args == (COMM_WORLD.size - 1, )
+
+
+def _postprocessor_or_lowest(value):
+    if value is None:
+        return - inf
+    else:
+        return value
+
+
+def test_parallel_max_with_none():
+    # Processes without any value must not prevail on the others
+    local_value = 1. if COMM_WORLD.rank == 0 else None
+    local_args = (0, ) if COMM_WORLD.rank == 0 else (None, )
+    (global_value_max, global_args) = parallel_max(local_value, local_args, _postprocessor_or_lowest)
+    assert global_value_max == 1.
+    assert global_args == (0, )
+
+
+def test_parallel_max_with_all_none():
+    (global_value_max, global_args) = parallel_max(None, (None, ), _postprocessor_or_lowest)
+    assert global_value_max is None
+    assert global_args == (None, )